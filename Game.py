@@ -2,9 +2,11 @@
 from typing import List, Optional, Dict
 from context.Map import MapGraph , Route
 from context.player_context import PlayerContext
-from player import Player
+from player import Player, Steps, run_steps, run_steps_async
 from context.game_context import GameContext
 from context.GameLogger import GameLogger
+from context.scoring import ROUTE_SCORES
+from context.events import GAME_OVER, TURN_END, TURN_START
 
 class Game:
     def __init__(self, context: GameContext, players: List[Player], logger: GameLogger, round_number: int):
@@ -30,49 +32,89 @@ class Game:
         self.context = context
         self.players = players
         self.turn_index = 0
-        self.score_table: Dict[int, int] = {
-            1:1,
-            2:2,
-            3:4,
-            4:7,
-            5:10,
-            6:15
-        }
+        self.score_table: Dict[int, int] = dict(ROUTE_SCORES)
 
 
 
 
     def play(self, turns: Optional[int] = None) -> None:
-        """Run the core gameplay loop until an end condition is reached."""
+        """Run the core gameplay loop until an end condition is reached.
+
+        With ``turns`` the loop stops after that many turns even if the game
+        is not over yet; final scoring only happens once the game has ended.
+        """
+        self._prepare()
         for p in self.players:
-            p.set_context(
-                PlayerContext(self.current_player().player_id, self.context, self.players), True
-            )
+            p.set_context(self.player_contexts[p.player_id], True)
         while not self._is_game_over():
+            if turns is not None and self.turn_index >= turns:
+                return
             self.next_turn()
             self._score_game(False)
+        self._finish()
+
+    async def play_async(self, turns: Optional[int] = None) -> None:
+        """:meth:`play` for interfaces whose methods may be coroutines.
+
+        Every decision is awaited, so one event loop can run many games at
+        once and a slow bot only holds up its own game.
+        """
+        self._prepare()
+        for p in self.players:
+            p.set_context(self.player_contexts[p.player_id])
+            await run_steps_async(p.setup_steps())
+        while not self._is_game_over():
+            if turns is not None and self.turn_index >= turns:
+                return
+            await self.next_turn_async()
+            self._score_game(False)
+        self._finish()
+
+    def _prepare(self) -> None:
+        """Seat the players: bot random streams, scoring, events and contexts."""
+        for p in self.players:
+            p.get_interface().set_rng(self.context.rng.bot(p.player_id))
+            p.score_keeper = self.context.score_keeper
+            p.events = self.context.events
+        # one lazily evaluated context per player, reused for every turn
+        self.player_contexts: Dict[str, PlayerContext] = {
+            p.player_id: PlayerContext(p.player_id, self.context, self.players) for p in self.players
+        }
+
+    def _finish(self) -> None:
+        """Final scoring once the game is over."""
         self._score_game(True)
+        events = self.context.events
+        if events.active:
+            events.emit(GAME_OVER, turn=self.turn_index, scores=dict(self.context.scores))
 
     def next_turn(self) -> None:
         """Advance the gameplay loop by executing a single player's turn."""
+        run_steps(self.turn_steps())
+
+    async def next_turn_async(self) -> None:
+        """:meth:`next_turn`, awaiting the player's decisions."""
+        await run_steps_async(self.turn_steps())
+
+    def turn_steps(self) -> 'Steps[None]':
+        """The rules of :meth:`next_turn`, yielding each decision."""
         # set current player
         player = self.current_player()
-        # build and load player context into player
-        player_ids = [p.player_id for p in self.players]
-        player.set_context(
-            PlayerContext(self.current_player().player_id, self.context, self.players)
-        )
+        # load the player's context; its fields refresh lazily as the game changes
+        player.set_context(self.player_contexts[player.player_id])
         self.logger.add_turn(self.round_number, self.current_player().context)
 
-        # pseudo-progress-bar:
-        if not self.turn_index % 15:
-            print("Turn", self.turn_index, "reached")
+        events = self.context.events
+        if events.active:
+            events.emit(TURN_START, turn=self.turn_index, player_id=player.player_id)
         # have that player take their turn
-        player.take_turn({
+        yield from player.turn_steps({
             "draw_train": False,
             "claim_route": False,
             "draw_destination": False
         })
+        if events.active:
+            events.emit(TURN_END, turn=self.turn_index, player_id=player.player_id)
 
         # incriment the turn counter
         self.turn_index += 1
@@ -87,25 +129,10 @@ class Game:
         return any(p.trains_remaining <= 2 for p in self.players)
 
     def _score_game(self, penalize_incomplete_tickets: bool) -> None:
-        """Update scores based on routes and tickets after each turn."""
+        """Publish each player's score from the incrementally kept totals."""
+        keeper = self.context.score_keeper
         for p in self.players:
-            # reference the score table to get score value
-            route_values = [
-                self.score_table[r.length]
-                for r in self.context.get_map().get_claimed_routes(p.player_id)
-            ]
-            tickets = p.get_tickets()
-
-            if tickets is None:
-                raise ValueError(f"Player {p.player_id} has no tickets (NoneType)")
-
-            completed_ticket_values = [t.value for t in p.get_tickets() if t.is_completed]
-            incomplete_ticket_values = [t.value for t in p.get_tickets() if not t.is_completed]
-
-            score = sum(route_values) + (10 * p.has_longest_path) + sum(completed_ticket_values)
-            if penalize_incomplete_tickets:
-                score -= sum(incomplete_ticket_values)
-            self.context.set_score(p.player_id, score)
+            self.context.set_score(p.player_id, keeper.score(p.player_id, penalize_incomplete_tickets))
 
 
     def __repr__(self) -> str:
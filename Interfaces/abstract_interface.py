@@ -1,3 +1,4 @@
+import random
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from player import Player
@@ -6,7 +7,14 @@ class Interface:
     def __init__(self):
         """Base interface used by the gameplay loop to query player actions."""
         self.player: Player
+        # replaced by the game's seeded stream for this seat; use it instead of
+        # the random module so games can be reproduced
+        self.rng: random.Random = random.Random()
 
     def set_player(self, player):
         """Provide the Player instance that this interface controls."""
         self.player = player
+
+    def set_rng(self, rng: random.Random):
+        """Provide the random stream this bot should draw from."""
+        self.rng = rng
@@ -8,6 +8,8 @@ from context.decks import DestinationTicket
 
 class YourBotName(Interface):
 
+    # need randomness? use self.rng (a seeded random.Random, e.g. self.rng.randrange(0, 5))
+    # instead of the random module so your games can be replayed
 
 
     # used to determine weather to
@@ -49,3 +51,30 @@ class YourBotName(Interface):
     def select_ticket_offer(self, offer) -> List[DestinationTicket]:
         """Choose which destination tickets to keep from an offer."""
         pass
+
+
+    #######################
+    #       helpers       #
+    #######################
+
+    # cheapest list of routes connecting two cities (None if it can't be done anymore);
+    # your own routes are free and opponents' routes are blocked
+    def path_finder(self, city1, city2):
+        """Return a cheapest list of routes connecting two cities."""
+        return self.player.context.map.shortest_path(self.player.player_id, city1, city2)
+
+    # claimable_routes sorted so the routes on (near-)shortest paths of your unfinished tickets come first,
+    # weighted by ticket value; a table lookup, so it is cheap to call every turn
+    def rank_routes(self, claimable_routes: 'List[tuple[Route,int]]') -> 'List[tuple[Route,int]]':
+        """Order claimable routes by how much they help your destination tickets."""
+        return self.player.context.map.rank_routes_for_tickets(
+            self.player.player_id, claimable_routes, self.player.get_tickets()
+        )
+
+    # every way of keeping tickets from an offer: (tickets, extra trains on top of your current tickets
+    # or None if impossible, trains saved by shared track, points); cached, so cheap to call
+    def evaluate_offer(self, offer: List[DestinationTicket]):
+        """Cost out each subset of a ticket offer."""
+        return self.player.context.map.evaluate_ticket_offer(
+            self.player.player_id, offer, self.player.get_tickets()
+        )
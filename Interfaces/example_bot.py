@@ -1,6 +1,5 @@
 from typing import List
 from Interfaces.abstract_interface import Interface
-import random
 
 from context.Map import MapGraph
 from context.Map import Route
@@ -13,7 +12,7 @@ class ExampleBot(Interface): # TODO: actually build the thing
     # 3 = draw a destination ticket
     def choose_turn_action(self):
         """Select which action to take on a turn."""
-        return random.randrange(1, 3)
+        return self.rng.randrange(1, 3)
 
 
     ##############################################################################################
@@ -24,12 +23,12 @@ class ExampleBot(Interface): # TODO: actually build the thing
     # choose what cards to draw
     def choose_draw_train_action(self) -> int:
         """Pick which train card position to draw from."""
-        return random.randrange(-1, 5)
+        return self.rng.randrange(-1, 5)
 
     # choose what routes to claim
     def choose_route_to_claim(self, claimable_routes: List[Route]) -> Route:
         """Select a route to claim from the provided options."""
-        return claimable_routes[random.randrange(0, len(claimable_routes))]
+        return claimable_routes[self.rng.randrange(0, len(claimable_routes))]
 
     # choose what color to spend on a gray route (will spend most common color on input of None or on invalid color input)
     def choose_color_to_spend(self, route: Route, color_options: List[str]) -> "str | None":
@@ -47,5 +46,31 @@ class ExampleBot(Interface): # TODO: actually build the thing
     #######################
 
     def path_finder(self, city1, city2):
-        """Placeholder helper for possible path calculations."""
-        return None
+        """Cheapest list of routes connecting two cities for this bot.
+
+        Uses the map's cached shortest paths: routes you own are free and
+        routes owned by opponents are blocked. Returns ``None`` if the cities
+        can no longer be connected.
+        """
+        return self.player.context.map.shortest_path(self.player.player_id, city1, city2)
+
+    def rank_routes(self, claimable_routes):
+        """Claimable ``(route, locomotives)`` pairs, most useful for this bot's tickets first.
+
+        Looks up the map's precomputed ticket relevance instead of searching
+        paths, so it can be called on every decision.
+        """
+        return self.player.context.map.rank_routes_for_tickets(
+            self.player.player_id, claimable_routes, self.player.get_tickets()
+        )
+
+    def evaluate_offer(self, offer):
+        """Every way of keeping tickets from ``offer``, as :class:`OfferOption` tuples.
+
+        Each gives the extra trains the kept tickets need on top of this
+        bot's current tickets, the trains they save by sharing track, and
+        their points. Costs are cached across games, so this is cheap.
+        """
+        return self.player.context.map.evaluate_ticket_offer(
+            self.player.player_id, offer, self.player.get_tickets()
+        )
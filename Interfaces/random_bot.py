@@ -1,6 +1,5 @@
 from typing import List
 from Interfaces.abstract_interface import Interface
-import random
 
 from context.Map import MapGraph
 from context.Map import Route
@@ -29,6 +28,14 @@ class RandomBot(Interface):
 
             incomplete = [t for t in self.player.get_tickets() if not t.is_completed]
 
+    ``self.player.get_tickets_completed_by(route)`` -> ``List[DestinationTicket]``
+        Tickets that claiming ``route`` would complete, without claiming it.
+        Example::
+
+            for route, loco_needed in self.player.get_affordable_routes():
+                if self.player.get_tickets_completed_by(route):
+                    return (route, loco_needed)
+
     ``self.player.get_hand()`` -> ``Counter[str]``
         Current train cards in hand, keyed by color letter.
         Example::
@@ -43,8 +50,16 @@ class RandomBot(Interface):
                 # game will end soon
                 pass
 
+    ``self.rng`` -> ``random.Random``
+        Seeded random stream for this bot. Use it instead of the ``random``
+        module so games can be reproduced from their seed.
+        Example::
+
+            slot = self.rng.randrange(-1, 5)
+
     ``self.player.context`` -> :class:`PlayerContext`
-        Snapshot of public game state each turn. Useful fields include:
+        Read-only view of the public game state, kept up to date for the
+        whole game. Useful fields include:
 
         - ``face_up_cards``: visible train cards in the market.
           Example::
@@ -54,8 +69,15 @@ class RandomBot(Interface):
         - ``map``: :class:`MapGraph` representing the board. You can inspect
           routes via ``self.player.context.map.get_available_routes()`` or
           ``get_claimed_routes(player_id)``.
+          ``map.ticket_distance(player_id, ticket)`` returns how many more trains
+          you need to complete a ticket and ``map.shortest_path(player_id,
+          city1, city2)`` a cheapest list of routes between two cities (see
+          ``path_finder`` below). Both are cached and cheap to call every turn.
+          Example::
+
+              need = self.player.context.map.ticket_distance(self.player.player_id, ticket)
 
-        - ``opponents``: list of ``OpponentInfo`` with each opponent's exposed
+        - ``opponents``: tuple of ``OpponentInfo`` with each opponent's exposed
           cards, remaining trains, score and ticket count.
           Example::
 
@@ -91,7 +113,7 @@ class RandomBot(Interface):
     # choose what cards to draw
     def choose_draw_train_action(self) -> int:
         """Choose which face-up index to draw or ``-1`` for the deck."""
-        return random.randrange(-1, 5)
+        return self.rng.randrange(-1, 5)
 
     # choose what routes to claim -------------------------------------------------------------------#
     # claimable_routes is a list of tuples( Route , number of locomotives needed to claim)           #
@@ -100,7 +122,7 @@ class RandomBot(Interface):
     # error handling is done on the back end --------------------------------------------------------#
     def choose_route_to_claim(self, claimable_routes: 'List[tuple[Route,int]]') -> 'tuple[Route,int]':
         """Select a route and number of locomotives to spend."""
-        return claimable_routes[random.randrange(0, len(claimable_routes))]
+        return claimable_routes[self.rng.randrange(0, len(claimable_routes))]
 
     # choose what color to spend on a gray route (will spend most common color on input of None or on invalid color input)
     def choose_color_to_spend(self, route: Route, color_options: List[str]) -> "str | None":
@@ -118,5 +140,10 @@ class RandomBot(Interface):
     #######################
 
     def path_finder(self, city1, city2):
-        """Placeholder for path-finding logic."""
-        return None
+        """Cheapest list of routes connecting two cities for this bot.
+
+        Uses the map's cached shortest paths: routes you own are free and
+        routes owned by opponents are blocked. Returns ``None`` if the cities
+        can no longer be connected.
+        """
+        return self.player.context.map.shortest_path(self.player.player_id, city1, city2)
@@ -0,0 +1,617 @@
+import argparse
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from Game import Game
+from context.scoring import ROUTE_SCORES, LONGEST_PATH_BONUS
+from context.board import BoardTemplate, load_board
+from context.decks import TrainCardDeck
+from context.longest_path import longest_trail
+if TYPE_CHECKING:
+    from context.decks import TicketDeck
+
+CARD_COLORS = tuple(TrainCardDeck.COLOR_COUNTS)
+CARD_CODES = {card: i for i, card in enumerate(CARD_COLORS)}
+LOCOMOTIVE = CARD_CODES["L"]
+# route color code of gray routes, one past the card codes
+GRAY = len(CARD_COLORS)
+EMPTY = -1
+DECK_SIZE = sum(TrainCardDeck.COLOR_COUNTS.values())
+MARKET_SIZE = 5
+_UNSEEN = np.iinfo(np.int32).max
+
+# _SHIFT[k] moves the market cards after slot k one slot to the left
+_SHIFT = np.array([[i if i < k else min(i + 1, MARKET_SIZE - 1) for i in range(MARKET_SIZE)]
+                   for k in range(MARKET_SIZE)])
+
+# turn kinds, as returned by RandomBot.choose_turn_action
+DRAW, CLAIM, TICKETS = 1, 2, 3
+
+
+class RandomBotSource:
+    """Random decisions and shuffles for RandomBot-style play, from one NumPy generator."""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+
+    def draw_choices(self, games: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Two draw choices per game: a market slot or ``-1`` for the deck."""
+        a, b = self.rng.integers(-1, MARKET_SIZE, size=(2, len(games)))
+        return a, b
+
+    def route_choice(self, games: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Uniform position in each game's list of affordable routes."""
+        return (self.rng.random(len(games)) * counts).astype(np.int64)
+
+    def shuffle(self, kind: str, values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Shuffle the first ``lengths[i]`` entries of each row of ``values``.
+
+        ``kind`` is ``"cards"`` or ``"tickets"``; unused entries stay at the end.
+        """
+        keys = self.rng.random(values.shape)
+        keys[np.arange(values.shape[1]) >= lengths[:, None]] = 2.0
+        return np.take_along_axis(values, np.argsort(keys, axis=1), axis=1)
+
+
+class BatchSimulator:
+    """Plays many RandomBot-style games in lockstep on NumPy arrays.
+
+    Every game is at the same turn index, so all games advance with one
+    vectorized step per turn. The rules follow :class:`Game`,
+    :meth:`player.Player.take_turn` (including its fallbacks when an action
+    is impossible) and :class:`context.decks.TrainCardDeck`; bots behave
+    like :class:`Interfaces.random_bot.RandomBot`. :func:`check_against_engine`
+    replays real games turn by turn to keep the two in agreement.
+
+    Randomness comes from ``source`` (a :class:`RandomBotSource` by default).
+    """
+
+    def __init__(self, num_games: int, num_players: int, seed: Optional[int] = None,
+                 source=None, board: Optional[BoardTemplate] = None):
+        self.board = board if board is not None else load_board()
+        self.source = source if source is not None else RandomBotSource(seed)
+        self.num_games = G = num_games
+        self.num_players = P = num_players
+        b = self.board
+        R, T, N = len(b.routes), len(b.tickets), len(b.city_names)
+
+        # static board data
+        self.route_length = b.route_length.astype(np.int16)
+        self.route_color = np.array([CARD_CODES.get(r.color, GRAY) for r in b.routes], dtype=np.int8)
+        self.route_city1 = b.route_city1.astype(np.int64)
+        self.route_city2 = b.route_city2.astype(np.int64)
+        self.route_points = np.array([ROUTE_SCORES[r.length] for r in b.routes], dtype=np.int32)
+        self.ticket_city1 = np.array([b.city_ids[t.city1] for t in b.tickets], dtype=np.int64)
+        self.ticket_city2 = np.array([b.city_ids[t.city2] for t in b.tickets], dtype=np.int64)
+        self.ticket_value = np.array([t.value for t in b.tickets], dtype=np.int32)
+
+        # cards: piles hold card codes, EMPTY past their length; deck top is the last card
+        self.deck = np.full((G, DECK_SIZE), EMPTY, dtype=np.int8)
+        self.deck_len = np.zeros(G, dtype=np.int64)
+        self.market = np.full((G, MARKET_SIZE), EMPTY, dtype=np.int8)
+        self.market_len = np.zeros(G, dtype=np.int64)
+        self.discard = np.full((G, DECK_SIZE), EMPTY, dtype=np.int8)
+        self.discard_len = np.zeros(G, dtype=np.int64)
+
+        # players
+        self.hand = np.zeros((G, P, len(CARD_COLORS)), dtype=np.int16)
+        self.exposed = np.zeros((G, P, len(CARD_COLORS)), dtype=np.int16)
+        # order in which each color first entered a hand (breaks most-common ties)
+        self.first_seen = np.full((G, P, len(CARD_COLORS)), _UNSEEN, dtype=np.int32)
+        self._stamp = 0
+        self.trains = np.full((G, P), 45, dtype=np.int16)
+        self.held = np.zeros((G, P, T), dtype=bool)
+        self.completed = np.zeros((G, P, T), dtype=bool)
+
+        # tickets: draw stack, front first
+        self.stack = np.full((G, T), EMPTY, dtype=np.int16)
+        self.stack_len = np.zeros(G, dtype=np.int64)
+
+        # board: owner seat per route and a connected-component label per city and player
+        self.owner = np.full((G, R), EMPTY, dtype=np.int8)
+        self.label = np.tile(np.arange(N, dtype=np.int16), (G, P, 1))
+        # longest trail per player (exact for the holder) and the bonus holder
+        self.longest = np.zeros((G, P), dtype=np.int16)
+        self.holder = np.full(G, EMPTY, dtype=np.int8)
+
+        self.turn = 0
+        self.turns = np.zeros(G, dtype=np.int64)
+        self.over = np.zeros(G, dtype=bool)
+
+    # ── setup ──────────────────────────────────────────────────────────────────
+    def setup(self) -> None:
+        """Shuffle the decks, fill the markets and deal the starting hands and tickets."""
+        G = self.num_games
+        games = np.arange(G)
+        base = np.repeat(np.arange(len(CARD_COLORS), dtype=np.int8), list(TrainCardDeck.COLOR_COUNTS.values()))
+        self.deck[:] = self.source.shuffle("cards", np.tile(base, (G, 1)), np.full(G, DECK_SIZE))
+        self.deck_len[:] = DECK_SIZE
+        self._refill(games)
+
+        T = len(self.board.tickets)
+        self.stack[:] = self.source.shuffle("tickets", np.tile(np.arange(T, dtype=np.int16), (G, 1)), np.full(G, T))
+        self.stack_len[:] = T
+        self.deal_starting_hands()
+
+    def deal_starting_hands(self) -> None:
+        """Each player draws four cards face down and keeps two of three tickets."""
+        games = np.arange(self.num_games)
+        for p in range(self.num_players):
+            for _ in range(4):
+                self._draw_face_down(games, p)
+            self._draw_tickets(games, p)
+
+    # ── turns ──────────────────────────────────────────────────────────────────
+    def step(self) -> None:
+        """Play one turn in every game that is not over."""
+        g = np.flatnonzero(~self.over)
+        ended = (self.trains[g] <= 2).any(axis=1)
+        self.over[g[ended]] = True
+        g = g[~ended]
+        if not len(g):
+            return
+        p = self.turn % self.num_players
+
+        # start-of-turn refill, as in Player.take_turn
+        self._reshuffle(g[self.deck_len[g] < 2])
+        draw_fault = self.deck_len[g] < 2
+
+        # RandomBot.choose_turn_action
+        afford, need = self._affordable(g, p)
+        has_route = afford.any(axis=1)
+        incomplete = (self.held[g, p] & ~self.completed[g, p]).any(axis=1)
+        kind = np.where(~incomplete, TICKETS, np.where(has_route, CLAIM, DRAW))
+
+        tickets = kind == TICKETS
+        can_deal = self.stack_len[g] >= 3
+        self._draw_tickets(g[tickets & can_deal], p)
+        # not enough tickets: Player falls back to two face-down cards
+        fallback = g[tickets & ~can_deal]
+        self._draw(fallback, p, np.full(len(fallback), -1), np.full(len(fallback), -1))
+
+        claim = kind == CLAIM
+        self._claim(g[claim], p, afford[claim], need[claim])
+
+        # drawing with fewer than two cards left passes the turn
+        draw = (kind == DRAW) & ~draw_fault
+        a, b = self.source.draw_choices(g[draw])
+        self._draw(g[draw], p, a, b)
+
+        self.turns[g] += 1
+        self.turn += 1
+
+    def run(self, max_turns: int = 1000) -> None:
+        """Set up and play every game to the end (or ``max_turns`` turns)."""
+        self.setup()
+        while not self.over.all() and self.turn < max_turns:
+            self.step()
+        self.over |= (self.trains <= 2).any(axis=1)
+
+    def final_scores(self) -> np.ndarray:
+        """``(games, players)`` scores as computed by ``Game._score_game(True)``."""
+        seats = np.arange(self.num_players)
+        owned = self.owner[:, None, :] == seats[None, :, None]
+        score = (owned * self.route_points).sum(axis=2)
+        score += (self.held & self.completed) @ self.ticket_value
+        score -= (self.held & ~self.completed) @ self.ticket_value
+        score += LONGEST_PATH_BONUS * (self.holder[:, None] == seats)
+        return score
+
+    # ── rules ──────────────────────────────────────────────────────────────────
+    def _affordable(self, g: np.ndarray, p: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Affordable-route mask and locomotives needed per route, as AffordabilityIndex."""
+        hand = self.hand[g, p].astype(np.int32)
+        best = np.delete(hand, LOCOMOTIVE, axis=1).max(axis=1)
+        have = np.concatenate([hand, best[:, None]], axis=1)[:, self.route_color]
+        need = np.maximum(0, self.route_length - have)
+        afford = (self.owner[g] < 0) & (need <= hand[:, LOCOMOTIVE, None])
+        return afford, need
+
+    def _add_card(self, g: np.ndarray, p: int, cards: np.ndarray, exposed: bool) -> None:
+        """Put one card into the hand of seat ``p`` in each game."""
+        self.hand[g, p, cards] += 1
+        if exposed:
+            self.exposed[g, p, cards] += 1
+        new = self.first_seen[g, p, cards] == _UNSEEN
+        self.first_seen[g[new], p, cards[new]] = self._stamp
+        self._stamp += 1
+
+    def _append_discard(self, g: np.ndarray, cards: np.ndarray, counts: np.ndarray) -> None:
+        """Append the first ``counts[i]`` cards of each row to the discard piles."""
+        for t in range(cards.shape[1]):
+            sel = t < counts
+            self.discard[g[sel], self.discard_len[g[sel]] + t] = cards[sel, t]
+        self.discard_len[g] += counts
+
+    def _reshuffle(self, g: np.ndarray) -> None:
+        """Replace the deck with the shuffled discard pile, where there is one."""
+        g = g[self.discard_len[g] > 0]
+        if not len(g):
+            return
+        self.deck[g] = self.source.shuffle("cards", self.discard[g], self.discard_len[g])
+        self.deck_len[g] = self.discard_len[g]
+        self.discard[g] = EMPTY
+        self.discard_len[g] = 0
+
+    def _refill(self, g: np.ndarray) -> None:
+        """Top the markets back up to five cards, applying the mulligan rule."""
+        g = g[self.market_len[g] < MARKET_SIZE]
+        while len(g):
+            self._reshuffle(g[self.deck_len[g] == 0])
+            g = g[self.deck_len[g] > 0]
+            top = self.deck_len[g] - 1
+            self.market[g, self.market_len[g]] = self.deck[g, top]
+            self.deck[g, top] = EMPTY
+            self.deck_len[g] = top
+            self.market_len[g] += 1
+
+            many = g[(self.market[g] == LOCOMOTIVE).sum(axis=1) >= 3]
+            if len(many):
+                pos = np.arange(DECK_SIZE)
+                non_loco = (((self.deck[many] != LOCOMOTIVE) & (pos < self.deck_len[many, None])).sum(axis=1)
+                            + ((self.discard[many] != LOCOMOTIVE) & (pos < self.discard_len[many, None])).sum(axis=1)
+                            + ((self.market[many] != LOCOMOTIVE) & (self.market[many] != EMPTY)).sum(axis=1))
+                many = many[non_loco >= 3]
+                self._append_discard(many, self.market[many], self.market_len[many])
+                self.market[many] = EMPTY
+                self.market_len[many] = 0
+            g = g[self.market_len[g] < MARKET_SIZE]
+
+    def _take_face_up(self, g: np.ndarray, p: int, slots: np.ndarray) -> None:
+        """Take a market card; later cards slide left and the market is refilled."""
+        cards = self.market[g, slots]
+        self.market[g] = np.take_along_axis(self.market[g], _SHIFT[slots], axis=1)
+        self.market_len[g] -= 1
+        self.market[g, self.market_len[g]] = EMPTY
+        self._refill(g)
+        self._add_card(g, p, cards, True)
+
+    def _draw_face_down(self, g: np.ndarray, p: int) -> np.ndarray:
+        """Draw the top deck card in each game; returns which games succeeded."""
+        self._reshuffle(g[self.deck_len[g] == 0])
+        ok = self.deck_len[g] > 0
+        g = g[ok]
+        top = self.deck_len[g] - 1
+        cards = self.deck[g, top]
+        self.deck[g, top] = EMPTY
+        self.deck_len[g] = top
+        self._add_card(g, p, cards, False)
+        return ok
+
+    def _draw(self, g: np.ndarray, p: int, a: np.ndarray, b: np.ndarray) -> None:
+        """Two draw choices per game, as ``Player.__draw_train_cards``."""
+        # a face-up locomotive is the only card taken
+        loco = []
+        for c in (a, b):
+            valid = (c >= 0) & (c < self.market_len[g])
+            loco.append(valid & (self.market[g, np.clip(c, 0, MARKET_SIZE - 1)] == LOCOMOTIVE))
+        first = loco[0]
+        single = first | loco[1]
+        self._take_face_up(g[single], p, np.where(first, a, b)[single])
+
+        g, a, b = g[~single], a[~single], b[~single]
+        alive = np.ones(len(g), dtype=bool)
+        for c in (a, b):
+            up = alive & (c >= 0)
+            valid = up & (c < self.market_len[g])
+            alive &= ~up | valid
+            self._take_face_up(g[valid], p, c[valid])
+            down = np.flatnonzero(alive & (c == -1))
+            ok = self._draw_face_down(g[down], p)
+            alive[down[~ok]] = False
+
+    def _most_common_color(self, g: np.ndarray, p: int) -> np.ndarray:
+        """Most common non-locomotive color, ties going to the color held first."""
+        hand = self.hand[g, p].astype(np.int32)
+        hand[:, LOCOMOTIVE] = -1
+        top = hand == hand.max(axis=1, keepdims=True)
+        return np.where(top, self.first_seen[g, p], _UNSEEN).argmin(axis=1)
+
+    def _claim(self, g: np.ndarray, p: int, afford: np.ndarray, need: np.ndarray) -> None:
+        """Claim a random affordable route with as few locomotives as possible."""
+        if not len(g):
+            return
+        k = np.arange(len(g))
+        pick = self.source.route_choice(g, afford.sum(axis=1))
+        routes = (np.cumsum(afford, axis=1) > pick[:, None]).argmax(axis=1)
+        length = self.route_length[routes].astype(np.int64)
+        locos = np.minimum(need[k, routes], length)
+        colored = length - locos
+
+        color = self.route_color[routes].astype(np.int64)
+        gray = (color == GRAY) & (colored > 0)
+        color[gray] = self._most_common_color(g[gray], p)
+        color[colored == 0] = LOCOMOTIVE
+
+        self.hand[g, p, color] -= colored
+        self.hand[g, p, LOCOMOTIVE] -= locos
+        self.exposed[g, p, color] = np.maximum(0, self.exposed[g, p, color] - colored)
+        self.exposed[g, p, LOCOMOTIVE] = np.maximum(0, self.exposed[g, p, LOCOMOTIVE] - locos)
+        spent = np.where(np.arange(6) < colored[:, None], color[:, None], LOCOMOTIVE)
+        self._append_discard(g, spent, length)
+        self.trains[g, p] -= length
+        self.owner[g, routes] = p
+
+        # merge the two endpoint components
+        labels = self.label[g, p]
+        keep = labels[k, self.route_city1[routes]]
+        gone = labels[k, self.route_city2[routes]]
+        labels = np.where(labels == gone[:, None], keep[:, None], labels)
+        self.label[g, p] = labels
+        self.completed[g, p] |= self.held[g, p] & (labels[:, self.ticket_city1] == labels[:, self.ticket_city2])
+
+        # longest trail: only the grown component can change, and it only
+        # matters if it could beat the current holder
+        component = (self.owner[g] == p) & (labels[:, self.route_city1] == keep[:, None])
+        total = (component * self.route_length).sum(axis=1)
+        holder = self.holder[g]
+        holder_len = np.where(holder >= 0, self.longest[g, holder], 0)
+        for i in np.flatnonzero(total > holder_len):
+            trail = longest_trail([self.board.routes[r] for r in np.flatnonzero(component[i])], int(total[i]))
+            game = g[i]
+            if trail > self.longest[game, p]:
+                self.longest[game, p] = trail
+            if trail > holder_len[i]:
+                self.holder[game] = p
+
+    def _draw_tickets(self, g: np.ndarray, p: int) -> None:
+        """Deal three tickets, keep the first two (as RandomBot) and return the third."""
+        if not len(g):
+            return
+        offer = self.stack[g, :3].astype(np.int64)
+        self.stack[g, :-3] = self.stack[g, 3:]
+        self.stack[g, -3:] = EMPTY
+        self.stack_len[g] -= 3
+        self.held[g, p, offer[:, 0]] = True
+        self.held[g, p, offer[:, 1]] = True
+        self.stack[g, self.stack_len[g]] = offer[:, 2]
+        self.stack_len[g] += 1
+        self.stack[g] = self.source.shuffle("tickets", self.stack[g], self.stack_len[g])
+
+    # ── engine interop ─────────────────────────────────────────────────────────
+    @classmethod
+    def from_game(cls, game: Game, source=None) -> 'BatchSimulator':
+        """Single-game batch holding the exact state of a running game."""
+        context = game.context
+        deck, tickets = context.train_deck, context.ticket_deck
+        sim = cls(1, len(game.players), source=source, board=context.board)
+        for pile, length, cards in ((sim.deck, sim.deck_len, deck.get_draw_pile()),
+                                    (sim.market, sim.market_len, deck.get_face_up()),
+                                    (sim.discard, sim.discard_len, deck.get_discard_pile())):
+            pile[0, :len(cards)] = [CARD_CODES[c] for c in cards]
+            length[0] = len(cards)
+        sim.stack[0, :len(tickets)] = [tickets.index_of(t) for t in tickets._stack]
+        sim.stack_len[0] = len(tickets)
+
+        seats = {p.player_id: seat for seat, p in enumerate(game.players)}
+        for seat, p in enumerate(game.players):
+            for rank, (card, count) in enumerate(p.get_hand().items()):
+                sim.hand[0, seat, CARD_CODES[card]] = count
+                sim.first_seen[0, seat, CARD_CODES[card]] = rank
+            for card, count in p.get_exposed().items():
+                sim.exposed[0, seat, CARD_CODES[card]] = max(count, 0)
+            sim.trains[0, seat] = p.trains_remaining
+            for t in p.get_tickets():
+                sim.held[0, seat, tickets.index_of(t)] = True
+                sim.completed[0, seat, tickets.index_of(t)] = t.is_completed
+        sim._stamp = len(CARD_COLORS)
+
+        m = context.map_graph
+        for r in range(len(m.routes)):
+            owner = m.route_owner(r)
+            if owner is not None:
+                seat = seats[owner]
+                sim.owner[0, r] = seat
+                labels = sim.label[0, seat]
+                labels[labels == labels[sim.route_city2[r]]] = labels[sim.route_city1[r]]
+        for pid, length in m.longest_paths.items():
+            sim.longest[0, seats[pid]] = length
+        sim.holder[0] = seats.get(m.longest_path_holder, EMPTY)
+        sim.turn = game.turn_index
+        return sim
+
+    def snapshot(self, g: int) -> Dict:
+        """Comparable description of one game (component labels excluded)."""
+        holder = int(self.holder[g])
+        return {
+            "turn": self.turn,
+            "deck": self.deck[g, :self.deck_len[g]].tolist(),
+            "market": self.market[g, :self.market_len[g]].tolist(),
+            "discard": self.discard[g, :self.discard_len[g]].tolist(),
+            "stack": self.stack[g, :self.stack_len[g]].tolist(),
+            "owner": self.owner[g].tolist(),
+            "holder": holder,
+            "holderLength": int(self.longest[g, holder]) if holder >= 0 else 0,
+            "players": [{
+                "hand": self.hand[g, p].tolist(),
+                "exposed": self.exposed[g, p].tolist(),
+                "colorOrder": [int(c) for c in np.argsort(self.first_seen[g, p], kind="stable")
+                               if self.first_seen[g, p, c] != _UNSEEN],
+                "trains": int(self.trains[g, p]),
+                "tickets": np.flatnonzero(self.held[g, p]).tolist(),
+                "completed": np.flatnonzero(self.completed[g, p]).tolist(),
+            } for p in range(self.num_players)],
+        }
+
+
+def run_batch(num_games: int, num_players: int, seed: Optional[int] = None,
+              max_turns: int = 1000) -> Dict:
+    """Play ``num_games`` RandomBot games and summarize the results."""
+    sim = BatchSimulator(num_games, num_players, seed)
+    sim.run(max_turns)
+    scores = sim.final_scores()
+    best = scores.max(axis=1, keepdims=True)
+    winners = scores == best
+    sole = winners & (winners.sum(axis=1, keepdims=True) == 1)
+    return {
+        "games": num_games,
+        "scores": scores,
+        "turns": sim.turns,
+        "unfinished": int((~sim.over).sum()),
+        "winRate": sole.mean(axis=0),
+        "tieRate": (winners & ~sole).mean(axis=0),
+        "averageScore": scores.mean(axis=0),
+    }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Consistency check against the reference engine
+# ────────────────────────────────────────────────────────────────────────────────
+class _RecordingRandom(random.Random):
+    """Random stream that records the result of every shuffle."""
+
+    def __init__(self, rng: random.Random, log: list, encode: Callable):
+        super().__init__()
+        self.setstate(rng.getstate())
+        self.log = log
+        self.encode = encode
+
+    def shuffle(self, x):
+        super().shuffle(x)
+        self.log.append([self.encode(item) for item in x])
+
+
+class _ReplaySource:
+    """Feeds the decisions and shuffles recorded from the engine back to a batch."""
+
+    def __init__(self, log: Dict[str, list]):
+        self.log = log
+
+    def draw_choices(self, games):
+        choices = [self.log["draws"].pop(0) for _ in range(2 * len(games))]
+        return np.array(choices[0::2], dtype=np.int64), np.array(choices[1::2], dtype=np.int64)
+
+    def route_choice(self, games, counts):
+        return np.array([self.log["routes"].pop(0) for _ in games], dtype=np.int64)
+
+    def shuffle(self, kind, values, lengths):
+        out = np.full_like(values, EMPTY)
+        for i in range(len(values)):
+            order = self.log[kind].pop(0)
+            out[i, :len(order)] = order
+        return out
+
+
+def check_against_engine(seeds: Sequence[int], num_players: int = 2, verbose: bool = False) -> Tuple[int, int]:
+    """Replay RandomBot games of the reference engine turn by turn.
+
+    Before every engine turn (and before the starting deal) the game is
+    loaded into a one-game batch; the batch then plays the same turn using
+    the decisions and shuffles the engine made, and both resulting states
+    must be identical, as must the final scores. Returns
+    ``(steps checked, mismatching steps)``.
+    """
+    from context.game_context import GameContext
+    from context.GameLogger import GameLogger
+    from Interfaces.random_bot import RandomBot
+    from main import PLAYER_COLORS
+    from player import Player
+
+    log: Dict[str, list] = {"draws": [], "routes": [], "cards": [], "tickets": []}
+
+    class RecordingRandomBot(RandomBot):
+        def choose_draw_train_action(self) -> int:
+            choice = super().choose_draw_train_action()
+            log["draws"].append(choice)
+            return choice
+
+        def choose_route_to_claim(self, claimable_routes):
+            choice = super().choose_route_to_claim(claimable_routes)
+            log["routes"].append(claimable_routes.index(choice))
+            return choice
+
+    checked = mismatches = 0
+    for seed in seeds:
+        players = [Player(f"bot_{i}", RecordingRandomBot(), f"RandomBot_{i + 1}", PLAYER_COLORS[i])
+                   for i in range(num_players)]
+        logger = GameLogger(players)
+        logger.add_round()
+        context = GameContext([p.player_id for p in players], seed=seed)
+        ticket_deck: 'TicketDeck' = context.ticket_deck
+        context.train_deck._rng = _RecordingRandom(context.train_deck._rng, log["cards"], int)
+        ticket_deck._rng = _RecordingRandom(ticket_deck._rng, log["tickets"], ticket_deck.index_of)
+        game = Game(context, players, logger, 0)
+        play_turn = game.next_turn
+        # the first check covers the starting deal done by Game.play
+        setup = BatchSimulator.from_game(game)
+
+        def replay(sim: BatchSimulator, advance: Callable[[], None], what: str) -> None:
+            """Advance the batch with the engine's recorded choices and compare."""
+            nonlocal checked, mismatches
+            source = _ReplaySource({kind: entries[:] for kind, entries in log.items()})
+            sim.source = source
+            try:
+                advance()
+                ok = sim.snapshot(0) == BatchSimulator.from_game(game).snapshot(0)
+            except IndexError:
+                ok = False  # the batch asked for a decision the engine never made
+            ok = ok and not any(source.log.values())
+            checked += 1
+            if not ok:
+                mismatches += 1
+                if verbose:
+                    print(f"seed {seed}: batch disagrees with the engine on {what}", file=sys.stderr)
+            for entries in log.values():
+                entries.clear()
+
+        def next_turn():
+            nonlocal setup
+            if setup is not None:
+                setup.turn = game.turn_index
+                replay(setup, setup.deal_starting_hands, "the starting deal")
+                setup = None
+            sim = BatchSimulator.from_game(game)
+            play_turn()
+            replay(sim, sim.step, f"turn {game.turn_index - 1}")
+
+        game.next_turn = next_turn
+        game.play()
+        # final scores, including ticket penalties and the longest-path bonus
+        checked += 1
+        if BatchSimulator.from_game(game).final_scores()[0].tolist() != [context.scores[p.player_id] for p in players]:
+            mismatches += 1
+            if verbose:
+                print(f"seed {seed}: batch disagrees with the engine on the final scores", file=sys.stderr)
+    return checked, mismatches
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point for batched RandomBot games."""
+    parser = argparse.ArgumentParser(description="Play many RandomBot games at once on NumPy arrays.")
+    parser.add_argument("--games", type=int, default=10000, help="number of games")
+    parser.add_argument("--players", type=int, default=2, help="players per game")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the batch")
+    parser.add_argument("--batch-size", type=int, default=10000, help="games simulated at once")
+    parser.add_argument("--max-turns", type=int, default=1000, help="stop games still running after this many turns")
+    parser.add_argument("--check", type=int, default=0, metavar="N",
+                        help="instead replay N reference-engine games and compare every turn")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        checked, mismatches = check_against_engine(range(args.check), args.players, verbose=True)
+        print(f"{checked} steps checked, {mismatches} mismatches")
+        sys.exit(1 if mismatches else 0)
+
+    start = time.perf_counter()
+    results = []
+    for i, first in enumerate(range(0, args.games, args.batch_size)):
+        size = min(args.batch_size, args.games - first)
+        results.append(run_batch(size, args.players, None if args.seed is None else args.seed + i, args.max_turns))
+    elapsed = time.perf_counter() - start
+
+    scores = np.concatenate([r["scores"] for r in results])
+    turns = np.concatenate([r["turns"] for r in results])
+    weights = np.array([r["games"] for r in results])[:, None]
+    win_rate = (np.array([r["winRate"] for r in results]) * weights).sum(axis=0) / args.games
+    print(f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed:.0f} games/s), "
+          f"{turns.mean():.1f} turns on average, {sum(r['unfinished'] for r in results)} unfinished")
+    for seat in range(args.players):
+        print(f"seat {seat}: win rate {win_rate[seat]:.3f}, average score {scores[:, seat].mean():.2f}")
+
+
+if __name__ == "__main__":
+    main()
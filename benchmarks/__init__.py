@@ -0,0 +1 @@
+"""Benchmarks for the engine's hot paths; run with ``python -m benchmarks``."""
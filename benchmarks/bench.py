@@ -0,0 +1,222 @@
+"""Measure the engine's hot paths and end-to-end game throughput.
+
+Every hot path is timed on the recorded positions of :mod:`benchmarks.states`
+(early, mid and late game with 2 and 4 players). For each one the report
+holds operations per second (best of several repeats), and from a separate
+:mod:`tracemalloc` pass the bytes still allocated per operation and the
+largest transient allocation of a single operation. Full games are timed
+per lineup. Results are written as JSON so runs on different commits can
+be compared with ``--compare``.
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from benchmarks.states import PHASES, RecordedState, recorded_state
+from context.GameLogger import GameLogger
+from context.decks import TrainCardDeck
+from tournament import play_round
+
+PLAYER_COUNTS = (2, 4)
+LINEUPS = (
+    ("RandomBot", "RandomBot"),
+    ("RandomBot", "RandomBot", "RandomBot", "RandomBot"),
+    ("ExampleBot", "RandomBot"),
+)
+CARD_COLORS = tuple(TrainCardDeck.COLOR_COUNTS)
+
+
+def measure(prepare: Callable[[int], List[Any]], op: Callable[[Any], Any],
+            number: int, repeat: int) -> Dict[str, float]:
+    """Time ``op`` over the inputs built by ``prepare(number)``.
+
+    Building the inputs is not timed, so operations that change state can
+    be given a fresh copy each.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        inputs = prepare(number)
+        start = time.perf_counter_ns()
+        for x in inputs:
+            op(x)
+        best = min(best, time.perf_counter_ns() - start)
+    per_op = best / number
+
+    inputs = prepare(number)
+    tracemalloc.start()
+    peak = 0
+    base, _ = tracemalloc.get_traced_memory()
+    for x in inputs:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        op(x)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    retained = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return {
+        "opsPerSec": round(1e9 / per_op, 1) if per_op else float("inf"),
+        "meanNs": round(per_op, 1),
+        "retainedBytesPerOp": round(retained / number, 1),
+        "peakBytes": peak,
+    }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# hot paths; each returns (prepare, op) for one recorded state
+# ────────────────────────────────────────────────────────────────────────────────
+def bench_affordable_routes(state: RecordedState):
+    """``Player.get_affordable_routes`` right after the hand changed."""
+    player = state.game.current_player()
+    index = player._affordability
+
+    def op(_):
+        index.cards_changed(CARD_COLORS)
+        player.get_affordable_routes()
+    return (lambda n: [None] * n), op
+
+
+def bench_update_longest_path(state: RecordedState):
+    """``MapGraph.update_longest_path`` after the current player claims a route."""
+    player_id = state.game.current_player().player_id
+
+    def prepare(n):
+        inputs = []
+        for _ in range(n):
+            map_graph = state.fresh_map()
+            owned = {c for r in map_graph.get_claimed_routes(player_id) for c in (r.city1, r.city2)}
+            available = map_graph.get_available_routes()
+            route = next((r for r in available if r.city1 in owned or r.city2 in owned), available[0])
+            map_graph.claim_route(route, player_id)
+            inputs.append((map_graph, route))
+        return inputs
+    return prepare, lambda x: x[0].update_longest_path(player_id, x[1])
+
+
+def bench_draw_face_up(state: RecordedState):
+    """``TrainCardDeck.draw_face_up`` including the market refill."""
+    return (lambda n: [state.fresh_deck() for _ in range(n)]), (lambda deck: deck.draw_face_up(0))
+
+
+def bench_logger_add_turn(state: RecordedState):
+    """``GameLogger.add_turn`` for the current player's context, kept in memory."""
+    game = state.game
+    context = game.player_contexts[game.current_player().player_id]
+
+    def prepare(n):
+        logger = GameLogger(game.players)
+        logger.add_round()
+        return [logger] * n
+    return prepare, lambda logger: logger.add_turn(0, context)
+
+
+HOT_PATHS: Dict[str, Callable] = {
+    "Player.get_affordable_routes": bench_affordable_routes,
+    "MapGraph.update_longest_path": bench_update_longest_path,
+    "TrainCardDeck.draw_face_up": bench_draw_face_up,
+    "GameLogger.add_turn": bench_logger_add_turn,
+}
+
+
+def bench_games(lineup: Sequence[str], games: int) -> Dict[str, Any]:
+    """End-to-end throughput of seeded games for one lineup."""
+    start = time.perf_counter()
+    turns = sum(play_round(lineup, seed)["turns"] for seed in range(games))
+    elapsed = time.perf_counter() - start
+    return {
+        "lineup": list(lineup),
+        "games": games,
+        "gamesPerSec": round(games / elapsed, 2),
+        "turnsPerSec": round(turns / elapsed, 1),
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(number: int = 200, repeat: int = 5, games: int = 20) -> Dict[str, Any]:
+    """Run every benchmark and return the report."""
+    results = []
+    for num_players in PLAYER_COUNTS:
+        for phase in PHASES:
+            state = recorded_state(num_players, phase)
+            for name, bench in HOT_PATHS.items():
+                prepare, op = bench(state)
+                results.append(dict(name=name, players=num_players, phase=phase,
+                                    **measure(prepare, op, number, repeat)))
+    return {
+        "meta": {
+            "commit": _commit(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "number": number,
+            "repeat": repeat,
+        },
+        "hotPaths": results,
+        "games": [bench_games(lineup, games) for lineup in LINEUPS],
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Lines giving each result's speed relative to ``baseline`` (>1 is faster)."""
+    key = lambda r: (r["name"], r["players"], r["phase"])
+    old = {key(r): r for r in baseline["hotPaths"]}
+    lines = []
+    for r in report["hotPaths"]:
+        if key(r) in old:
+            lines.append(f"{r['name']:32} {r['players']}p {r['phase']:5} "
+                         f"x{r['opsPerSec'] / old[key(r)]['opsPerSec']:.2f}")
+    old_games = {tuple(g["lineup"]): g for g in baseline["games"]}
+    for g in report["games"]:
+        if tuple(g["lineup"]) in old_games:
+            lines.append(f"{' '.join(g['lineup']):32} games   "
+                         f"x{g['gamesPerSec'] / old_games[tuple(g['lineup'])]['gamesPerSec']:.2f}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point for the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Benchmark the engine's hot paths and full games.")
+    parser.add_argument("--output", default="benchmark-results.json", help="JSON report to write")
+    parser.add_argument("--compare", default=None, metavar="BASELINE", help="earlier report to compare against")
+    parser.add_argument("--number", type=int, default=200, help="operations per timing repeat")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats (the best one is kept)")
+    parser.add_argument("--games", type=int, default=20, help="games per lineup")
+    parser.add_argument("--quick", action="store_true", help="small run for a fast sanity check")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.number, args.repeat, args.games = 20, 2, 3
+
+    report = run(args.number, args.repeat, args.games)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for r in report["hotPaths"]:
+        print(f"{r['name']:32} {r['players']}p {r['phase']:5} {r['opsPerSec']:>12,.0f} ops/s "
+              f"{r['retainedBytesPerOp']:>9,.0f} B/op retained {r['peakBytes']:>9,} B peak")
+    for g in report["games"]:
+        print(f"{' '.join(g['lineup']):32} {g['gamesPerSec']:>8} games/s {g['turnsPerSec']:>10} turns/s")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nrelative to {baseline['meta'].get('commit')}:")
+        print("\n".join(compare(report, baseline)))
+    print(f"\nreport written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Late-game benchmark for MapGraph longest-path tracking.
+
+Compares the trail engine behind :meth:`MapGraph.update_longest_path` with the
+previous implementation (adjacency rebuilt on every recursive call, visited
+routes copied at every step), replaying the same claim sequences on both.
+
+Run from the repository root::
+
+    python -m benchmarks.longest_path
+"""
+import argparse
+import random
+import time
+from typing import Dict, List, Set
+
+from context.Map import MapGraph, Route
+
+
+def legacy_longest_path(routes: List[Route], player_id: str, cities: Set[str]) -> int:
+    """The pre-engine search, kept only as a reference for timing and answers."""
+    def build_adjacency() -> Dict[str, List[Route]]:
+        adj: Dict[str, List[Route]] = {}
+        for route in routes:
+            if route.claimed_by == player_id:
+                adj.setdefault(route.city1, []).append(route)
+                adj.setdefault(route.city2, []).append(route)
+        return adj
+
+    def dfs(current_city: str, visited: Set[Route], current_best: int) -> int:
+        adj = build_adjacency()
+        best = current_best
+        for r in [r for r in adj.get(current_city, []) if r not in visited]:
+            best = max(best, dfs(r.other_city(current_city), visited | {r}, current_best + r.length))
+        return best
+
+    return max((dfs(city, set(), 0) for city in cities), default=0)
+
+
+def late_game_claims(seed: int, network_size: int) -> List[int]:
+    """Grow one connected network of ``network_size`` routes from a random city.
+
+    Returns indices into ``MapGraph().routes`` in claim order.
+    """
+    rng = random.Random(seed)
+    graph = MapGraph()
+    index = {r: i for i, r in enumerate(graph.routes)}
+    owned: List[int] = []
+    frontier = {rng.choice(graph.routes).city1}
+    while len(owned) < network_size:
+        options = [index[r] for c in sorted(frontier) for r in graph._adj[c] if index[r] not in owned]
+        choice = rng.choice(options)
+        owned.append(choice)
+        frontier.update(graph.routes[choice].get_cities())
+    return owned
+
+
+def replay(claims: List[int], use_legacy: bool) -> 'tuple[float, List[int]]':
+    """Claim routes one by one on a fresh map, updating the longest path after each."""
+    graph = MapGraph()
+    owned_cities: Set[str] = set()
+    answers = []
+    start = time.perf_counter()
+    for i in claims:
+        route = graph.routes[i]
+        graph.claim_route(route, "p")
+        owned_cities.update(route.get_cities())
+        if use_legacy:
+            answers.append(legacy_longest_path(graph.routes, "p", owned_cities))
+        else:
+            graph.update_longest_path("p", route)
+            answers.append(graph.longest_paths["p"])
+    return time.perf_counter() - start, answers
+
+
+def main():
+    """Time both implementations on growing late-game networks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 12, 16, 20])
+    parser.add_argument("--seeds", type=int, default=3, help="boards per network size")
+    args = parser.parse_args()
+
+    print(f"{'routes':>6} {'legacy (s)':>12} {'engine (s)':>12} {'speedup':>9}")
+    for size in args.sizes:
+        legacy_time = engine_time = 0.0
+        for seed in range(args.seeds):
+            claims = late_game_claims(seed, size)
+            t_legacy, legacy_answers = replay(claims, True)
+            t_engine, engine_answers = replay(claims, False)
+            if legacy_answers != engine_answers:
+                raise AssertionError(f"answers differ for seed {seed}, size {size}")
+            legacy_time += t_legacy
+            engine_time += t_engine
+        print(f"{size:>6} {legacy_time:>12.4f} {engine_time:>12.4f} {legacy_time / engine_time:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Seeded game positions shared by the benchmarks.
+
+A position is recorded by playing RandomBot games from a fixed seed up to a
+fraction of that game's full length, so every run and every commit measures
+exactly the same early, mid and late game states.
+"""
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+from Game import Game
+from context.GameLogger import GameLogger
+from context.Map import MapGraph
+from context.decks import TrainCardDeck
+from context.game_context import GameContext
+from Interfaces.random_bot import RandomBot
+from main import PLAYER_COLORS
+from player import Player
+
+# how far into the game each phase is taken, as a fraction of its length
+PHASES: Dict[str, float] = {
+    "early": 0.15,
+    "mid": 0.5,
+    "late": 0.9,
+}
+
+
+class RecordedState(NamedTuple):
+    """A paused game plus what is needed to rebuild its mutable parts."""
+    game: Game
+    # every claim so far, in order, as (route index, player id)
+    claims: List[Tuple[int, str]]
+
+    def fresh_map(self) -> MapGraph:
+        """A new map with the recorded claims replayed in order."""
+        map_graph = MapGraph(self.game.context.board)
+        for index, player_id in self.claims:
+            route = map_graph.routes[index]
+            map_graph.claim_route(route, player_id)
+            map_graph.update_longest_path(player_id, route)
+        return map_graph
+
+    def fresh_deck(self) -> TrainCardDeck:
+        """A new train deck holding the recorded deck, market and discard pile."""
+        return self.game.context.train_deck.copy()
+
+
+def _new_game(num_players: int, seed: int) -> Game:
+    players = [Player(f"bot_{i}", RandomBot(), f"RandomBot_{i + 1}", PLAYER_COLORS[i])
+               for i in range(num_players)]
+    logger = GameLogger(players)
+    logger.add_round()
+    context = GameContext([p.player_id for p in players], seed=seed)
+    return Game(context, players, logger, 0)
+
+
+@lru_cache(maxsize=None)
+def game_length(num_players: int, seed: int = 0) -> int:
+    """Number of turns the seeded RandomBot game lasts."""
+    game = _new_game(num_players, seed)
+    game.play()
+    return game.turn_index
+
+
+@lru_cache(maxsize=None)
+def recorded_state(num_players: int, phase: str, seed: int = 0) -> RecordedState:
+    """The seeded game paused at ``phase`` (one of :data:`PHASES`).
+
+    The returned game is shared between callers; benchmarks that mutate
+    state must work on :meth:`RecordedState.fresh_map` /
+    :meth:`RecordedState.fresh_deck` copies.
+    """
+    turns = int(game_length(num_players, seed) * PHASES[phase])
+    game = _new_game(num_players, seed)
+    claims: List[Tuple[int, str]] = []
+    game.context.map_graph.add_claim_listener(lambda route, player_id: claims.append((route.index, player_id)))
+    game.play(turns)
+    return RecordedState(game, claims)
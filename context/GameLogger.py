@@ -1,40 +1,134 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from context.player_context import PlayerContext
 from context.game_context import GameContext
 from player import Player
 from pathlib import Path
 from context.decks import DestinationTicket
 from context.Map import MapGraph
+from context.log_stream import JsonlLogWriter
+from context.delta_log import DeltaEncoder
+from context.latency import merge_summaries
+from context.match_stats import ScoreTable
+import numpy as np
 import json
 
 
 class GameLogger:
     player_list: List[Player]
 
-    def __init__(self, players: List[Player]):
+    def __init__(self, players: List[Player], stream_path: Optional[str] = None, compress: bool = False,
+                 delta: bool = False, keyframe_interval: int = 25):
+        """Collect turn records for the web display.
+
+        By default every turn is kept in ``self.log`` and written out by
+        :meth:`export_log`. With ``stream_path`` each record is instead written
+        to that file as newline-delimited JSON (gzip-compressed if ``compress``
+        is set or the path ends in ``.gz``) as soon as it is produced, so memory
+        use does not grow with the number of rounds. Streamed logs can be turned
+        back into the nested format with :func:`context.log_stream.convert_log`.
+
+        With ``delta`` (which needs ``stream_path``) the log stores a compact snapshot keyframe at the
+        start of each round and every ``keyframe_interval`` turns, and only the
+        per-turn changes in between; see :class:`context.delta_log.DeltaLogReader`.
+        """
         self.player_list = players
+        self.round_count = 0
+        self._turn_in_round = 0
+        self._writer: Optional[JsonlLogWriter] = None
+        self._delta: Optional[DeltaEncoder] = None
+        self._named_map: Optional[MapGraph] = None
+        self._route_labels: List[str] = []
+        # every logged turn's scores, kept as arrays for the match statistics
+        self.score_history = ScoreTable([p.player_id for p in players])
         self.log = {
             "rounds": [],
             "players": [{
                 "playerId": p.player_id,
                 "name": p.name,
-                "color": p.color
+                "color": p.color,
+                "bot": getattr(p.get_interface(), "bot_class", type(p.get_interface())).__name__
             } for p in players],
             "averageScores": [{
                 "playerId": p.player_id,
                 "scores": []
-            } for p in players]
+            } for p in players],
+            # decision latency per player, summed over the games played
+            "latency": {}
         }
+        if delta and stream_path is None:
+            raise ValueError("delta=True needs a stream_path; only streamed logs are delta-encoded")
+        if stream_path is not None:
+            self._writer = JsonlLogWriter(stream_path, compress)
+            header = {"type": "header", "players": self.log["players"]}
+            if delta:
+                self._delta = DeltaEncoder(keyframe_interval)
+                header.update({"format": "delta", "keyframeInterval": keyframe_interval})
+            self._writer.write(header)
 
     def set_player_list(self, players: List[Player]):
         self.player_list = players
 
-    def add_round(self):
-        self.log["rounds"].append({
-            "turns": []
-        })
+    def add_round(self, seed: Optional[int] = None):
+        """Start a new round; ``seed`` is its master seed, kept so it can be replayed."""
+        if self._writer is not None:
+            self._writer.write({"type": "round", "round": self.round_count, "seed": seed})
+        else:
+            self.log["rounds"].append({
+                "seed": seed,
+                "turns": []
+            })
+        self.round_count += 1
+        self._turn_in_round = 0
+        self.score_history.begin_round()
+        if self._delta is not None:
+            self._delta.begin_round()
 
     def add_turn(self, round_number: int, context: PlayerContext):
+        """Record the state at the start of a turn, in memory or on disk."""
+        if self._delta is not None:
+            snapshot = self.snapshot_turn(context)
+            route_names = self._route_names(context.map)
+            for record in self._delta.encode(round_number, self._turn_in_round, snapshot, route_names):
+                self._writer.write(record)
+        elif self._writer is not None:
+            turn_state = self.build_turn_state(context)
+            self._writer.write({"type": "turn", "round": round_number, "turn": self._turn_in_round, "state": turn_state})
+        else:
+            self.log["rounds"][round_number]["turns"].append(self.build_turn_state(context))
+        scores = {o.player_id: o.score for o in context.opponents}
+        scores[context.player_id] = context.score
+        self.score_history.add_turn(scores)
+        self._turn_in_round += 1
+
+    def end_round(self, scores: Dict[str, int]):
+        """Record a finished round's final scores for the match statistics."""
+        self.score_history.end_round(scores)
+
+    def snapshot_turn(self, context: PlayerContext) -> Dict:
+        """Compact full-information snapshot used by delta-encoded logs."""
+        scores = {o.player_id: o.score for o in context.opponents}
+        scores[context.player_id] = context.score
+        return {
+            "current": context.player_id,
+            "market": list(context.face_up_cards),
+            "players": {p.player_id: {
+                "score": scores[p.player_id],
+                "trains": p.trains_remaining,
+                "routes": np.flatnonzero(context.map.claimed_mask(p.player_id)).tolist(),
+                "tickets": [[t.city1, t.city2, t.value, t.is_completed] for t in p.get_tickets()],
+                "hand": {c: n for c, n in p.get_hand().items() if n},
+                "exposed": {c: n for c, n in p.get_exposed().items() if n > 0},
+            } for p in self.player_list}
+        }
+
+    def _route_names(self, map_graph: MapGraph) -> List[str]:
+        """Route labels as written in ``claimedRoutes``, cached per map."""
+        if self._named_map is not map_graph:
+            self._named_map = map_graph
+            self._route_labels = [f"{r}" for r in map_graph.routes]
+        return self._route_labels
+
+    def build_turn_state(self, context: PlayerContext) -> Dict:
         """
         Export a PlayerContext + full player list to JSON format.
         Assumes each player object has:
@@ -99,11 +193,20 @@ class GameLogger:
             "opponents": opponents_data,
             "gameObjects": {
                 "decks": {
-                    "marketCards": context.face_up_cards
+                    "marketCards": list(context.face_up_cards)
                 }
             }
         }
-        self.log["rounds"][round_number]["turns"].append(turn_state)
+        return turn_state
+
+    def add_latency(self, players: List[Player]):
+        """Fold the decision latency of a finished game into the match summary."""
+        latency = self.log["latency"]
+        for p in players:
+            summary = p.profiler.summary()
+            if p.player_id in latency:
+                summary = merge_summaries([latency[p.player_id], summary])
+            latency[p.player_id] = summary
 
     def find_player_score(self, turn: Dict, player_id: str) -> int:
         if (turn["player"]["playerId"] == player_id):
@@ -115,17 +218,19 @@ class GameLogger:
             return player_score
 
     def log_match_stats(self):
-        for turn in range(0, max([len(r["turns"]) for r in self.log["rounds"]])):
-            for p in self.player_list:
-                # print("Getting average scores for", p.name)
-                player_scores = \
-                next((player for player in self.log["averageScores"] if player["playerId"] == p.player_id))["scores"]
-                # print("looking for score on turn", turn)
-                turn_scores = [self.find_player_score(r["turns"][turn], p.player_id) for r in self.log["rounds"] if
-                               (turn < len(r["turns"]))]
-                # print("Scores list:", turn_scores)
-                player_scores.append(round(sum(turn_scores) / len(turn_scores)))
+        """Fill in the per-turn average scores and the match statistics."""
+        stats = self.score_history.stats()
+        curves = {p["playerId"]: p["averageScores"] for p in stats["players"]}
+        for entry in self.log["averageScores"]:
+            entry["scores"].extend(curves.get(entry["playerId"], []))
+        self.log["matchStats"] = stats
 
     def export_log(self, file_name: str):
+        if self._writer is not None:
+            # the turns are already on disk; finish the stream with the summary
+            self._writer.write({"type": "summary", "averageScores": self.log["averageScores"],
+                                "matchStats": self.log.get("matchStats"), "latency": self.log["latency"]})
+            self._writer.close()
+            return
         with open(f"display/web display/html1/logs/{file_name}.json", "w") as f:
             json.dump(self.log, f, indent=2)
\ No newline at end of file
@@ -1,20 +1,41 @@
-import csv
-from typing import List, Dict, Optional, Set
+import numpy as np
+from typing import Callable, List, Dict, Optional, Set, TYPE_CHECKING
+from context.longest_path import LongestTrailEngine
+from context.shortest_paths import ShortestPathService
+from context.ticket_routes import TicketRouteIndex
+from context.ticket_offers import OfferOption, TicketOfferEvaluator
+from context.board import BoardTemplate, load_board
+if TYPE_CHECKING:
+    from context.decks import DestinationTicket
 
 class Route:
-    city1: str
-    city2: str
-    length: int
-    color: str
-    claimed_by: 'str | None'
+    """A single route on the map.
 
-    def __init__(self, city1: str, city2: str, length: int, color: str):
+    Routes loaded by :class:`MapGraph` are thin views: the static fields are
+    stored once in ``__slots__`` and ownership is read from the graph's
+    integer owner array.
+    """
+    __slots__ = ("city1", "city2", "length", "color", "index", "city1_id", "city2_id", "_graph")
+
+    def __init__(self, city1: str, city2: str, length: int, color: str,
+                 index: int = -1, city1_id: int = -1, city2_id: int = -1,
+                 graph: 'Optional[MapGraph]' = None):
         """Represent a single route on the map."""
         self.city1 = city1
         self.city2 = city2
         self.length = length
         self.color = color
-        self.claimed_by = None
+        self.index = index
+        self.city1_id = city1_id
+        self.city2_id = city2_id
+        self._graph = graph
+
+    @property
+    def claimed_by(self) -> 'str | None':
+        """Id of the player owning this route, or ``None`` if unclaimed."""
+        if self._graph is None:
+            return None
+        return self._graph.route_owner(self.index)
 
     def other_city(self, city: str) -> str:
         """Return the opposite endpoint of the route."""
@@ -27,54 +48,138 @@ class Route:
     def __repr__(self):
         return f"{self.city1.replace(' ', '_')}-{self.city2.replace(' ', '_')}-{self.color}"
 
-class MapGraph:
+class DisjointSet:
+    """Union-find over city names, used to track a player's connected cities.
+
+    Uses path halving and union by size, so both :meth:`union` and
+    :meth:`find` run in amortized O(α(n)). Cities that were never added are
+    their own singleton group.
+    """
+
     def __init__(self):
-        """Load the map and prepare tracking of routes and paths."""
+        self._parent: Dict[str, str] = {}
+        self._size: Dict[str, int] = {}
+
+    def find(self, city: str) -> str:
+        """Return the representative city of ``city``'s group."""
+        parent = self._parent
+        if city not in parent:
+            return city
+        while parent[city] != city:
+            parent[city] = parent[parent[city]]
+            city = parent[city]
+        return city
+
+    def union(self, city1: str, city2: str) -> str:
+        """Merge the groups of both cities and return the new representative."""
+        for c in (city1, city2):
+            if c not in self._parent:
+                self._parent[c] = c
+                self._size[c] = 1
+        root1, root2 = self.find(city1), self.find(city2)
+        if root1 == root2:
+            return root1
+        if self._size[root1] < self._size[root2]:
+            root1, root2 = root2, root1
+        self._parent[root2] = root1
+        self._size[root1] += self._size.pop(root2)
+        return root1
+
+    def connected(self, city1: str, city2: str) -> bool:
+        """Return ``True`` if both cities are in the same group."""
+        return self.find(city1) == self.find(city2)
+
+    def groups(self) -> List[Set[str]]:
+        """Return every group of connected cities."""
+        groups: Dict[str, Set[str]] = {}
+        for city in self._parent:
+            groups.setdefault(self.find(city), set()).add(city)
+        return list(groups.values())
+
+
+class MapGraph:
+    def __init__(self, board: 'Optional[BoardTemplate]' = None):
+        """Prepare per-game claim tracking on top of a shared board.
+
+        ``board`` defaults to the bundled map; the static topology is parsed
+        once per process by :func:`context.board.load_board` and shared.
+        """
+        self.board: BoardTemplate = board if board is not None else load_board()
         self.longest_path_holder: str = ""
         self.longest_paths: Dict[str,int] = {}
-        self.routes: List[Route] = []
-        self._load_routes_from_csv("data/map.csv")  # <-- Hardcoded path
 
-        #paths hold dicts that associate player_ids with a list comprised of tuples containing (sets of connected cities, longest path length)
-        self.paths: 'Dict[str,List[tuple[set[str],int]]]' = {}
-        self.longest_paths: Dict[str,int]
-        self.longest_path_holder: str
+        # static data is shared with the board; city ids follow map file order
+        self.city_names = self.board.city_names
+        self.city_ids = self.board.city_ids
+        self.route_city1 = self.board.route_city1
+        self.route_city2 = self.board.route_city2
+        self.route_length = self.board.route_length
+        self.adjacency = self.board.adjacency
+        # per-game route views, indexed by Route.index
+        self.routes: List[Route] = [
+            Route(r.city1, r.city2, r.length, r.color, i, r.city1_id, r.city2_id, self)
+            for i, r in enumerate(self.board.routes)
+        ]
+
+        # claim state: owner code per route (-1 = unclaimed); codes index _owner_ids
+        self.owner = np.full(len(self.routes), -1, dtype=np.int8)
+        self._owner_ids: List[str] = []
+        self._owner_codes: Dict[str, int] = {}
+
+        # one union-find of connected cities per player, updated on every claim
+        self._networks: Dict[str, DisjointSet] = {}
+        self._trails = LongestTrailEngine()
 
-        self._adj: Dict[str, List[Route]] = {}
-        self._build_adjacency()
+        routes = self.routes
+        self._adj: Dict[str, List[Route]] = {
+            name: [routes[i] for i in self.board.city_routes[c]] for c, name in enumerate(self.city_names)
+        }
 
+        # callbacks fired as listener(route, player_id) after every successful claim
+        self._claim_listeners: List[Callable[[Route, str], None]] = []
 
-    def _load_routes_from_csv(self, csv_path: str):
-        """Load all map routes from a CSV file."""
-        with open(csv_path, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                city1 = row["city1"]
-                city2 = row["city2"]
-                length = int(row["Distance"])
-                color = row["Color"]
+        # created on first shortest-path query
+        self._shortest_paths: Optional[ShortestPathService] = None
+        # created on first ticket-relevance query
+        self._ticket_routes: Optional[TicketRouteIndex] = None
+        # created on first ticket-offer evaluation
+        self._ticket_offers: Optional[TicketOfferEvaluator] = None
 
-                route = Route(city1, city2, length, color)
-                self.routes.append(route)
+    def _owner_code(self, player_id: str) -> int:
+        """Return the owner array code of a player, assigning one on first claim."""
+        code = self._owner_codes.get(player_id)
+        if code is None:
+            code = self._owner_codes[player_id] = len(self._owner_ids)
+            self._owner_ids.append(player_id)
+        return code
 
     def _build_adjacency(self, player_id=None) -> Dict[str, List[Route]]:
         """Generate adjacency lists used for path finding."""
         if player_id is not None:
             player_adj: Dict[str, List[Route]] = {}
-            for route in self.routes:
-                if route.claimed_by == player_id:
-                    player_adj.setdefault(route.city1, []).append(route)
-                    player_adj.setdefault(route.city2, []).append(route)
+            for route in self.get_claimed_routes(player_id):
+                player_adj.setdefault(route.city1, []).append(route)
+                player_adj.setdefault(route.city2, []).append(route)
             return player_adj
-        for route in self.routes:
-            self._adj.setdefault(route.city1, []).append(route)
-            self._adj.setdefault(route.city2, []).append(route)
         return self._adj
 
     def claim_route(self, route: Route, player_id: str):
         """Mark a route as claimed by the given player."""
-        if route in self.routes and route.claimed_by is None:
-            route.claimed_by = player_id
+        if route._graph is self and self.owner[route.index] < 0:
+            self.owner[route.index] = self._owner_code(player_id)
+            self._trails.add_route(player_id, route)
+            self._networks.setdefault(player_id, DisjointSet()).union(route.city1, route.city2)
+            for listener in list(self._claim_listeners):
+                listener(route, player_id)
+
+    def add_claim_listener(self, listener: Callable[[Route, str], None]):
+        """Register a callback run after every successful claim."""
+        self._claim_listeners.append(listener)
+
+    def remove_claim_listener(self, listener: Callable[[Route, str], None]):
+        """Unregister a callback added with :meth:`add_claim_listener`."""
+        if listener in self._claim_listeners:
+            self._claim_listeners.remove(listener)
 
     def cities(self) -> Set[str]:
         """Return a set of every city on the map."""
@@ -83,80 +188,134 @@ class MapGraph:
 
 
 
+    def route_owner(self, index: int) -> 'str | None':
+        """Return the id of the player owning route ``index``, if any."""
+        code = self.owner[index]
+        return None if code < 0 else self._owner_ids[code]
+
+    def available_mask(self) -> np.ndarray:
+        """Boolean mask over ``routes`` of the unclaimed routes."""
+        return self.owner < 0
+
+    def claimed_mask(self, player_id: str) -> np.ndarray:
+        """Boolean mask over ``routes`` of the routes claimed by ``player_id``."""
+        code = self._owner_codes.get(player_id)
+        if code is None:
+            return np.zeros(len(self.routes), dtype=bool)
+        return self.owner == code
+
     def get_available_routes(self) -> List[Route]:
         """Return all routes that have not been claimed."""
-        return [route for route in self.routes if route.claimed_by is None]
+        routes = self.routes
+        return [routes[i] for i in np.flatnonzero(self.owner < 0).tolist()]
 
     def get_claimed_routes(self, player_id: str) -> List[Route]:
         """Return all routes claimed by the specified player."""
-        return [route for route in self.routes if route.claimed_by == player_id]
+        routes = self.routes
+        return [routes[i] for i in np.flatnonzero(self.claimed_mask(player_id)).tolist()]
 
     def update_longest_path(self, player_id: str, new_route: Route):
         """Update tracking for longest continuous path after a claim."""
-        # 1. Gather the endpoints of the newly claimed route
-        starting_points: Set[str] = {new_route.city1, new_route.city2}
+        # the trail engine already merged the claim into the player's network in
+        # claim_route; only the component it touched is recomputed here
+        self.longest_paths[player_id] = self._trails.longest(player_id)
 
-        # 2. Merge existing components that touch these cities
-        if player_id not in self.paths.keys():
-            self.paths[player_id] = []
-        for (cities, length) in self.paths[player_id]:
-            if new_route.city1 in cities or new_route.city2 in cities:
-                starting_points.update(cities)
-                self.paths[player_id].remove((cities,length))
-
-
-        # 3. Recompute this component's longest path length
-        new_length = self.get_longest_path(player_id, starting_points)
-
-        # 4. Update player's overall longest
-        other_best = max((l for (_, l) in self.paths[player_id]), default=0)
-        self.longest_paths[player_id] = max(new_length, other_best)
-
-        # 5. Store the merged component
-        self.paths[player_id].append((starting_points, new_length))
-
-        # 6. Possibly update the global longest-path holder
+        # possibly update the global longest-path holder
         holder_len = self.longest_paths.get(self.longest_path_holder, 0)
         if self.longest_paths[player_id] > holder_len:
             self.longest_path_holder = player_id
 
     def get_longest_path(self, player_id: str, cities: Set[str]) -> int:
         """Return the longest path length for a connected set of cities."""
-        # Build adjacency for this player
-        adj = self._build_adjacency(player_id)
-        max_length = 0
-        for city in cities:
-            length = self.dfs(city, set(), 0,player_id)
-            max_length = max(max_length, length)
-        return max_length
-
-    def dfs(self, current_city: str, visited: Set[Route], current_best: int, player_id: str) -> int:
-        """Depth-first search used by longest path calculations."""
-        # Explore all unvisited routes from current_city
-        adj = self._build_adjacency(player_id)
-        best = 0
-        children = [r for r in adj.get(current_city, []) if r not in visited]
-        if len(children) > 0:
-            for r in children:
-                nxt = r.other_city(current_city)
-                new_length = self.dfs(nxt, visited | {r},current_best + r.length, player_id)
-                best = max(best, new_length)
-        else:
-            group = self.is_city_in_groups(current_city, player_id)
-            set_to_add = set()
-            for r in visited:
-                set_to_add.update(r.get_cities())
-            if group:
-                group.update(set_to_add)
-            else:
-                self.paths[player_id].append((set_to_add,best))
-        return best
+        return self._trails.longest_through(player_id, cities)
 
-    
+    def is_connected(self, player_id: str, city1: str, city2: str) -> bool:
+        """Return ``True`` if the player's routes connect both cities."""
+        if city1 == city2:
+            return True
+        network = self._networks.get(player_id)
+        return network is not None and network.connected(city1, city2)
+
+    def is_ticket_completed(self, player_id: str, ticket: 'DestinationTicket') -> bool:
+        """Return ``True`` if the player's routes connect the ticket's cities."""
+        return self.is_connected(player_id, ticket.city1, ticket.city2)
+
+    def get_connected_groups(self, player_id: str) -> List[Set[str]]:
+        """Return the groups of cities connected by the player's routes."""
+        network = self._networks.get(player_id)
+        return network.groups() if network is not None else []
+
+    @property
+    def paths(self) -> 'Dict[str,List[tuple[set[str],int]]]':
+        """Each player's ``(connected cities, longest path length)`` groups.
+
+        Read-only view built from the players' union-finds on every access;
+        changing it does not affect the map.
+        """
+        return {
+            player_id: [(group, self._trails.longest_through(player_id, group)) for group in network.groups()]
+            for player_id, network in self._networks.items()
+        }
+
+    def tickets_completed_by(self, player_id: str, route: Route,
+                             tickets: 'List[DestinationTicket]') -> 'List[DestinationTicket]':
+        """List the tickets that claiming ``route`` would complete for the player.
+
+        The claim is evaluated hypothetically; nothing is modified. Tickets the
+        player has already connected are not included.
+        """
+        network = self._networks.get(player_id) or DisjointSet()
+        end1, end2 = network.find(route.city1), network.find(route.city2)
+        completed = []
+        for t in tickets:
+            a, b = network.find(t.city1), network.find(t.city2)
+            if a != b and ((a == end1 and b == end2) or (a == end2 and b == end1)):
+                completed.append(t)
+        return completed
+
+    @property
+    def shortest_paths(self) -> ShortestPathService:
+        """Cached all-pairs shortest path tables, built on first use."""
+        if self._shortest_paths is None:
+            self._shortest_paths = ShortestPathService(self)
+        return self._shortest_paths
+
+    @property
+    def ticket_routes(self) -> TicketRouteIndex:
+        """Cached ticket-to-route relevance tables, built on first use."""
+        if self._ticket_routes is None:
+            self._ticket_routes = TicketRouteIndex(self)
+        return self._ticket_routes
+
+    def rank_routes_for_tickets(self, player_id: str, candidates: 'List[tuple[Route, int]]',
+                                tickets: 'List[DestinationTicket]') -> 'List[tuple[Route, int]]':
+        """Claimable ``(route, locomotives)`` pairs ordered by how much they help ``tickets``."""
+        return self.ticket_routes.rank(player_id, candidates, tickets)
+
+    @property
+    def ticket_offers(self) -> TicketOfferEvaluator:
+        """Ticket-offer evaluator sharing the board's cost cache, built on first use."""
+        if self._ticket_offers is None:
+            self._ticket_offers = TicketOfferEvaluator(self)
+        return self._ticket_offers
+
+    def evaluate_ticket_offer(self, player_id: str, offer: 'List[DestinationTicket]',
+                              held: 'List[DestinationTicket]') -> List[OfferOption]:
+        """Extra trains and overlap of keeping each subset of ``offer`` next to ``held``."""
+        return self.ticket_offers.evaluate(player_id, offer, held)
+
+    def shortest_distance(self, player_id: str, city1: str, city2: str) -> Optional[int]:
+        """Trains the player still needs to connect two cities (``None`` if blocked).
+
+        The player's own routes cost nothing and other players' routes are
+        unusable.
+        """
+        return self.shortest_paths.distance(player_id, city1, city2)
+
+    def shortest_path(self, player_id: str, city1: str, city2: str) -> Optional[List[Route]]:
+        """One cheapest list of routes connecting two cities for the player."""
+        return self.shortest_paths.path(player_id, city1, city2)
 
-    def is_city_in_groups(self,city: str,player_id:str) -> 'set[str] | None':
-        """Helper for tracking connected components on the map."""
-        for (g,l) in self.paths[player_id]:
-            if city in g:
-                return g
-        return None
\ No newline at end of file
+    def ticket_distance(self, player_id: str, ticket: 'DestinationTicket') -> Optional[int]:
+        """Trains the player still needs to complete ``ticket``."""
+        return self.shortest_paths.distance(player_id, ticket.city1, ticket.city2)
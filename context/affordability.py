@@ -0,0 +1,101 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from context.Map import MapGraph, Route
+
+
+class AffordabilityIndex:
+    """Incrementally maintained answer to "which routes can I claim right now?".
+
+    A route's locomotive requirement only depends on its color and length, so
+    available routes are bucketed by ``(color, length)``. When the hand changes
+    only the buckets of the touched colors are re-evaluated (every bucket when
+    locomotives change), and only routes of buckets whose requirement actually
+    changed are touched. Claimed routes are dropped through the map's claim
+    listeners.
+    """
+
+    def __init__(self, map_graph: MapGraph, hand: 'Counter[str]'):
+        """Index the currently available routes of ``map_graph`` for ``hand``."""
+        self.map = map_graph
+        self._hand = hand
+
+        # (color, length) -> available routes in that bucket
+        self._buckets: 'Dict[tuple[str,int], List[Route]]' = {}
+        # (color, length) -> locomotives needed, or None if out of reach
+        self._bucket_need: 'Dict[tuple[str,int], Optional[int]]' = {}
+        # affordable route -> minimum locomotives needed
+        self._affordable: Dict[Route, int] = {}
+        self._cache: 'Optional[List[tuple[Route,int]]]' = None
+        self._best_color_count = 0
+
+        for r in map_graph.get_available_routes():
+            self._buckets.setdefault((r.color, r.length), []).append(r)
+            self._bucket_need[(r.color, r.length)] = None
+
+        self._best_color_count = self._most_common_count()
+        self._refresh(self._buckets.keys())
+        map_graph.add_claim_listener(self.route_claimed)
+
+    def detach(self) -> None:
+        """Stop listening to claims on the indexed map."""
+        self.map.remove_claim_listener(self.route_claimed)
+
+    def get_affordable_routes(self) -> 'List[tuple[Route, int]]':
+        """Return ``(route, min_locomotives)`` pairs in map order."""
+        if self._cache is None:
+            self._cache = sorted(self._affordable.items(), key=lambda item: item[0].index)
+        return list(self._cache)
+
+    def min_locomotives(self, route: Route) -> Optional[int]:
+        """Locomotives needed to claim ``route``, or ``None`` if it is out of reach."""
+        return self._affordable.get(route)
+
+    def cards_changed(self, colors: Iterable[str]) -> None:
+        """Re-evaluate the buckets affected by a change to the given colors."""
+        colors = set(colors)
+        if not colors:
+            return
+        if "L" in colors:
+            self._best_color_count = self._most_common_count()
+            self._refresh(self._buckets.keys())
+            return
+
+        best = self._most_common_count()
+        if best != self._best_color_count:
+            self._best_color_count = best
+            colors.add("X")
+        self._refresh(key for key in self._buckets.keys() if key[0] in colors)
+
+    def route_claimed(self, route: Route, player_id: str) -> None:
+        """Drop a route that has just been claimed by anyone."""
+        bucket = self._buckets.get((route.color, route.length))
+        if bucket is not None and route in bucket:
+            bucket.remove(route)
+        if self._affordable.pop(route, None) is not None:
+            self._cache = None
+
+    # Helpers
+    def _most_common_count(self) -> int:
+        """Largest non-locomotive color count in hand."""
+        return max((n for c, n in self._hand.items() if c != "L"), default=0)
+
+    def _need(self, color: str, length: int) -> Optional[int]:
+        """Locomotives needed for a bucket, or ``None`` if not affordable."""
+        have = self._best_color_count if color == "X" else self._hand.get(color, 0)
+        need = max(0, length - have)
+        return need if need <= self._hand.get("L", 0) else None
+
+    def _refresh(self, keys: 'Iterable[tuple[str,int]]') -> None:
+        """Recompute the given buckets and update routes whose status changed."""
+        for key in list(keys):
+            need = self._need(*key)
+            if need == self._bucket_need[key]:
+                continue
+            self._bucket_need[key] = need
+            self._cache = None
+            for r in self._buckets[key]:
+                if need is None:
+                    self._affordable.pop(r, None)
+                else:
+                    self._affordable[r] = need
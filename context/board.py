@@ -0,0 +1,136 @@
+import csv
+import numpy as np
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, Tuple, Union, TYPE_CHECKING
+if TYPE_CHECKING:
+    from context.ticket_offers import SteinerCostCache
+
+# bundled data files, resolved from the package rather than the working directory
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_MAP_PATH = DATA_DIR / "map.csv"
+DEFAULT_TICKETS_PATH = DATA_DIR / "Destination_tickets.csv"
+
+
+class RouteSpec(NamedTuple):
+    """Static description of one route, as read from the map file."""
+    city1: str
+    city2: str
+    length: int
+    color: str
+    city1_id: int
+    city2_id: int
+
+
+class TicketSpec(NamedTuple):
+    """Static description of one destination ticket."""
+    city1: str
+    city2: str
+    value: int
+
+
+class BoardTemplate:
+    """Parsed, read-only board shared by every game in the process.
+
+    Holds the static topology (interned city ids, route endpoints, lengths and
+    colors, direct-route adjacency) and the destination tickets. Games only add
+    a mutable overlay on top: :class:`context.Map.MapGraph` keeps the claim
+    state and :class:`context.decks.TicketDeck` its own ticket objects.
+    """
+
+    def __init__(self, map_path: str, tickets_path: str):
+        self.map_path = map_path
+        self.tickets_path = tickets_path
+
+        city_ids = {}
+        routes = []
+        with open(map_path, newline='') as csvfile:
+            for row in csv.DictReader(csvfile):
+                ids = []
+                for city in (row["city1"], row["city2"]):
+                    if city not in city_ids:
+                        city_ids[city] = len(city_ids)
+                    ids.append(city_ids[city])
+                routes.append(RouteSpec(row["city1"], row["city2"], int(row["Distance"]), row["Color"], *ids))
+
+        with open(tickets_path, newline='', encoding='utf-8') as csvfile:
+            tickets = [TicketSpec(row["city1"], row["city2"], int(row["value"])) for row in csv.DictReader(csvfile)]
+
+        self.city_names: Tuple[str, ...] = tuple(city_ids)
+        self.city_ids: Mapping[str, int] = MappingProxyType(city_ids)
+        self.routes: Tuple[RouteSpec, ...] = tuple(routes)
+        self.tickets: Tuple[TicketSpec, ...] = tuple(tickets)
+
+        # route data as arrays indexed by route index
+        self.route_city1 = np.array([r.city1_id for r in routes], dtype=np.int16)
+        self.route_city2 = np.array([r.city2_id for r in routes], dtype=np.int16)
+        self.route_length = np.array([r.length for r in routes], dtype=np.int8)
+        # shortest direct route length between two city ids, 0 if not adjacent
+        self.adjacency = np.zeros((len(city_ids), len(city_ids)), dtype=np.int8)
+        for r in sorted(routes, key=lambda r: -r.length):
+            self.adjacency[r.city1_id, r.city2_id] = r.length
+            self.adjacency[r.city2_id, r.city1_id] = r.length
+        # route indices touching each city id
+        self.city_routes: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(i for i, r in enumerate(routes) if c in (r.city1_id, r.city2_id))
+            for c in range(len(city_ids))
+        )
+        for array in (self.route_city1, self.route_city2, self.route_length, self.adjacency):
+            array.setflags(write=False)
+
+        self._static_distances: Optional[np.ndarray] = None
+        self._static_ticket_detours: Optional[np.ndarray] = None
+        self._steiner_costs = None
+
+    def static_distances(self) -> np.ndarray:
+        """All-pairs train distances with every route unclaimed, solved once."""
+        if self._static_distances is None:
+            from context.shortest_paths import INF, floyd_warshall
+            adjacency = self.adjacency.astype(np.int32)
+            cost = np.where(adjacency > 0, adjacency, INF)
+            np.fill_diagonal(cost, 0)
+            dist = floyd_warshall(cost)
+            dist.setflags(write=False)
+            self._static_distances = dist
+        return self._static_distances
+
+    def static_ticket_detours(self) -> np.ndarray:
+        """Tickets-by-routes detours with every route unclaimed, solved once (see :mod:`context.ticket_routes`)."""
+        if self._static_ticket_detours is None:
+            from context.ticket_routes import ticket_detours
+            detours = ticket_detours(self.static_distances(), self.route_length.astype(np.int32),
+                                     self.route_city1, self.route_city2,
+                                     np.array([self.city_ids[t.city1] for t in self.tickets]),
+                                     np.array([self.city_ids[t.city2] for t in self.tickets]))
+            detours.setflags(write=False)
+            self._static_ticket_detours = detours
+        return self._static_ticket_detours
+
+    def steiner_costs(self) -> 'SteinerCostCache':
+        """Ticket network costs memoized across every game on this board (see :mod:`context.ticket_offers`)."""
+        if self._steiner_costs is None:
+            from context.ticket_offers import SteinerCostCache
+            self._steiner_costs = SteinerCostCache()
+        return self._steiner_costs
+
+    def __repr__(self) -> str:
+        return f"BoardTemplate(cities={len(self.city_names)}, routes={len(self.routes)}, tickets={len(self.tickets)})"
+
+
+def load_board(map_path: 'Union[str, Path, None]' = None,
+               tickets_path: 'Union[str, Path, None]' = None) -> BoardTemplate:
+    """Return the shared board for the given files, parsing them only once.
+
+    Paths default to the bundled ``data`` folder; relative paths are resolved
+    against the working directory once, when the board is first loaded.
+    """
+    map_path = Path(map_path) if map_path is not None else DEFAULT_MAP_PATH
+    tickets_path = Path(tickets_path) if tickets_path is not None else DEFAULT_TICKETS_PATH
+    return _load_board(str(map_path.resolve()), str(tickets_path.resolve()))
+
+
+@lru_cache(maxsize=None)
+def _load_board(map_path: str, tickets_path: str) -> BoardTemplate:
+    """Cached constructor behind :func:`load_board`."""
+    return BoardTemplate(map_path, tickets_path)
@@ -0,0 +1,152 @@
+from typing import Dict, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from context.decks import TrainCardDeck
+from context.events import CLAIM, DRAW, MULLIGAN, RESHUFFLE, REVEAL, EventBus
+
+# order of the per-color vectors
+CARD_COLORS = TrainCardDeck.COLORS
+_CODES = TrainCardDeck.CODES
+
+
+def _vector(cards: Iterable[str]) -> np.ndarray:
+    """Per-color counts of ``cards``."""
+    return np.bincount([_CODES[c] for c in cards], minlength=len(CARD_COLORS)).astype(np.int64)
+
+
+def _counts(counter: Mapping[str, int]) -> np.ndarray:
+    """Per-color vector of a color-to-count mapping."""
+    return np.array([counter.get(c, 0) for c in CARD_COLORS], dtype=np.int64)
+
+
+class CardTracker:
+    """Engine-side record of where the train cards are, kept from engine events.
+
+    The tracker holds per-color count vectors (in :data:`CARD_COLORS` order)
+    for the market, the discard pile, each player's exposed cards (drawn
+    from the market) and each player's hidden cards. ``unseen`` counts every
+    card nobody can see: the face-down deck and all hidden hand cards. Each
+    :data:`REVEAL`, :data:`DRAW`, :data:`CLAIM`, :data:`MULLIGAN` and
+    :data:`RESHUFFLE` event updates a few vectors, so a player's view of the
+    cards (:meth:`view`) never rescans the deck, discard pile or hands.
+
+    The vectors are read from the deck and the ``players``' hands when the
+    tracker is built, so it can start at any point of a game; the game
+    creates it on first use (:meth:`GameContext.get_card_tracker`) to keep
+    the event bus idle when nobody reads the cards.
+    """
+
+    def __init__(self, deck: TrainCardDeck, events: EventBus, players: Sequence):
+        self.market = _vector(deck.get_face_up())
+        self.discard = _vector(deck.get_discard_pile())
+        self.exposed: Dict[str, np.ndarray] = {p.player_id: _counts(p.get_exposed()) for p in players}
+        self.hidden: Dict[str, np.ndarray] = {p.player_id: _counts(p.get_hand()) - self.exposed[p.player_id]
+                                              for p in players}
+        self.unseen = _vector(deck.get_draw_pile())
+        for hidden in self.hidden.values():
+            self.unseen += hidden
+        # bumped on every change so views can cache their answers
+        self.version = 0
+        events.subscribe(self, (REVEAL, DRAW, CLAIM, MULLIGAN, RESHUFFLE))
+
+    def __call__(self, event: str, data: Dict) -> None:
+        if event == REVEAL:
+            code = _CODES[data["card"]]
+            self.unseen[code] -= 1
+            self.market[code] += 1
+        elif event == DRAW:
+            # draws come one card at a time
+            pid = data["player_id"]
+            for card in data["cards"]:
+                code = _CODES[card]
+                if data["face_up"]:
+                    self.market[code] -= 1
+                    self.exposed[pid][code] += 1
+                else:
+                    # deck to hand: still unseen by everyone else
+                    self.hidden[pid][code] += 1
+        elif event == CLAIM:
+            pid = data["player_id"]
+            cards = _vector(data["cards"])
+            # spent from the exposed cards first, as Player._spend_cards does
+            from_exposed = np.minimum(cards, self.exposed[pid])
+            self.exposed[pid] -= from_exposed
+            self.hidden[pid] -= cards - from_exposed
+            self.unseen -= cards - from_exposed
+            self.discard += cards
+        elif event == MULLIGAN:
+            cards = _vector(data["discarded"])
+            self.market -= cards
+            self.discard += cards
+        elif event == RESHUFFLE:
+            # cards left in the deck are out of play
+            self.unseen += self.discard - _vector(data["dropped"])
+            self.discard[:] = 0
+        self.version += 1
+
+    def unseen_by(self, player_id: str) -> np.ndarray:
+        """Counts of the cards ``player_id`` cannot see: the deck and the opponents' hidden cards."""
+        return self.unseen - self.hidden[player_id]
+
+    def hidden_count(self, player_id: str) -> int:
+        """Number of cards in a player's hand that were drawn face down."""
+        return int(self.hidden[player_id].sum())
+
+    def view(self, player_id: str) -> 'CardView':
+        return CardView(self, player_id)
+
+
+class CardView:
+    """One player's probabilistic view of the cards they cannot see.
+
+    Every unseen card is taken to be equally likely to be anywhere unseen:
+    the next blind draw or any opponent's hidden card. Answers are cached
+    until the tracker changes. Vectors are read-only and ordered as
+    :data:`CARD_COLORS`.
+    """
+
+    def __init__(self, tracker: CardTracker, player_id: str):
+        self.tracker = tracker
+        self.player_id = player_id
+        self._version = -1
+        self._unseen = np.zeros(len(CARD_COLORS), dtype=np.int64)
+        self._probabilities = np.zeros(len(CARD_COLORS))
+
+    def _refresh(self) -> None:
+        if self._version == self.tracker.version:
+            return
+        self._version = self.tracker.version
+        self._unseen = self.tracker.unseen_by(self.player_id)
+        total = self._unseen.sum()
+        self._probabilities = self._unseen / total if total else np.zeros(len(CARD_COLORS))
+        self._unseen.setflags(write=False)
+        self._probabilities.setflags(write=False)
+
+    def unseen(self) -> np.ndarray:
+        """Per-color counts of the cards this player cannot see."""
+        self._refresh()
+        return self._unseen
+
+    def unseen_count(self) -> int:
+        """Number of cards this player cannot see."""
+        self._refresh()
+        return int(self._unseen.sum())
+
+    def draw_probabilities(self) -> np.ndarray:
+        """Chance of each color for the next face-down draw."""
+        self._refresh()
+        return self._probabilities
+
+    def draw_probability(self, color: str) -> float:
+        """Chance that the next face-down draw is ``color``."""
+        self._refresh()
+        return float(self._probabilities[_CODES[color]])
+
+    def expected_hidden_cards(self, player_id: str) -> np.ndarray:
+        """Expected per-color counts of another player's hidden cards."""
+        return self.tracker.hidden_count(player_id) * self.draw_probabilities()
+
+    def expected_hidden(self, player_id: str, color: str) -> float:
+        """Expected number of ``color`` cards among another player's hidden cards."""
+        return self.tracker.hidden_count(player_id) * self.draw_probability(color)
@@ -1,7 +1,13 @@
 import random
-import csv
 from collections import deque
-from typing import List, Union, Deque
+from typing import List, Optional, Union, Deque
+from context.board import BoardTemplate, load_board
+from context.events import EventBus, FAULT, MULLIGAN, RESHUFFLE, REVEAL
+
+def _count_non_locomotives(*piles: List[str]) -> int:
+    """Number of non-locomotive cards over the given piles."""
+    return sum(len(pile) - pile.count("L") for pile in piles)
+
 
 # ────────────────────────────────────────────────────────────────────────────────
 # TrainCardDeck – with 1-letter abbreviations
@@ -18,42 +24,86 @@ class TrainCardDeck:
         "P": 12,  # Purple
         "L": 14   # Locomotive (wild)
     }
+    # cards are stored as their index in COLORS
+    COLORS = tuple(COLOR_COUNTS)
+    CODES = {abbrev: code for code, abbrev in enumerate(COLORS)}
+    LOCOMOTIVE = CODES["L"]
+    MARKET_SIZE = 5
+    # bytes.translate tables between card codes and the letters' ASCII bytes
+    _DECODE = bytes.maketrans(bytes(range(len(COLORS))), "".join(COLORS).encode("ascii"))
+    _ENCODE = bytes.maketrans("".join(COLORS).encode("ascii"), bytes(range(len(COLORS))))
 
-    def __init__(self):
-        """Create and shuffle the deck used during the gameplay loop."""
-        self._deck: List[str] = []
-        self._discard_pile: List[str] = []
-        self._face_up: List[str] = []
+    def __init__(self, rng: Optional[random.Random] = None, events: Optional[EventBus] = None):
+        """Create and shuffle the deck used during the gameplay loop.
 
-        # Build deck using abbreviations
-        for abbrev, count in self.COLOR_COUNTS.items():
-            self._deck.extend([abbrev] * count)
+        ``rng`` is the stream used for every shuffle; pass a seeded one for
+        reproducible games. Market reveals, reshuffles, mulligans and refill
+        faults are published on ``events``.
 
-        random.shuffle(self._deck)
+        The deck and discard pile are byte arrays of card codes whose top is
+        the last card, so draws, discards and shuffles are done in place.
+        The market is a short list of letters with a running count of its
+        locomotives for the mulligan rule.
+        """
+        self._rng = rng if rng is not None else random.Random()
+        self.events = events if events is not None else EventBus()
+        # bumped on every change to the deck, market or discard pile
+        self.version = 0
+
+        # Build deck using card codes
+        self._deck = bytearray(code for code, count in enumerate(self.COLOR_COUNTS.values()) for _ in range(count))
+        self._discard_pile = bytearray()
+        self._face_up: List[str] = []
+        self._face_up_locomotives = 0
+
+        self._shuffle(self._deck)
         self._refill_face_up_slot()
 
         # Mulligan rule enforcement
         while self._too_many_locomotives():
             self._mulligan_face_up()
 
+    def copy(self) -> 'TrainCardDeck':
+        """Independent copy of the piles and the shuffle stream, without event listeners."""
+        deck = TrainCardDeck.__new__(TrainCardDeck)
+        deck.__dict__.update(self.__dict__)
+        deck._rng = random.Random()
+        deck._rng.setstate(self._rng.getstate())
+        deck.events = EventBus()
+        deck._deck = self._deck[:]
+        deck._discard_pile = self._discard_pile[:]
+        deck._face_up = self._face_up[:]
+        return deck
+
+    def _decode(self, pile: bytearray) -> List[str]:
+        return list(pile.translate(self._DECODE).decode("ascii"))
+
+    def _encode(self, cards: Union[str, List[str]]) -> bytes:
+        if not isinstance(cards, str):
+            cards = "".join(cards)
+        return cards.encode("ascii").translate(self._ENCODE)
+
     def get_face_up(self) -> List[str]:
         """Return a snapshot of the market cards available to players."""
         return self._face_up[:]
 
     def get_discard_pile(self) -> List[str]:
         """Return the current discard pile."""
-        return self._discard_pile[:]
+        return self._decode(self._discard_pile)
 
-    def __get_full_deck(self) -> List[str]:
-        """Internal helper to expose the deck for testing."""
-        return self._deck[:]
+    def get_draw_pile(self) -> List[str]:
+        """Return the face-down cards, bottom first (the last one is drawn next)."""
+        return self._decode(self._deck)
 
     def draw_face_up(self, idx: int) -> str:
         """Draw a visible card from the market."""
         card = self._face_up.pop(idx)
+        if card == "L":
+            self._face_up_locomotives -= 1
+        self.version += 1
         self._refill_face_up_slot()
-        if len(self.get_face_up()) < 5 and len(self._deck) >= 1:
-            print("unable to refill")
+        if len(self._face_up) < self.MARKET_SIZE and self._deck and self.events.active:
+            self.events.emit(FAULT, player_id=None, message="unable to refill")
         return card
 
     def draw_face_down(self) -> str:
@@ -62,41 +112,87 @@ class TrainCardDeck:
             self._reshuffle_discard()
         if not self._deck:
             raise ValueError("No train cards left to draw!")
-        return self._deck.pop()
+        self.version += 1
+        return self.COLORS[self._deck.pop()]
 
     def discard(self, cards: Union[str, List[str]]):
         """Place spent cards into the discard pile."""
-        if isinstance(cards, str):
-            self._discard_pile.append(cards)
-        else:
-            self._discard_pile.extend(cards)
+        self.version += 1
+        self._discard_pile += self._encode(cards)
 
     def _refill_face_up_slot(self):
         """Maintain five cards in the market, reshuffling as needed."""
-        while len(self.get_face_up()) < 5:
+        face_up = self._face_up
+        while len(face_up) < self.MARKET_SIZE:
             if not self._deck:
                 self._reshuffle_discard()
-            if self._deck:
-                self._face_up.append(self._deck.pop())
+            if not self._deck:
+                break  # every remaining card is in a hand
+            card = self.COLORS[self._deck.pop()]
+            face_up.append(card)
+            self.version += 1
+            if self.events.active:
+                self.events.emit(REVEAL, card=card)
+            if card == "L":
+                self._face_up_locomotives += 1
             if self._too_many_locomotives():
                 self._mulligan_face_up()
 
+    def _shuffle(self, pile: bytearray):
+        """Shuffle ``pile`` in place exactly as ``self._rng.shuffle`` would.
+
+        For a plain ``random.Random`` the Fisher-Yates loop of
+        ``Random.shuffle`` is inlined, drawing the same bits from the same
+        stream; other generators are asked to shuffle themselves.
+        """
+        if type(self._rng) is not random.Random:
+            self._rng.shuffle(pile)
+            return
+        getrandbits = self._rng.getrandbits
+        for i in range(len(pile) - 1, 0, -1):
+            n = i + 1
+            k = n.bit_length()
+            j = getrandbits(k)
+            while j >= n:
+                j = getrandbits(k)
+            pile[i], pile[j] = pile[j], pile[i]
+
     def _reshuffle_discard(self):
-        """Move the discard pile back into the deck and shuffle."""
+        """Replace the deck with the shuffled discard pile.
+
+        Cards still in the deck are dropped; the simulators in
+        ``simulation.py`` and ``batch_simulation.py`` do the same.
+        """
         if not self._discard_pile:
             return
-        self._deck = self._discard_pile[:]
-        random.shuffle(self._deck)
-        self._discard_pile.clear()
+        dropped = self._deck
+        self._deck = self._discard_pile
+        self._discard_pile = bytearray()
+        self._shuffle(self._deck)
+        self.version += 1
+        if self.events.active:
+            self.events.emit(RESHUFFLE, cards=len(self._deck), dropped=self._decode(dropped))
 
     def _too_many_locomotives(self) -> bool:
-        """Return ``True`` if the market violates the mulligan rule."""
-        return self._face_up.count("L") >= 3
+        """Return ``True`` if the market violates the mulligan rule.
+
+        The rule is waived when fewer than three non-locomotive cards are left
+        outside the players' hands, since no reshuffle could fix the market.
+        """
+        if self._face_up_locomotives < 3:
+            return False
+        loco = self.LOCOMOTIVE
+        loose = len(self._deck) - self._deck.count(loco) + len(self._discard_pile) - self._discard_pile.count(loco)
+        return loose + len(self._face_up) - self._face_up_locomotives >= 3
 
     def _mulligan_face_up(self):
         """Discard and refresh the market when too many locomotives appear."""
-        self._discard_pile.extend(self._face_up)
+        if self.events.active:
+            self.events.emit(MULLIGAN, discarded=self._face_up[:])
+        self._discard_pile += self._encode(self._face_up)
         self._face_up.clear()
+        self._face_up_locomotives = 0
+        self.version += 1
         self._refill_face_up_slot()
 
     def __len__(self):
@@ -121,11 +217,19 @@ class DestinationTicket:
 # TicketDeck – loads tickets from CSV and manages draws
 # ────────────────────────────────────────────────────────────────────────────────
 class TicketDeck:
-    def __init__(self, csv_path: str = "data/Destination_tickets.csv"):
-        """Load destination tickets and prepare the draw stack."""
-        self._master: List[DestinationTicket] = self._load_tickets_from_csv(csv_path)
+    def __init__(self, csv_path: Optional[str] = None, board: Optional[BoardTemplate] = None,
+                 rng: Optional[random.Random] = None):
+        """Create this game's destination tickets and prepare the draw stack.
+
+        Ticket definitions come from the shared ``board`` (parsed once per
+        process); ``csv_path`` selects a different tickets file for it. ``rng``
+        is the stream used for every shuffle.
+        """
+        board = board if board is not None else load_board(tickets_path=csv_path)
+        self._master: List[DestinationTicket] = [DestinationTicket(t.city1, t.city2, t.value) for t in board.tickets]
         self._stack: Deque[DestinationTicket] = deque(self._master)
-        self._rng = random.Random()
+        self._index = {id(t): i for i, t in enumerate(self._master)}
+        self._rng = rng if rng is not None else random.Random()
         self._shuffle_stack()
 
     def deal_unique(self, n: int) -> List[DestinationTicket]:
@@ -141,6 +245,10 @@ class TicketDeck:
         self._stack.extend(tickets)
         self._shuffle_stack()
 
+    def index_of(self, ticket: DestinationTicket) -> int:
+        """Position of one of this deck's tickets in ``board.tickets``."""
+        return self._index[id(ticket)]
+
     def _shuffle_stack(self):
         """Randomize the order of tickets remaining in the stack."""
         temp_list = list(self._stack)
@@ -150,16 +258,3 @@ class TicketDeck:
     def __len__(self):
         """Return the number of tickets remaining to be drawn."""
         return len(self._stack)
-
-    @staticmethod
-    def _load_tickets_from_csv(csv_path: str) -> List[DestinationTicket]:
-        """Read ticket definitions from disk."""
-        tickets = []
-        with open(csv_path, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                city1 = row["city1"]
-                city2 = row["city2"]
-                value = int(row["value"])
-                tickets.append(DestinationTicket(city1, city2, value))
-        return tickets
@@ -0,0 +1,274 @@
+import argparse
+import bisect
+import copy
+import json
+from typing import Dict, List, Optional
+
+from context.log_stream import iter_log_records
+
+# (web display name, card letter) in the order the display expects
+HAND_COLORS = [
+    ("black", "B"),
+    ("blue", "U"),
+    ("green", "G"),
+    ("locomotive", "L"),
+    ("orange", "O"),
+    ("purple", "P"),
+    ("red", "R"),
+    ("white", "W"),
+    ("yellow", "Y"),
+]
+
+# Snapshot layout (one per turn, before the turn is played):
+# {
+#   "current": player_id whose turn it is,
+#   "market": face-up cards,
+#   "players": {player_id: {
+#       "score": int, "trains": int,
+#       "routes": [route index, ...] in map order,
+#       "tickets": [[from, to, points, completed], ...],
+#       "hand": {card: count}, "exposed": {card: count}   (non-zero entries only)
+#   }}
+# }
+
+
+def _count_diff(new: Dict[str, int], old: Dict[str, int]) -> Dict[str, int]:
+    """Per-card difference between two sparse counts."""
+    diff = {}
+    for card in new.keys() | old.keys():
+        d = new.get(card, 0) - old.get(card, 0)
+        if d:
+            diff[card] = d
+    return diff
+
+
+def _apply_count_diff(counts: Dict[str, int], diff: Dict[str, int]) -> None:
+    """Apply a diff from :func:`_count_diff` in place."""
+    for card, d in diff.items():
+        n = counts.get(card, 0) + d
+        if n:
+            counts[card] = n
+        else:
+            counts.pop(card, None)
+
+
+def snapshot_delta(previous: Dict, current: Dict) -> Dict:
+    """Describe what changed between two consecutive snapshots."""
+    changes: Dict = {"current": current["current"]}
+    if current["market"] != previous["market"]:
+        changes["market"] = current["market"]
+
+    players = {}
+    for pid, now in current["players"].items():
+        before = previous["players"][pid]
+        d: Dict = {}
+        if now["score"] != before["score"]:
+            d["score"] = now["score"]
+        if now["trains"] != before["trains"]:
+            d["trains"] = now["trains"]
+        if len(now["routes"]) != len(before["routes"]):
+            owned = set(before["routes"])
+            d["routes"] = [r for r in now["routes"] if r not in owned]
+        if len(now["tickets"]) != len(before["tickets"]):
+            d["ticketsAdded"] = now["tickets"][len(before["tickets"]):]
+        completed = [i for i, t in enumerate(before["tickets"]) if t[3] != now["tickets"][i][3]]
+        if completed:
+            d["ticketsCompleted"] = completed
+        for key in ("hand", "exposed"):
+            diff = _count_diff(now[key], before[key])
+            if diff:
+                d[key] = diff
+        if d:
+            players[pid] = d
+    if players:
+        changes["players"] = players
+    return changes
+
+
+def apply_delta(snapshot: Dict, changes: Dict) -> None:
+    """Advance ``snapshot`` in place by one turn's changes."""
+    snapshot["current"] = changes["current"]
+    if "market" in changes:
+        snapshot["market"] = changes["market"]
+    for pid, d in changes.get("players", {}).items():
+        p = snapshot["players"][pid]
+        if "score" in d:
+            p["score"] = d["score"]
+        if "trains" in d:
+            p["trains"] = d["trains"]
+        if "routes" in d:
+            p["routes"] = sorted(p["routes"] + d["routes"])
+        for i in d.get("ticketsCompleted", []):
+            p["tickets"][i] = p["tickets"][i][:3] + [True]
+        if "ticketsAdded" in d:
+            p["tickets"] = p["tickets"] + d["ticketsAdded"]
+        for key in ("hand", "exposed"):
+            if key in d:
+                _apply_count_diff(p[key], d[key])
+
+
+def render_turn_state(snapshot: Dict, route_names: List[str]) -> Dict:
+    """Expand a snapshot into the turn record produced by ``GameLogger.add_turn``."""
+    current = snapshot["current"]
+    me = snapshot["players"][current]
+    return {
+        "player": {
+            "playerId": current,
+            "score": me["score"],
+            "remainingTrains": me["trains"],
+            "claimedRoutes": [route_names[r] for r in me["routes"]],
+            "destinationTickets": [
+                {"from": t[0], "to": t[1], "points": t[2], "completed": t[3]} for t in me["tickets"]
+            ],
+            "hand": {name: me["hand"].get(card, 0) for name, card in HAND_COLORS},
+        },
+        "opponents": [{
+            "playerId": pid,
+            "score": p["score"],
+            "remainingTrains": p["trains"],
+            "claimedRoutes": [route_names[r] for r in p["routes"]],
+            "destinationTicketCount": len(p["tickets"]),
+            "hand": {
+                "public": {name: p["exposed"].get(card, 0) for name, card in HAND_COLORS},
+                "hidden": sum(p["hand"].values()) - sum(p["exposed"].values()),
+            },
+        } for pid, p in snapshot["players"].items() if pid != current],
+        "gameObjects": {
+            "decks": {
+                "marketCards": snapshot["market"]
+            }
+        },
+    }
+
+
+class DeltaEncoder:
+    """Turns per-turn snapshots into ``keyframe`` and ``delta`` log records.
+
+    Each round starts with a keyframe and another is written every
+    ``keyframe_interval`` turns, so a reader never has to apply more than
+    ``keyframe_interval - 1`` deltas to reach any turn.
+    """
+
+    def __init__(self, keyframe_interval: int = 25):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.keyframe_interval = keyframe_interval
+        self._previous: Optional[Dict] = None
+        self._route_names: Optional[List[str]] = None
+
+    def begin_round(self) -> None:
+        """Forget the previous snapshot so the next turn becomes a keyframe."""
+        self._previous = None
+
+    def encode(self, round_number: int, turn: int, snapshot: Dict, route_names: List[str]) -> List[Dict]:
+        """Return the records to write for one turn."""
+        records = []
+        if route_names != self._route_names:
+            self._route_names = route_names
+            records.append({"type": "routes", "names": route_names})
+        if self._previous is None or turn % self.keyframe_interval == 0:
+            records.append({"type": "keyframe", "round": round_number, "turn": turn, "state": snapshot})
+        else:
+            records.append({"type": "delta", "round": round_number, "turn": turn,
+                            "changes": snapshot_delta(self._previous, snapshot)})
+        self._previous = snapshot
+        return records
+
+
+class _RoundRecords:
+    """Keyframes and deltas of one round, as loaded by :class:`DeltaLogReader`."""
+
+    def __init__(self, route_names: List[str]):
+        self.route_names = route_names
+        self.seed: Optional[int] = None
+        self.keyframe_turns: List[int] = []
+        self.keyframes: Dict[int, Dict] = {}
+        self.deltas: Dict[int, Dict] = {}
+        self.turn_count = 0
+
+
+class DeltaLogReader:
+    """Reconstructs full turn states from a delta-encoded streamed log."""
+
+    def __init__(self, path: str):
+        self.players: List[Dict] = []
+        self.average_scores: List[Dict] = []
+        self.keyframe_interval = 0
+        self._rounds: Dict[int, _RoundRecords] = {}
+        route_names: List[str] = []
+
+        for record in iter_log_records(path):
+            kind = record["type"]
+            if kind == "header":
+                self.players = record["players"]
+                self.keyframe_interval = record.get("keyframeInterval", 0)
+            elif kind == "routes":
+                route_names = record["names"]
+            elif kind == "round":
+                self._rounds[record["round"]] = _RoundRecords(route_names)
+                self._rounds[record["round"]].seed = record.get("seed")
+            elif kind in ("keyframe", "delta"):
+                rnd = self._rounds[record["round"]]
+                rnd.route_names = route_names
+                if kind == "keyframe":
+                    rnd.keyframe_turns.append(record["turn"])
+                    rnd.keyframes[record["turn"]] = record["state"]
+                else:
+                    rnd.deltas[record["turn"]] = record["changes"]
+                rnd.turn_count = max(rnd.turn_count, record["turn"] + 1)
+            elif kind == "summary":
+                self.average_scores = record["averageScores"]
+
+    def round_numbers(self) -> List[int]:
+        """Round numbers present in the log."""
+        return sorted(self._rounds)
+
+    def turn_count(self, round_number: int) -> int:
+        """Number of turns recorded for a round."""
+        return self._rounds[round_number].turn_count
+
+    def state_at(self, round_number: int, turn: int) -> Dict:
+        """Snapshot at the start of ``turn``, rebuilt from the nearest keyframe."""
+        rnd = self._rounds[round_number]
+        if not 0 <= turn < rnd.turn_count:
+            raise IndexError(f"round {round_number} has no turn {turn}")
+        i = bisect.bisect_right(rnd.keyframe_turns, turn) - 1
+        start = rnd.keyframe_turns[i]
+        snapshot = copy.deepcopy(rnd.keyframes[start])
+        for t in range(start + 1, turn + 1):
+            apply_delta(snapshot, rnd.deltas[t])
+        return snapshot
+
+    def turn_state(self, round_number: int, turn: int) -> Dict:
+        """Turn record at ``turn`` in the same format as ``GameLogger.add_turn``."""
+        return render_turn_state(self.state_at(round_number, turn), self._rounds[round_number].route_names)
+
+    def to_nested(self) -> Dict:
+        """Rebuild the nested log read by ``index.html``."""
+        rounds = []
+        for n in self.round_numbers():
+            rnd = self._rounds[n]
+            turns = []
+            snapshot: Dict = {}
+            for t in range(rnd.turn_count):
+                if t in rnd.keyframes:
+                    snapshot = copy.deepcopy(rnd.keyframes[t])
+                else:
+                    apply_delta(snapshot, rnd.deltas[t])
+                turns.append(render_turn_state(snapshot, rnd.route_names))
+            rounds.append({"seed": rnd.seed, "turns": turns})
+        return {"rounds": rounds, "players": self.players, "averageScores": self.average_scores}
+
+
+def main():
+    """Command line converter from delta logs to the web display format."""
+    parser = argparse.ArgumentParser(description="Expand a delta-encoded game log to nested JSON.")
+    parser.add_argument("src", help="delta log (.jsonl or .jsonl.gz)")
+    parser.add_argument("dst", help="output .json file")
+    args = parser.parse_args()
+    with open(args.dst, "w") as f:
+        json.dump(DeltaLogReader(args.src).to_nested(), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# event names; every event carries a dictionary of keyword data
+TURN_START = "turn_start"      # turn, player_id
+TURN_END = "turn_end"          # turn, player_id
+DRAW = "draw"                  # player_id, cards, face_up
+CLAIM = "claim"                # player_id, route, cards
+TICKET_OFFER = "ticket_offer"  # player_id, offer, kept
+REVEAL = "reveal"              # card (turned face up from the deck into the market)
+RESHUFFLE = "reshuffle"        # cards (number shuffled back into the deck), dropped (cards left in the deck, now out of play)
+MULLIGAN = "mulligan"          # discarded (the market cards that were replaced)
+FAULT = "fault"                # player_id (None for engine faults), message
+GAME_OVER = "game_over"        # turn, scores
+
+ALL_EVENTS = (TURN_START, TURN_END, DRAW, CLAIM, TICKET_OFFER, REVEAL, RESHUFFLE, MULLIGAN, FAULT, GAME_OVER)
+
+Listener = Callable[[str, Dict[str, Any]], None]
+
+
+class EventBus:
+    """Publish/subscribe hub for structured engine events.
+
+    Listeners are called as ``listener(event, data)``. Emitters check
+    :attr:`active` before building an event, so a bus nobody listens to
+    costs a single attribute read per emission point.
+    """
+
+    def __init__(self):
+        self._listeners: Dict[str, List[Listener]] = {}
+        # True while at least one listener is registered
+        self.active = False
+
+    def subscribe(self, listener: Listener, events: Optional[Iterable[str]] = None) -> None:
+        """Call ``listener`` for the given events, or for every event if omitted."""
+        for event in (ALL_EVENTS if events is None else events):
+            if event not in ALL_EVENTS:
+                raise ValueError(f"Unknown event '{event}'")
+            self._listeners.setdefault(event, []).append(listener)
+        self.active = bool(self._listeners)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        """Stop calling ``listener`` for any event."""
+        for event in list(self._listeners):
+            remaining = [l for l in self._listeners[event] if l != listener]
+            if remaining:
+                self._listeners[event] = remaining
+            else:
+                del self._listeners[event]
+        self.active = bool(self._listeners)
+
+    def listening(self, event: str) -> bool:
+        """Whether any listener is registered for ``event``."""
+        return event in self._listeners
+
+    def emit(self, event: str, **data: Any) -> None:
+        """Deliver an event to its listeners in subscription order."""
+        listeners = self._listeners.get(event)
+        if listeners:
+            for listener in tuple(listeners):
+                listener(event, data)
+
+
+class ConsoleReporter:
+    """Prints progress and faults the way the engine used to report them."""
+
+    def __init__(self, progress_every: int = 15):
+        self.progress_every = progress_every
+
+    def attach(self, bus: EventBus) -> 'ConsoleReporter':
+        bus.subscribe(self, (TURN_START, FAULT))
+        return self
+
+    def __call__(self, event: str, data: Dict[str, Any]) -> None:
+        if event == TURN_START:
+            if self.progress_every and not data["turn"] % self.progress_every:
+                print("Turn", data["turn"], "reached")
+        elif event == FAULT:
+            print(data["message"])
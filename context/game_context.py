@@ -1,27 +1,51 @@
 from context.Map import MapGraph
+from context.board import BoardTemplate, load_board
+from context.card_tracker import CardTracker
 from context.decks import TrainCardDeck, TicketDeck
+from context.events import EventBus
+from context.rng import RngRegistry
+from context.scoring import ScoreKeeper
 
 from collections import Counter
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 
 class GameContext:
-    def __init__(self, player_ids):
-        """Holds shared state used throughout the gameplay loop."""
-        print("Initializing GameContext...")
-        self.map_graph = MapGraph()
-        self.train_deck = TrainCardDeck()
-        self.ticket_deck = TicketDeck()
+    def __init__(self, player_ids, map_path: Optional[str] = None, tickets_path: Optional[str] = None,
+                 seed: Optional[int] = None):
+        """Holds shared state used throughout the gameplay loop.
+
+        ``map_path`` and ``tickets_path`` default to the bundled data files;
+        the parsed board is cached and shared by every game in the process.
+        ``seed`` is the master seed of the game's random streams (train deck,
+        ticket deck and one per bot); a random one is drawn if omitted and kept
+        in ``self.rng.master_seed``. Engine events are published on
+        ``self.events``.
+        """
+        self.events = EventBus()
+        self.rng = RngRegistry(seed)
+        self.board: BoardTemplate = load_board(map_path, tickets_path)
+        self.map_graph = MapGraph(self.board)
+        self.train_deck = TrainCardDeck(self.rng.train_deck(), self.events)
+        self.ticket_deck = TicketDeck(board=self.board, rng=self.rng.ticket_deck())
         self.turn_num = 0
         # initialize score dictionary for all players
         # each player starts with a score of 0
         self.scores = {p: 0 for p in player_ids}
+        # bumped whenever a score changes so cached views can tell they are stale
+        self.scores_version = 0
+        # running score components, updated as routes are claimed and tickets kept
+        self.score_keeper = ScoreKeeper(self.map_graph, player_ids)
+        # per-color counts of unseen cards, created on first use
+        self._card_tracker: Optional[CardTracker] = None
 
 
     def set_score(self, player_id, score):
         """Update a player's score in the context."""
-        self.scores[player_id] = score
+        if self.scores.get(player_id) != score:
+            self.scores[player_id] = score
+            self.scores_version += 1
 
     def get_score(self, player_id: str):
         """Retrieve the current score for the given player."""
@@ -39,6 +63,12 @@ class GameContext:
         """Return the deck of destination tickets."""
         return self.ticket_deck
 
+    def get_card_tracker(self, players: List) -> CardTracker:
+        """Return the unseen-card tracker, starting it from ``players``' hands on first use."""
+        if self._card_tracker is None:
+            self._card_tracker = CardTracker(self.train_deck, self.events, players)
+        return self._card_tracker
+
 
 
 
@@ -0,0 +1,156 @@
+import asyncio
+import inspect
+from time import perf_counter_ns
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# upper bounds of the latency histogram buckets, in nanoseconds (10µs ... 10s);
+# a last bucket counts everything slower
+BUCKET_BOUNDS_NS = (10_000, 100_000, 1_000_000, 10_000_000, 100_000_000, 1_000_000_000, 10_000_000_000)
+
+# decision used instead of the bot's when it runs over budget; always legal
+FALLBACKS: Dict[str, Callable[..., Any]] = {
+    "choose_turn_action": lambda: 1,                        # draw cards
+    "choose_draw_train_action": lambda: -1,                 # face-down card
+    "choose_route_to_claim": lambda routes: routes[0],      # first affordable route
+    "choose_color_to_spend": lambda route, options: options[0],
+    "select_ticket_offer": lambda offer: offer[:1],         # keep one ticket
+}
+
+
+class TimeBudget(NamedTuple):
+    """Thinking time a bot may use, in seconds; ``None`` means unlimited."""
+    per_decision: Optional[float] = 2.0
+    per_game: Optional[float] = None
+
+
+class MethodStats:
+    """Latency record of one interface method."""
+    __slots__ = ("count", "total_ns", "max_ns", "histogram", "overruns", "skipped")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram: List[int] = [0] * (len(BUCKET_BOUNDS_NS) + 1)
+        # calls whose answer was replaced by the fallback after running over budget
+        self.overruns = 0
+        # calls answered by the fallback without asking the bot (game budget spent)
+        self.skipped = 0
+
+    def record(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.histogram[bisect_left(BUCKET_BOUNDS_NS, elapsed_ns)] += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "totalNs": self.total_ns,
+            "maxNs": self.max_ns,
+            "meanNs": self.total_ns // self.count if self.count else 0,
+            "histogram": self.histogram[:],
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+        }
+
+
+class DecisionProfiler:
+    """Times every interface call of one player and enforces its time budget.
+
+    A call is timed with :func:`time.perf_counter_ns`. Bots run in-process
+    and cannot be interrupted, so a decision that takes longer than
+    ``budget.per_decision`` is discarded after the fact and replaced by the
+    method's :data:`FALLBACKS` entry. Once the player's total thinking time
+    for the game exceeds ``budget.per_game`` the bot is no longer asked and
+    every decision falls back.
+    """
+
+    def __init__(self, budget: Optional[TimeBudget] = None):
+        self.budget = budget if budget is not None else TimeBudget()
+        self._decision_ns = None if self.budget.per_decision is None else int(self.budget.per_decision * 1e9)
+        self._game_ns = None if self.budget.per_game is None else int(self.budget.per_game * 1e9)
+        self.stats: Dict[str, MethodStats] = {}
+        # thinking time used so far this game
+        self.elapsed_ns = 0
+
+    def call(self, interface: Any, method: str, *args: Any) -> Any:
+        """Ask ``interface`` for a decision, falling back if over budget."""
+        stats = self._method_stats(method)
+        if self._game_ns is not None and self.elapsed_ns > self._game_ns:
+            stats.skipped += 1
+            return FALLBACKS[method](*args)
+        start = perf_counter_ns()
+        result = getattr(interface, method)(*args)
+        return self._settle(stats, perf_counter_ns() - start, False, method, args, result)
+
+    async def call_async(self, interface: Any, method: str, *args: Any) -> Any:
+        """Like :meth:`call`, awaiting the answer if the method returns an awaitable.
+
+        An awaited answer is abandoned (and the fallback used) as soon as
+        the decision or game budget runs out, so a slow remote bot only
+        costs its own game time.
+        """
+        stats = self._method_stats(method)
+        if self._game_ns is not None and self.elapsed_ns > self._game_ns:
+            stats.skipped += 1
+            return FALLBACKS[method](*args)
+        start = perf_counter_ns()
+        result = getattr(interface, method)(*args)
+        timed_out = False
+        if inspect.isawaitable(result):
+            limits = [ns for ns in (self._decision_ns, None if self._game_ns is None else self._game_ns - self.elapsed_ns)
+                      if ns is not None]
+            try:
+                result = await asyncio.wait_for(result, min(limits) / 1e9 if limits else None)
+            except asyncio.TimeoutError:
+                timed_out = True
+        return self._settle(stats, perf_counter_ns() - start, timed_out, method, args, result)
+
+    def _method_stats(self, method: str) -> MethodStats:
+        stats = self.stats.get(method)
+        if stats is None:
+            stats = self.stats[method] = MethodStats()
+        return stats
+
+    def _settle(self, stats: MethodStats, elapsed: int, timed_out: bool, method: str, args: tuple, result: Any) -> Any:
+        """Record a timed call and return its result, or the fallback if it ran over budget."""
+        stats.record(elapsed)
+        self.elapsed_ns += elapsed
+        if timed_out or (self._decision_ns is not None and elapsed > self._decision_ns) or \
+                (self._game_ns is not None and self.elapsed_ns > self._game_ns):
+            stats.overruns += 1
+            return FALLBACKS[method](*args)
+        return result
+
+    def summary(self) -> Dict:
+        """JSON-ready latency record, mergeable with :func:`merge_summaries`."""
+        return {
+            "bucketBoundsNs": list(BUCKET_BOUNDS_NS),
+            "totalNs": self.elapsed_ns,
+            "games": 1,
+            "methods": {m: s.to_dict() for m, s in self.stats.items()},
+        }
+
+
+def merge_summaries(summaries: List[Dict]) -> Dict:
+    """Combine the :meth:`DecisionProfiler.summary` records of several games."""
+    merged: Dict = {"bucketBoundsNs": list(BUCKET_BOUNDS_NS), "totalNs": 0, "games": 0, "methods": {}}
+    for summary in summaries:
+        merged["totalNs"] += summary["totalNs"]
+        merged["games"] += summary["games"]
+        for method, s in summary["methods"].items():
+            m = merged["methods"].get(method)
+            if m is None:
+                merged["methods"][method] = dict(s, histogram=s["histogram"][:])
+                continue
+            m["count"] += s["count"]
+            m["totalNs"] += s["totalNs"]
+            m["maxNs"] = max(m["maxNs"], s["maxNs"])
+            m["histogram"] = [a + b for a, b in zip(m["histogram"], s["histogram"])]
+            m["overruns"] += s["overruns"]
+            m["skipped"] += s["skipped"]
+            m["meanNs"] = m["totalNs"] // m["count"] if m["count"] else 0
+    return merged
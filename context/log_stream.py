@@ -0,0 +1,106 @@
+import argparse
+import gzip
+import json
+from typing import IO, Dict, Iterable, Iterator, Optional
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def is_gzip(path: str) -> bool:
+    """Whether the file at ``path`` is gzip-compressed, judged by its first bytes."""
+    with open(path, "rb") as f:
+        return f.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+
+def _open_text(path: str, mode: str, compress: bool = False) -> IO[str]:
+    """Open a log file as text, through gzip when needed.
+
+    Files are written compressed for ``.gz`` paths or ``compress``, and read
+    compressed if they start with the gzip magic bytes, whatever their name.
+    """
+    compressed = is_gzip(path) if mode == "r" else compress or path.endswith(".gz")
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class JsonlLogWriter:
+    """Appends game log records to disk as newline-delimited JSON.
+
+    Records are small dicts tagged with a ``type``: one ``header`` with the
+    player list, a ``round`` marker before each round's ``turn`` records, and a
+    closing ``summary`` with the match averages.
+    """
+
+    def __init__(self, path: str, compress: bool = False):
+        self.path = path
+        self._file: Optional[IO[str]] = _open_text(path, "w", compress)
+
+    def write(self, record: Dict) -> None:
+        """Serialize one record as a single line."""
+        if self._file is None:
+            raise ValueError(f"log stream {self.path} is already closed")
+        self._file.write(json.dumps(record, separators=(",", ":")))
+        self._file.write("\n")
+
+    def close(self) -> None:
+        """Flush and close the underlying file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def iter_log_records(path: str) -> Iterator[Dict]:
+    """Yield the records of a streamed log one at a time."""
+    with _open_text(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_jsonl_log(path: str, rounds: Optional[Iterable[int]] = None) -> Dict:
+    """Rebuild the nested :class:`GameLogger` log from a streamed log.
+
+    ``rounds`` optionally limits the result to the given round numbers, which
+    keeps conversions of large batches small enough for the web display.
+    """
+    wanted = None if rounds is None else set(rounds)
+    log: Dict = {"rounds": [], "players": [], "averageScores": []}
+    round_index: Dict[int, Dict] = {}
+    for record in iter_log_records(path):
+        kind = record["type"]
+        if kind == "header":
+            log["players"] = record["players"]
+            log["averageScores"] = [{"playerId": p["playerId"], "scores": []} for p in record["players"]]
+        elif kind == "round":
+            if wanted is None or record["round"] in wanted:
+                round_index[record["round"]] = {"seed": record.get("seed"), "turns": []}
+                log["rounds"].append(round_index[record["round"]])
+        elif kind == "turn":
+            if record["round"] in round_index:
+                round_index[record["round"]]["turns"].append(record["state"])
+        elif kind == "summary":
+            log["averageScores"] = record["averageScores"]
+    return log
+
+
+def convert_log(src: str, dst: str, rounds: Optional[Iterable[int]] = None) -> None:
+    """Write a streamed log out in the nested format read by ``index.html``."""
+    log = load_jsonl_log(src, rounds)
+    with open(dst, "w") as f:
+        json.dump(log, f, indent=2)
+
+
+def main():
+    """Command line converter from streamed logs to the web display format."""
+    parser = argparse.ArgumentParser(description="Convert a streamed JSONL game log to nested JSON.")
+    parser.add_argument("src", help="streamed log (.jsonl or .jsonl.gz)")
+    parser.add_argument("dst", help="output .json file")
+    parser.add_argument("--rounds", type=int, nargs="*", default=None, help="only convert these rounds")
+    args = parser.parse_args()
+    convert_log(args.src, args.dst, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+from typing import Dict, List, Optional, Sequence, Set, TYPE_CHECKING
+if TYPE_CHECKING:
+    from context.Map import Route
+
+
+class _Component:
+    """A connected group of one player's routes and its cached longest trail."""
+    __slots__ = ("cities", "routes", "total_length", "longest", "dirty")
+
+    def __init__(self):
+        self.cities: Set[str] = set()
+        self.routes: 'List[Route]' = []
+        self.total_length = 0
+        self.longest = 0
+        self.dirty = False
+
+
+class LongestTrailEngine:
+    """Tracks the longest continuous trail of every player's network.
+
+    Each claim is added to the owner's adjacency and merges the components of
+    its two endpoints; only the merged component is marked dirty, so the
+    exhaustive trail search only reruns on the part of the network that
+    changed. Inside a component routes are numbered so the search can track
+    visited routes in a single integer bitmask.
+    """
+
+    def __init__(self):
+        # player_id -> city -> component containing that city
+        self._component_of: Dict[str, Dict[str, _Component]] = {}
+
+    def add_route(self, player_id: str, route: 'Route') -> None:
+        """Record that ``player_id`` now owns ``route``."""
+        lookup = self._component_of.setdefault(player_id, {})
+        a = lookup.get(route.city1)
+        b = lookup.get(route.city2)
+
+        if a is None and b is None:
+            component = _Component()
+        elif a is None or b is None or a is b:
+            component = a if a is not None else b
+        else:
+            # merge the smaller component into the larger one
+            component, other = (a, b) if len(a.routes) >= len(b.routes) else (b, a)
+            component.cities |= other.cities
+            component.routes.extend(other.routes)
+            component.total_length += other.total_length
+            for city in other.cities:
+                lookup[city] = component
+
+        component.cities.update((route.city1, route.city2))
+        component.routes.append(route)
+        component.total_length += route.length
+        component.dirty = True
+        lookup[route.city1] = component
+        lookup[route.city2] = component
+
+    def longest(self, player_id: str) -> int:
+        """Return the player's longest trail over all of their components."""
+        return max((self._length(c) for c in self._components(player_id)), default=0)
+
+    def longest_through(self, player_id: str, cities: Set[str]) -> int:
+        """Return the longest trail among the components touching ``cities``."""
+        lookup = self._component_of.get(player_id, {})
+        touched = {id(lookup[c]): lookup[c] for c in cities if c in lookup}
+        return max((self._length(c) for c in touched.values()), default=0)
+
+    def components(self, player_id: str) -> 'List[tuple[set[str], int]]':
+        """Return ``(cities, longest trail)`` for each of the player's components."""
+        return [(set(c.cities), self._length(c)) for c in self._components(player_id)]
+
+    def _components(self, player_id: str) -> List[_Component]:
+        """Distinct components owned by the player."""
+        lookup = self._component_of.get(player_id, {})
+        return list({id(c): c for c in lookup.values()}.values())
+
+    def _length(self, component: _Component) -> int:
+        """Cached longest trail of a component, recomputed if dirty."""
+        if component.dirty:
+            component.longest = self._longest_trail(component)
+            component.dirty = False
+        return component.longest
+
+    @staticmethod
+    def _longest_trail(component: _Component) -> int:
+        """Exhaustive search for the longest trail (no route used twice)."""
+        return longest_trail(component.routes, component.total_length)
+
+
+def longest_trail(routes: 'Sequence[Route]', total_length: Optional[int] = None) -> int:
+    """Length of the longest trail (no route used twice) through ``routes``.
+
+    ``routes`` only need ``city1``, ``city2`` and ``length``; they are
+    expected to form one connected component.
+    """
+    adj: 'Dict[str, List[tuple[int, str, int]]]' = {}
+    for i, r in enumerate(routes):
+        bit = 1 << i
+        adj.setdefault(r.city1, []).append((bit, r.city2, r.length))
+        adj.setdefault(r.city2, []).append((bit, r.city1, r.length))
+
+    upper_bound = total_length if total_length is not None else sum(r.length for r in routes)
+    best = 0
+
+    def walk(city: str, used: int, length: int) -> None:
+        nonlocal best
+        if length > best:
+            best = length
+        for bit, nxt, route_length in adj[city]:
+            if best == upper_bound:
+                return
+            if not used & bit:
+                walk(nxt, used | bit, length + route_length)
+
+    # a longest trail that is not closed must start at an odd-degree city
+    # (otherwise it could be extended backwards); if every degree is even
+    # the component is Eulerian and any start reaches upper_bound
+    starts = [city for city, edges in adj.items() if len(edges) % 2] or list(adj)[:1]
+    for city in starts:
+        if best == upper_bound:
+            break
+        walk(city, 0, 0)
+    return best
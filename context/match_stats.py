@@ -0,0 +1,134 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# final-score percentiles reported by ScoreTable.stats
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class ScoreTable:
+    """Columnar record of every player's score at the start of each logged turn.
+
+    Rows are turns in logging order and columns players, with the round and
+    the turn index of each row kept alongside, so a match of thousands of
+    rounds is a few flat arrays. Match statistics come out of vectorized
+    reductions over them and are cached until more turns are added.
+    """
+
+    def __init__(self, player_ids: Sequence[str], capacity: int = 1024):
+        self.player_ids = list(player_ids)
+        self._column = {pid: i for i, pid in enumerate(self.player_ids)}
+        self._scores = np.zeros((capacity, len(self.player_ids)), dtype=np.int32)
+        self._round = np.zeros(capacity, dtype=np.int32)
+        self._turn = np.zeros(capacity, dtype=np.int32)
+        self._rows = 0
+        self._next_turn = 0
+        # final scores per round; None until end_round, then the last logged turn is used
+        self._finals: List[Optional[np.ndarray]] = []
+        self._stats: Optional[Dict] = None
+
+    @property
+    def round_count(self) -> int:
+        return len(self._finals)
+
+    def _grow(self, rows: int) -> None:
+        capacity = len(self._round)
+        if self._rows + rows <= capacity:
+            return
+        capacity = max(2 * capacity, self._rows + rows)
+        self._scores = np.resize(self._scores, (capacity, len(self.player_ids)))
+        self._round = np.resize(self._round, capacity)
+        self._turn = np.resize(self._turn, capacity)
+
+    def begin_round(self) -> None:
+        self._finals.append(None)
+        self._next_turn = 0
+        self._stats = None
+
+    def add_turn(self, scores: Dict[str, int]) -> None:
+        """Record the scores at the start of the next turn of the current round."""
+        self._grow(1)
+        row = self._scores[self._rows]
+        for pid, score in scores.items():
+            row[self._column[pid]] = score
+        self._round[self._rows] = len(self._finals) - 1
+        self._turn[self._rows] = self._next_turn
+        self._rows += 1
+        self._next_turn += 1
+        self._stats = None
+
+    def add_round(self, trace: Sequence[Sequence[int]], final_scores: Optional[Dict[str, int]] = None) -> None:
+        """Record a whole round at once; ``trace`` has one row of scores per turn, in column order."""
+        self.begin_round()
+        n = len(trace)
+        if n:
+            self._grow(n)
+            self._scores[self._rows:self._rows + n] = trace
+            self._round[self._rows:self._rows + n] = len(self._finals) - 1
+            self._turn[self._rows:self._rows + n] = np.arange(n)
+            self._rows += n
+        if final_scores is not None:
+            self.end_round(final_scores)
+
+    def end_round(self, final_scores: Dict[str, int]) -> None:
+        """Record the final scores of the current round."""
+        finals = np.zeros(len(self.player_ids), dtype=np.int32)
+        for pid, score in final_scores.items():
+            finals[self._column[pid]] = score
+        self._finals[-1] = finals
+        self._stats = None
+
+    def round_scores(self, round_number: int) -> np.ndarray:
+        """Turns x players scores of one round."""
+        rows = self._round[:self._rows] == round_number
+        return self._scores[:self._rows][rows]
+
+    def final_scores(self) -> np.ndarray:
+        """Rounds x players final scores (the last logged turn for unfinished rounds)."""
+        finals = np.zeros((self.round_count, len(self.player_ids)), dtype=np.int32)
+        if self._rows:
+            rounds = self._round[:self._rows]
+            # last row of each round: where the next row starts another round
+            last = np.flatnonzero(np.append(rounds[1:] != rounds[:-1], True))
+            finals[rounds[last]] = self._scores[last]
+        for r, f in enumerate(self._finals):
+            if f is not None:
+                finals[r] = f
+        return finals
+
+    def average_curves(self) -> np.ndarray:
+        """Average score per turn index over the rounds that reached it (turns x players)."""
+        turns = self._turn[:self._rows]
+        counts = np.bincount(turns)
+        if not len(counts):
+            return np.zeros((0, len(self.player_ids)))
+        sums = np.stack([np.bincount(turns, weights=self._scores[:self._rows, j], minlength=len(counts))
+                         for j in range(len(self.player_ids))], axis=1)
+        return sums / counts[:, None]
+
+    def stats(self) -> Dict:
+        """Per-player match statistics; cached until the table changes."""
+        if self._stats is not None:
+            return self._stats
+        curves = np.rint(self.average_curves()).astype(np.int64)
+        finals = self.final_scores()
+        best = finals.max(axis=1, keepdims=True) if len(finals) else finals
+        on_top = finals == best
+        sole = on_top & (on_top.sum(axis=1, keepdims=True) == 1)
+        rounds = max(len(finals), 1)
+        if len(finals):
+            percentiles = np.percentile(finals, PERCENTILES, axis=0)
+        else:
+            percentiles = np.zeros((len(PERCENTILES), len(self.player_ids)))
+        self._stats = {
+            "rounds": len(finals),
+            "players": [{
+                "playerId": pid,
+                "averageScores": curves[:, j].tolist(),
+                "meanFinalScore": round(float(finals[:, j].mean()), 2) if len(finals) else 0,
+                "finalScorePercentiles": {str(p): float(v) for p, v in zip(PERCENTILES, percentiles[:, j])},
+                "winRate": round(float(sole[:, j].sum()) / rounds, 4),
+                "tieRate": round(float((on_top & ~sole)[:, j].sum()) / rounds, 4),
+            } for j, pid in enumerate(self.player_ids)],
+        }
+        return self._stats
@@ -1,6 +1,7 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from collections import Counter
+from context.card_tracker import CardView
 from context.game_context import GameContext
 from context.Map import MapGraph, Route
 from context.decks import TicketDeck, TrainCardDeck, DestinationTicket
@@ -8,7 +9,20 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from player import Player
 
-@dataclass
+
+class FrozenCounter(Counter):
+    """Read-only copy of a Counter handed to bots."""
+
+    def __init__(self, counts=()):
+        dict.__init__(self, counts)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__name__} is read-only")
+
+    __setitem__ = __delitem__ = update = subtract = clear = pop = popitem = setdefault = _read_only
+
+
+@dataclass(frozen=True)
 class OpponentInfo:
     player_id: str
     exposed_hand: 'Counter[str]'
@@ -17,29 +31,81 @@ class OpponentInfo:
     score: int
     destination_ticket_count: int
 
+
 class PlayerContext:
     def __init__(self, player_id: str, context: GameContext, players: List):
-        """Snapshot of public information passed to a :class:`Player`."""
-        player = next((player for player in players if player.player_id == player_id), None)
+        """Read-only view of the public information passed to a :class:`Player`.
+
+        One context is kept per player for the whole game. Fields are computed
+        on first access and cached until the state behind them changes (the
+        deck, the players and the score table each carry a version counter),
+        so reading a field is cheap and always reflects the current game.
+        Returned values are immutable: tuples, frozen dataclasses and
+        :class:`FrozenCounter` copies.
+        """
         self.player_id: str = player_id
         self.map: MapGraph = context.get_map()
         self.train_deck: TrainCardDeck = context.get_train_deck()
         self.ticket_deck: TicketDeck = context.get_ticket_deck()
-        self.face_up_cards: List[str] = context.get_train_deck().get_face_up()
-        self.turn_number: int = context.turn_num
-        self.score: int = context.get_score(player_id)
+        self._context = context
+        self._players = players
+        self._opponent_players = [p for p in players if p.player_id != player_id]
+
+        self._face_up: Tuple[str, ...] = ()
+        self._face_up_version = -1
+        # opponent id -> (player version, score, cached info)
+        self._opponent_cache: 'Dict[str, tuple[int, int, OpponentInfo]]' = {}
+        self._opponents: Tuple[OpponentInfo, ...] = ()
+        self._opponents_key: Optional[tuple] = None
+        self._cards: Optional[CardView] = None
+
+    @property
+    def face_up_cards(self) -> Tuple[str, ...]:
+        """Market cards currently available to draw."""
+        if self._face_up_version != self.train_deck.version:
+            self._face_up = tuple(self.train_deck.get_face_up())
+            self._face_up_version = self.train_deck.version
+        return self._face_up
 
-        self.opponents = [
-            OpponentInfo(
-                player_id = p.player_id,
-                exposed_hand = p.get_exposed(),
-                num_cards_in_hand = p.get_card_count(),
-                remaining_trains = p.trains_remaining,
-                score = context.get_score(p.player_id),
-                destination_ticket_count = len(p.get_tickets())
-            ) for p in players if p.player_id != self.player_id
-        ]
+    @property
+    def cards(self) -> CardView:
+        """This player's view of the unseen cards: draw odds and opponents' likely hands."""
+        if self._cards is None:
+            self._cards = self._context.get_card_tracker(self._players).view(self.player_id)
+        return self._cards
 
+    @property
+    def turn_number(self) -> int:
+        """Index of the turn being played."""
+        return self._context.turn_num
 
+    @property
+    def score(self) -> int:
+        """This player's current score."""
+        return self._context.get_score(self.player_id)
 
+    @property
+    def opponents(self) -> Tuple[OpponentInfo, ...]:
+        """Public information about every other player."""
+        key = (self._context.scores_version, tuple(p.version for p in self._opponent_players))
+        if key != self._opponents_key:
+            self._opponents = tuple(self._opponent_info(p) for p in self._opponent_players)
+            self._opponents_key = key
+        return self._opponents
 
+    def _opponent_info(self, p: 'Player') -> OpponentInfo:
+        """Cached :class:`OpponentInfo` for one opponent, rebuilt if it changed."""
+        score = self._context.get_score(p.player_id)
+        cached = self._opponent_cache.get(p.player_id)
+        if cached is not None and cached[0] == p.version and cached[1] == score:
+            return cached[2]
+        info = OpponentInfo(
+            player_id = p.player_id,
+            exposed_hand = FrozenCounter(p.get_exposed()),
+            num_cards_in_hand = p.get_card_count(),
+            remaining_trains = p.trains_remaining,
+            score = score,
+            destination_ticket_count = len(p.get_tickets())
+        )
+        self._opponent_cache[p.player_id] = (p.version, score, info)
+        return info
@@ -0,0 +1,283 @@
+import argparse
+import contextlib
+import json
+import mmap
+import os
+import random
+import re
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from context.delta_log import apply_delta, render_turn_state
+from context.log_stream import is_gzip
+
+# kinds of indexed turn records
+KEYFRAME, DELTA, TURN = 0, 1, 2
+_KINDS = {b"keyframe": KEYFRAME, b"delta": DELTA, b"turn": TURN}
+# records are written with compact separators and "type" first, so the kind of
+# a line can be read without decoding the (possibly large) state behind it
+_TYPE_PREFIX = re.compile(rb'\{"type":"(\w+)"')
+
+
+class ReplayMismatch(ValueError):
+    """The re-driven engine disagrees with the log."""
+
+
+class LogIndex:
+    """Byte offset of every turn record in an uncompressed streamed log.
+
+    ``records`` has one ``(kind, offset)`` row per turn record in file order;
+    each round's turns are consecutive rows starting at the round's
+    ``firstRow``, so the row of any turn is found without searching. The
+    index is saved next to the log (``<log>.idx.npy`` and ``<log>.idx.json``)
+    and memory-mapped when reopened, so opening a large log is O(1).
+    """
+
+    def __init__(self, header: Dict, rounds: Dict[int, Dict], records: np.ndarray, size: int):
+        self.header = header
+        self.rounds = rounds
+        self.records = records
+        self.size = size
+
+    @classmethod
+    def build(cls, path: str) -> 'LogIndex':
+        """Scan the log once and record where each turn starts."""
+        header: Dict = {}
+        rounds: Dict[int, Dict] = {}
+        kinds: List[int] = []
+        offsets: List[int] = []
+        current: Optional[Dict] = None
+        routes_offset = -1
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                match = _TYPE_PREFIX.match(line)
+                kind = match.group(1) if match else b""
+                if kind in _KINDS:
+                    kinds.append(_KINDS[kind])
+                    offsets.append(offset)
+                    current["turnCount"] += 1
+                elif kind == b"round":
+                    record = json.loads(line)
+                    current = rounds[record["round"]] = {
+                        "seed": record.get("seed"), "firstRow": len(offsets),
+                        "turnCount": 0, "routesOffset": routes_offset,
+                    }
+                elif kind == b"routes":
+                    routes_offset = offset
+                    if current is not None and current["turnCount"] == 0:
+                        current["routesOffset"] = offset
+                elif kind == b"header":
+                    header = json.loads(line)
+                offset += len(line)
+        records = np.array([kinds, offsets], dtype=np.int64).T.reshape(-1, 2)
+        return cls(header, rounds, records, offset)
+
+    def save(self, path: str) -> None:
+        """Write the index next to the log at ``path``."""
+        np.save(path + ".idx.npy", self.records)
+        with open(path + ".idx.json", "w") as f:
+            json.dump({"size": self.size, "header": self.header,
+                       "rounds": {str(n): r for n, r in self.rounds.items()}}, f)
+
+    @classmethod
+    def open(cls, path: str) -> 'LogIndex':
+        """Load the saved index of ``path``, building (and saving) it if missing or stale."""
+        size = os.path.getsize(path)
+        try:
+            with open(path + ".idx.json") as f:
+                meta = json.load(f)
+            if meta["size"] == size:
+                records = np.load(path + ".idx.npy", mmap_mode="r")
+                return cls(meta["header"], {int(n): r for n, r in meta["rounds"].items()}, records, size)
+        except (OSError, ValueError, KeyError):
+            pass
+        index = cls.build(path)
+        with contextlib.suppress(OSError):
+            index.save(path)
+        return index
+
+
+class GameReplay:
+    """Random access to the turns of a streamed log.
+
+    The log is memory-mapped and located through a :class:`LogIndex`, so
+    reaching turn ``t`` of round ``r`` reads one keyframe and at most
+    ``keyframeInterval - 1`` deltas, whatever the size of the file. Plain
+    (non-delta) streamed logs are supported by :meth:`turn_state` only.
+    """
+
+    def __init__(self, path: str, index: Optional[LogIndex] = None):
+        if is_gzip(path):
+            raise ValueError(f"{path} is compressed; random access needs the uncompressed log")
+        self.path = path
+        self.index = index if index is not None else LogIndex.open(path)
+        self.players: List[Dict] = self.index.header.get("players", [])
+        self.is_delta = self.index.header.get("format") == "delta"
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._route_names: Dict[int, List[str]] = {}
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'GameReplay':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _record(self, offset: int) -> Dict:
+        """Decode the record starting at ``offset``."""
+        end = self._map.find(b"\n", offset)
+        return json.loads(self._map[offset:end if end >= 0 else len(self._map)])
+
+    def _row(self, round_number: int, turn: int) -> int:
+        rnd = self.index.rounds[round_number]
+        if not 0 <= turn < rnd["turnCount"]:
+            raise IndexError(f"round {round_number} has no turn {turn}")
+        return rnd["firstRow"] + turn
+
+    def round_numbers(self) -> List[int]:
+        """Round numbers present in the log."""
+        return sorted(self.index.rounds)
+
+    def turn_count(self, round_number: int) -> int:
+        """Number of turns recorded for a round."""
+        return self.index.rounds[round_number]["turnCount"]
+
+    def seed(self, round_number: int) -> Optional[int]:
+        """Master seed of a round, if it was logged."""
+        return self.index.rounds[round_number]["seed"]
+
+    def route_names(self, round_number: int) -> List[str]:
+        """Route labels used by a round's ``claimedRoutes``."""
+        offset = self.index.rounds[round_number]["routesOffset"]
+        if offset not in self._route_names:
+            self._route_names[offset] = self._record(offset)["names"] if offset >= 0 else []
+        return self._route_names[offset]
+
+    def state_at(self, round_number: int, turn: int) -> Dict:
+        """Full snapshot at the start of ``turn`` (delta logs only)."""
+        if not self.is_delta:
+            raise ValueError("full snapshots are only recorded in delta logs")
+        row = self._row(round_number, turn)
+        start = row
+        while self.index.records[start, 0] != KEYFRAME:
+            start -= 1
+        snapshot = self._record(int(self.index.records[start, 1]))["state"]
+        for r in range(start + 1, row + 1):
+            apply_delta(snapshot, self._record(int(self.index.records[r, 1]))["changes"])
+        return snapshot
+
+    def iter_states(self, round_number: int, start: int = 0) -> Iterator[Dict]:
+        """Snapshots of consecutive turns from ``start``, each applied to the last.
+
+        The same dictionary is updated and yielded each time; copy it to keep one.
+        """
+        if self.turn_count(round_number) <= start:
+            return
+        snapshot = self.state_at(round_number, start)
+        yield snapshot
+        first = self.index.rounds[round_number]["firstRow"]
+        for row in range(first + start + 1, first + self.turn_count(round_number)):
+            kind, offset = self.index.records[row]
+            record = self._record(int(offset))
+            if kind == KEYFRAME:
+                snapshot = record["state"]
+            else:
+                apply_delta(snapshot, record["changes"])
+            yield snapshot
+
+    def turn_state(self, round_number: int, turn: int) -> Dict:
+        """Turn record at ``turn`` in the format of ``GameLogger.add_turn``."""
+        if not self.is_delta:
+            return self._record(int(self.index.records[self._row(round_number, turn), 1]))["state"]
+        return render_turn_state(self.state_at(round_number, turn), self.route_names(round_number))
+
+    def export_round(self, round_number: int, dst: str) -> None:
+        """Write one round in the nested format read by ``index.html``."""
+        turns = [self.turn_state(round_number, t) for t in range(self.turn_count(round_number))]
+        with open(dst, "w") as f:
+            json.dump({"rounds": [{"seed": self.seed(round_number), "turns": turns}],
+                       "players": self.players, "averageScores": []}, f, indent=2)
+
+    def redrive(self, round_number: int, turn: Optional[int] = None, interfaces: Optional[Sequence] = None,
+                verify: bool = True, map_path: Optional[str] = None, tickets_path: Optional[str] = None):
+        """Replay a round in the engine from its seed and return the paused :class:`Game`.
+
+        The game stops before ``turn`` (or at the end). ``interfaces`` are
+        the bots to seat, by default fresh instances of the classes named in
+        the log header. With ``verify`` every turn's engine state is compared
+        to the log and a :class:`ReplayMismatch` is raised at the first
+        difference; bots that keep state between games or use unseeded
+        randomness cannot be replayed exactly.
+        """
+        from Game import Game
+        from context.GameLogger import GameLogger
+        from context.game_context import GameContext
+        from player import Player
+
+        seed = self.seed(round_number)
+        if seed is None:
+            raise ValueError(f"round {round_number} was logged without its seed")
+        if verify and not self.is_delta:
+            raise ValueError("verification needs a delta log")
+        if interfaces is None:
+            from main import load_bots
+            bots = load_bots()
+            interfaces = [bots[p["bot"]]() for p in self.players]
+        players = [Player(p["playerId"], interface, p["name"], p["color"])
+                   for p, interface in zip(self.players, interfaces)]
+        logger = GameLogger(players)
+        logger.add_round(seed)
+        # as in tournament.play_round, for bots that use the random module
+        random.seed(seed)
+        context = GameContext([p.player_id for p in players], map_path, tickets_path, seed)
+        game = Game(context, players, logger, 0)
+
+        if verify:
+            states = self.iter_states(round_number)
+            play_turn = game.next_turn
+
+            def next_turn():
+                expected = next(states, None)
+                player = game.current_player()
+                actual = json.loads(json.dumps(logger.snapshot_turn(game.player_contexts[player.player_id])))
+                if actual != expected:
+                    raise ReplayMismatch(f"round {round_number} differs from the log at turn {game.turn_index}")
+                play_turn()
+            game.next_turn = next_turn
+
+        game.play(turn)
+        return game
+
+
+def main():
+    """Command line access to single turns of a streamed log."""
+    parser = argparse.ArgumentParser(description="Seek into a streamed game log.")
+    parser.add_argument("log", help="uncompressed streamed log (.jsonl)")
+    parser.add_argument("--round", type=int, default=None, help="round to inspect (default: list the rounds)")
+    parser.add_argument("--turn", type=int, default=None, help="print the state at this turn")
+    parser.add_argument("--export", default=None, metavar="DST", help="write the round as nested JSON for index.html")
+    parser.add_argument("--verify", action="store_true", help="re-drive the round in the engine and compare every turn")
+    args = parser.parse_args()
+
+    with GameReplay(args.log) as replay:
+        if args.round is None:
+            for n in replay.round_numbers():
+                print(f"round {n}: {replay.turn_count(n)} turns, seed {replay.seed(n)}")
+            return
+        if args.turn is not None:
+            print(json.dumps(replay.turn_state(args.round, args.turn), indent=2))
+        if args.export:
+            replay.export_round(args.round, args.export)
+        if args.verify:
+            game = replay.redrive(args.round)
+            print(f"round {args.round} matches the engine over {game.turn_index} turns")
+
+
+if __name__ == "__main__":
+    main()
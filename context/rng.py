@@ -0,0 +1,43 @@
+import hashlib
+import random
+from typing import Dict, Optional
+
+
+class RngRegistry:
+    """Independent, reproducible random streams derived from one master seed.
+
+    Every consumer (train deck, ticket deck, each bot) gets its own named
+    :class:`random.Random`, seeded from a hash of the master seed and the
+    stream name. Streams never share state, so adding draws to one of them
+    does not shift the others, and the same master seed always replays the
+    same game regardless of which process runs it.
+    """
+
+    def __init__(self, master_seed: Optional[int] = None):
+        if master_seed is None:
+            master_seed = random.SystemRandom().randrange(2 ** 63)
+        self.master_seed: int = master_seed
+        self._streams: Dict[str, random.Random] = {}
+
+    def stream(self, name: str) -> random.Random:
+        """Return the stream called ``name``, creating it on first use."""
+        rng = self._streams.get(name)
+        if rng is None:
+            digest = hashlib.sha256(f"{self.master_seed}:{name}".encode()).digest()
+            rng = self._streams[name] = random.Random(int.from_bytes(digest[:8], "big"))
+        return rng
+
+    def train_deck(self) -> random.Random:
+        """Stream used to shuffle the train card deck."""
+        return self.stream("train_deck")
+
+    def ticket_deck(self) -> random.Random:
+        """Stream used to shuffle the destination tickets."""
+        return self.stream("ticket_deck")
+
+    def bot(self, player_id: str) -> random.Random:
+        """Stream handed to the bot controlling ``player_id``."""
+        return self.stream(f"bot:{player_id}")
+
+    def __repr__(self) -> str:
+        return f"RngRegistry(master_seed={self.master_seed})"
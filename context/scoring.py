@@ -0,0 +1,80 @@
+from typing import Dict, Iterable, List, NamedTuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from context.Map import MapGraph, Route
+    from context.decks import DestinationTicket
+
+# points scored for claiming a route, by route length
+ROUTE_SCORES: Dict[int, int] = {
+    1:1,
+    2:2,
+    3:4,
+    4:7,
+    5:10,
+    6:15
+}
+# bonus for holding the longest continuous path
+LONGEST_PATH_BONUS = 10
+
+
+class ScoreBreakdown(NamedTuple):
+    """One player's score split into its components."""
+    routes: int
+    tickets: int
+    longest_path: int
+    penalties: int
+
+    @property
+    def total(self) -> int:
+        return self.routes + self.tickets + self.longest_path - self.penalties
+
+
+class ScoreKeeper:
+    """Running score components of every player, updated from game events.
+
+    Route points come from the map's claim listeners; ticket values are
+    added when a player keeps or completes tickets; the longest-path bonus
+    follows ``map.longest_path_holder``. Every query is O(1), so scores can
+    be read after every turn without rescanning routes or tickets.
+    """
+
+    def __init__(self, map_graph: 'MapGraph', player_ids: Iterable[str]):
+        self.map = map_graph
+        self._route_points: Dict[str, int] = {p: 0 for p in player_ids}
+        self._completed: Dict[str, int] = dict.fromkeys(self._route_points, 0)
+        self._incomplete: Dict[str, int] = dict.fromkeys(self._route_points, 0)
+        map_graph.add_claim_listener(self.route_claimed)
+
+    def route_claimed(self, route: 'Route', player_id: str) -> None:
+        """Add the points of a newly claimed route."""
+        self._route_points[player_id] = self._route_points.get(player_id, 0) + ROUTE_SCORES[route.length]
+
+    def tickets_added(self, player_id: str, tickets: 'List[DestinationTicket]') -> None:
+        """Record tickets a player has just kept."""
+        for t in tickets:
+            if t.is_completed:
+                self._completed[player_id] = self._completed.get(player_id, 0) + t.value
+            else:
+                self._incomplete[player_id] = self._incomplete.get(player_id, 0) + t.value
+
+    def tickets_completed(self, player_id: str, tickets: 'List[DestinationTicket]') -> None:
+        """Move newly completed tickets from the incomplete to the completed total."""
+        value = sum(t.value for t in tickets)
+        self._completed[player_id] = self._completed.get(player_id, 0) + value
+        self._incomplete[player_id] = self._incomplete.get(player_id, 0) - value
+
+    def breakdown(self, player_id: str, final: bool = False) -> ScoreBreakdown:
+        """Score components of a player; incomplete tickets only count as penalties if ``final``."""
+        return ScoreBreakdown(
+            routes = self._route_points.get(player_id, 0),
+            tickets = self._completed.get(player_id, 0),
+            longest_path = LONGEST_PATH_BONUS if self.map.longest_path_holder == player_id else 0,
+            penalties = self._incomplete.get(player_id, 0) if final else 0,
+        )
+
+    def score(self, player_id: str, final: bool = False) -> int:
+        """Total score of a player, as :meth:`breakdown` ``.total``."""
+        return self.breakdown(player_id, final).total
+
+    def incomplete_value(self, player_id: str) -> int:
+        """Points a player would lose if the game ended now."""
+        return self._incomplete.get(player_id, 0)
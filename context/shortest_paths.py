@@ -0,0 +1,121 @@
+import numpy as np
+from typing import Dict, List, Optional, Set, TYPE_CHECKING
+if TYPE_CHECKING:
+    from context.Map import MapGraph, Route
+
+# distance used for unreachable pairs; small enough that INF + INF fits in int32
+INF = 1 << 20
+
+
+def floyd_warshall(cost: np.ndarray) -> np.ndarray:
+    """Return all-pairs shortest distances for a dense edge-cost matrix."""
+    dist = cost.astype(np.int32, copy=True)
+    for k in range(dist.shape[0]):
+        np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+    return dist
+
+
+class ShortestPathService:
+    """All-pairs train costs between cities, as seen by each player.
+
+    A player's own routes cost nothing, unclaimed routes cost their length and
+    routes owned by anyone else are blocked. The unclaimed board is solved once
+    per process by the shared board; per-player tables are derived lazily and kept up to date from
+    the map's claim listeners: a player's own claim is folded in with an O(n²)
+    edge-decrease update, and an opponent's claim only invalidates the table if
+    the blocked route could lie on one of its shortest paths.
+    """
+
+    def __init__(self, map_graph: 'MapGraph'):
+        self.map = map_graph
+        self._dist: Dict[str, np.ndarray] = {}
+        self._stale: Set[str] = set()
+        map_graph.add_claim_listener(self._route_claimed)
+
+    def static_distances(self) -> np.ndarray:
+        """Distances on the map with every route unclaimed (shared by the board)."""
+        return self.map.board.static_distances()
+
+    def distances(self, player_id: str) -> np.ndarray:
+        """Read-only city-by-city matrix of trains ``player_id`` still needs."""
+        dist = self._dist.get(player_id)
+        if dist is None or player_id in self._stale:
+            if self.map.available_mask().all():
+                dist = self.static_distances()
+            else:
+                dist = floyd_warshall(self.edge_costs(player_id))
+                dist.setflags(write=False)
+            self._dist[player_id] = dist
+            self._stale.discard(player_id)
+        return dist
+
+    def edge_costs(self, player_id: str) -> np.ndarray:
+        """Cheapest single-route cost between each pair of cities for a player."""
+        m = self.map
+        lengths = m.route_length.astype(np.int32)
+        route_cost = np.where(m.claimed_mask(player_id), 0, np.where(m.available_mask(), lengths, INF))
+        n = len(m.city_names)
+        cost = np.full((n, n), INF, dtype=np.int32)
+        np.minimum.at(cost, (m.route_city1, m.route_city2), route_cost)
+        np.minimum.at(cost, (m.route_city2, m.route_city1), route_cost)
+        np.fill_diagonal(cost, 0)
+        return cost
+
+    def distance(self, player_id: str, city1: str, city2: str) -> Optional[int]:
+        """Trains still needed to connect two cities, or ``None`` if impossible."""
+        d = int(self.distances(player_id)[self.map.city_ids[city1], self.map.city_ids[city2]])
+        return None if d >= INF else d
+
+    def path(self, player_id: str, city1: str, city2: str) -> 'Optional[List[Route]]':
+        """One cheapest list of routes connecting two cities, or ``None``.
+
+        Routes the player already owns are included in the list.
+        """
+        m = self.map
+        dist = self.distances(player_id)
+        target = m.city_ids[city2]
+        if dist[m.city_ids[city1], target] >= INF:
+            return None
+
+        # walk "tight" routes (cost + remaining == distance) towards the target;
+        # own routes cost 0, so track visited cities to avoid zero-cost loops
+        path: 'List[Route]' = []
+        visited = {city1}
+
+        def walk(city: str) -> bool:
+            if city == city2:
+                return True
+            here = dist[m.city_ids[city], target]
+            for r in m._adj[city]:
+                owner = r.claimed_by
+                if owner is not None and owner != player_id:
+                    continue
+                nxt = r.other_city(city)
+                cost = 0 if owner == player_id else r.length
+                if nxt in visited or cost + dist[m.city_ids[nxt], target] != here:
+                    continue
+                visited.add(nxt)
+                path.append(r)
+                if walk(nxt):
+                    return True
+                path.pop()
+            return False
+
+        walk(city1)
+        return path
+
+    def _route_claimed(self, route: 'Route', player_id: str) -> None:
+        """Fold a new claim into every cached per-player table."""
+        u, v = route.city1_id, route.city2_id
+        for pid, dist in list(self._dist.items()):
+            if pid in self._stale:
+                continue
+            if pid == player_id:
+                # the route now costs 0 for its owner: single edge-decrease update
+                via = np.minimum(dist[:, u, None] + dist[None, v, :], dist[:, v, None] + dist[None, u, :])
+                updated = np.minimum(dist, via)
+                updated.setflags(write=False)
+                self._dist[pid] = updated
+            elif dist[u, v] >= route.length:
+                # blocked route may have been on a shortest path; recompute on demand
+                self._stale.add(pid)
@@ -0,0 +1,195 @@
+import numpy as np
+from collections import OrderedDict
+from itertools import combinations
+from typing import FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple, TYPE_CHECKING
+from context.shortest_paths import INF
+if TYPE_CHECKING:
+    from context.decks import DestinationTicket
+    from context.Map import MapGraph
+
+# a ticket as the sorted ids of its two cities
+CityPair = Tuple[int, int]
+
+
+def steiner_forest_cost(dist: np.ndarray, pairs: Iterable[CityPair]) -> int:
+    """Approximate trains of a network connecting every city pair in ``pairs``.
+
+    Greedy Steiner forest on the metric closure of the cities: shortest
+    paths between them are added cheapest first, as in Kruskal's algorithm,
+    while they join two parts of which one still has an unconnected pair.
+    The answer is never more than the pairs' separate distances, and
+    :data:`INF` if a pair cannot be connected.
+    """
+    pairs = list(pairs)
+    separate = 0
+    for a, b in pairs:
+        d = int(dist[a, b])
+        if d >= INF:
+            return INF
+        separate += d
+    if len(pairs) < 2:
+        return separate
+    cities = sorted({c for pair in pairs for c in pair})
+    index = {c: i for i, c in enumerate(cities)}
+    # a few dozen city pairs at most: plain lists beat array calls here
+    closure = dist.take(cities, 0).take(cities, 1).tolist()
+    edges = sorted((row[j], i, j) for i, row in enumerate(closure) for j in range(i + 1, len(cities)))
+    parent = list(range(len(cities)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    demands = [(index[a], index[b]) for a, b in pairs]
+
+    def unconnected() -> set:
+        roots = set()
+        for a, b in demands:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                roots.add(ra)
+                roots.add(rb)
+        return roots
+
+    open_parts = unconnected()
+    total = 0
+    for d, i, j in edges:
+        if not open_parts:
+            break
+        ri, rj = find(i), find(j)
+        if ri == rj or (ri not in open_parts and rj not in open_parts) or d >= INF:
+            continue
+        parent[ri] = rj
+        total += d
+        open_parts = unconnected()
+    return min(total, separate)
+
+
+class SteinerCostCache:
+    """Process-wide memo of :func:`steiner_forest_cost` results for one board.
+
+    Keys are a claim state (see :meth:`TicketOfferEvaluator.claim_state`)
+    and a frozenset of city pairs, so an offer seen on the same board
+    position in another game is not solved again. The least recently used
+    entries are dropped beyond ``maxsize``.
+    """
+
+    def __init__(self, maxsize: int = 1 << 16):
+        self.maxsize = maxsize
+        self._costs: 'OrderedDict[tuple, int]' = OrderedDict()
+        # lookups answered from the cache and solved afresh
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._costs)
+
+    def get(self, state: bytes, pairs: FrozenSet[CityPair]) -> Optional[int]:
+        cost = self._costs.get((state, pairs))
+        if cost is None:
+            self.misses += 1
+            return None
+        self._costs.move_to_end((state, pairs))
+        self.hits += 1
+        return cost
+
+    def put(self, state: bytes, pairs: FrozenSet[CityPair], cost: int) -> int:
+        self._costs[(state, pairs)] = cost
+        if len(self._costs) > self.maxsize:
+            self._costs.popitem(last=False)
+        return cost
+
+    def clear(self) -> None:
+        self._costs.clear()
+        self.hits = self.misses = 0
+
+
+class OfferOption(NamedTuple):
+    """One way of answering a ticket offer."""
+    tickets: 'Tuple[DestinationTicket, ...]'
+    # extra trains to complete them on top of the network needed for the held tickets;
+    # None if one of them can no longer be completed
+    trains: Optional[int]
+    # trains saved over connecting each ticket on its own, by sharing track
+    # with each other or with the held tickets
+    overlap: int
+    # points if they are all completed (and lost if none are)
+    points: int
+
+
+class TicketOfferEvaluator:
+    """Train cost of every subset of a destination-ticket offer, for one player.
+
+    Costs are greedy Steiner forest approximations over the player's
+    :class:`ShortestPathService` distances, where their own routes are free
+    and opponents' routes are blocked. They are memoized in the board's
+    :class:`SteinerCostCache`, keyed by the tickets' cities and the claim
+    state, so repeated offers cost a dictionary lookup in later decisions
+    and later games.
+    """
+
+    def __init__(self, map_graph: 'MapGraph'):
+        self.map = map_graph
+        self.cache: SteinerCostCache = map_graph.board.steiner_costs()
+
+    def claim_state(self, player_id: str) -> bytes:
+        """Packed masks of the routes ``player_id`` owns and the free routes: all their distances depend on."""
+        m = self.map
+        return np.packbits(m.claimed_mask(player_id)).tobytes() + np.packbits(m.available_mask()).tobytes()
+
+    def _pair(self, ticket) -> CityPair:
+        a, b = self.map.city_ids[ticket.city1], self.map.city_ids[ticket.city2]
+        return (a, b) if a <= b else (b, a)
+
+    def evaluate(self, player_id: str, offer: 'Sequence[DestinationTicket]',
+                 held: 'Iterable[DestinationTicket]' = ()) -> List[OfferOption]:
+        """An :class:`OfferOption` for every non-empty subset of ``offer``.
+
+        ``held`` are the tickets the player already has; completed ones and
+        ones that can no longer be completed are left out of the base
+        network. A subset never costs more trains than a larger one.
+        Subsets come smallest first, in the order of ``offer``.
+        """
+        state = self.claim_state(player_id)
+        cache = self.cache
+        dist: Optional[np.ndarray] = None
+
+        def cost(pairs: FrozenSet[CityPair]) -> int:
+            nonlocal dist
+            known = cache.get(state, pairs)
+            if known is not None:
+                return known
+            if dist is None:
+                dist = self.map.shortest_paths.distances(player_id)
+            return cache.put(state, pairs, steiner_forest_cost(dist, pairs))
+
+        base_pairs = frozenset(p for p in (self._pair(t) for t in held if not getattr(t, "is_completed", False))
+                               if cost(frozenset((p,))) < INF)
+        base = cost(base_pairs)
+        pairs = [self._pair(t) for t in offer]
+        alone = [cost(frozenset((p,))) for p in pairs]
+
+        subsets = [kept for size in range(1, len(offer) + 1) for kept in combinations(range(len(offer)), size)]
+        trains = {}
+        for kept in reversed(subsets):
+            separate = sum(alone[i] for i in kept)
+            if separate >= INF:
+                continue
+            # forest(held) + each ticket on its own is always possible, and so
+            # is any network that completes a larger subset
+            extra = min(cost(base_pairs.union(pairs[i] for i in kept)) - base, separate)
+            for i in range(len(offer)):
+                larger = trains.get(tuple(sorted(kept + (i,))))
+                if i not in kept and larger is not None:
+                    extra = min(extra, larger)
+            trains[kept] = max(0, extra)
+
+        options: List[OfferOption] = []
+        for kept in subsets:
+            extra = trains.get(kept)
+            options.append(OfferOption(tuple(offer[i] for i in kept), extra,
+                                       0 if extra is None else sum(alone[i] for i in kept) - extra,
+                                       sum(offer[i].value for i in kept)))
+        return options
@@ -0,0 +1,105 @@
+import numpy as np
+from typing import Dict, Iterable, List, Sequence, Tuple, TYPE_CHECKING
+from context.shortest_paths import INF
+if TYPE_CHECKING:
+    from context.board import TicketSpec
+    from context.Map import MapGraph, Route
+
+
+def ticket_detours(dist: np.ndarray, route_cost: np.ndarray, route_city1: np.ndarray, route_city2: np.ndarray,
+                   ticket_city1: np.ndarray, ticket_city2: np.ndarray) -> np.ndarray:
+    """Tickets-by-routes matrix of the extra trains a ticket needs if its path uses the route.
+
+    ``dist`` is an all-pairs distance matrix and ``route_cost`` the cost of
+    each route under the same rules. A detour of 0 means the route lies on
+    a shortest path of the ticket; :data:`INF` marks routes that cannot be
+    used and tickets that cannot be completed.
+    """
+    a, b, u, v = ticket_city1, ticket_city2, route_city1, route_city2
+    from_a, to_b = dist[a], dist[:, b]
+    via = np.minimum(from_a[:, u] + route_cost + to_b[v].T, from_a[:, v] + route_cost + to_b[u].T)
+    best = dist[a, b][:, None]
+    return np.where((via >= INF) | (best >= INF), INF, via - best).astype(np.int32)
+
+
+class TicketRouteIndex:
+    """Which routes each destination ticket would use, as seen by each player.
+
+    For every ticket of the board and every route, the index holds the
+    detour (extra trains over the ticket's shortest path) of connecting the
+    ticket through that route, from :func:`ticket_detours` on the player's
+    :class:`ShortestPathService` distances. Routes on a path within
+    ``slack`` trains of the shortest get a relevance between 1 (on a
+    shortest path) and ``1 / (slack + 1)``; others get 0. The unclaimed
+    board's detours are computed once per process by the board; per-player
+    tables are rebuilt lazily after claims, so ranking candidate routes is a
+    lookup instead of a path search per route and ticket.
+    """
+
+    def __init__(self, map_graph: 'MapGraph', slack: int = 2):
+        self.map = map_graph
+        self.slack = slack
+        self.tickets: 'Tuple[TicketSpec, ...]' = map_graph.board.tickets
+        # row of each ticket by its cities, in either order
+        self._rows: Dict[Tuple[str, str], int] = {}
+        for i, t in enumerate(self.tickets):
+            self._rows.setdefault((t.city1, t.city2), i)
+            self._rows.setdefault((t.city2, t.city1), i)
+        self._relevance: Dict[str, np.ndarray] = {}
+        map_graph.add_claim_listener(self._route_claimed)
+
+    def row(self, ticket) -> int:
+        """Row of a ticket (anything with ``city1`` and ``city2``) in the tables."""
+        return self._rows[(ticket.city1, ticket.city2)]
+
+    def detours(self, player_id: str) -> np.ndarray:
+        """Read-only tickets-by-routes detours for ``player_id``."""
+        m = self.map
+        if m.available_mask().all():
+            return m.board.static_ticket_detours()
+        dist = m.shortest_paths.distances(player_id)
+        lengths = m.route_length.astype(np.int32)
+        route_cost = np.where(m.claimed_mask(player_id), 0, np.where(m.available_mask(), lengths, INF))
+        city_ids = m.city_ids
+        detours = ticket_detours(dist, route_cost, m.route_city1, m.route_city2,
+                                 np.array([city_ids[t.city1] for t in self.tickets]),
+                                 np.array([city_ids[t.city2] for t in self.tickets]))
+        detours.setflags(write=False)
+        return detours
+
+    def relevance(self, player_id: str) -> np.ndarray:
+        """Read-only tickets-by-routes relevance in ``[0, 1]``, cached until the next claim."""
+        relevance = self._relevance.get(player_id)
+        if relevance is None:
+            detours = self.detours(player_id)
+            relevance = np.where(detours <= self.slack, (self.slack + 1 - detours) / (self.slack + 1), 0.0)
+            relevance.setflags(write=False)
+            self._relevance[player_id] = relevance
+        return relevance
+
+    def tickets_using(self, player_id: str, route: 'Route') -> 'List[Tuple[TicketSpec, float]]':
+        """Board tickets whose near-shortest paths use ``route``, most relevant first."""
+        column = self.relevance(player_id)[:, route.index]
+        rows = np.flatnonzero(column)
+        return [(self.tickets[i], float(column[i])) for i in rows[np.argsort(-column[rows], kind="stable")]]
+
+    def route_scores(self, player_id: str, tickets: Iterable) -> np.ndarray:
+        """Value-weighted relevance of every route to ``tickets``, indexed by ``Route.index``."""
+        rows = [self.row(t) for t in tickets]
+        if not rows:
+            return np.zeros(len(self.map.routes))
+        values = np.array([self.tickets[r].value for r in rows], dtype=float)
+        return values @ self.relevance(player_id)[rows]
+
+    def rank(self, player_id: str, candidates: 'Sequence[Tuple[Route, int]]',
+             tickets: Iterable) -> 'List[Tuple[Route, int]]':
+        """``(route, locomotives)`` candidates sorted by :meth:`route_scores`, best first.
+
+        Completed tickets are ignored; ties keep the candidates' order.
+        """
+        scores = self.route_scores(player_id, [t for t in tickets if not getattr(t, "is_completed", False)])
+        return sorted(candidates, key=lambda c: -scores[c[0].index])
+
+    def _route_claimed(self, route: 'Route', player_id: str) -> None:
+        # distances and usable routes change for every player
+        self._relevance.clear()
@@ -2,6 +2,7 @@ from player import Player
 from Game import Game
 from context.game_context import GameContext
 from context.GameLogger import GameLogger
+from context.events import ConsoleReporter
 from typing import List
 
 import inspect
@@ -10,6 +11,18 @@ import importlib
 import Interfaces
 from Interfaces.abstract_interface import Interface
 
+PLAYER_NAMES = [
+    "test_1",
+    "test_2",
+    "test_3",
+    "test_4",
+]
+PLAYER_COLORS = [
+    "red",
+    "blue",
+    "green",
+    "yellow"
+]
 
 def load_bots() -> dict:
     """Dynamically load all bot classes from the Interfaces package."""
@@ -33,18 +46,21 @@ def main():
     round_limit = 10 # Can be changed to adjust how many consecutive rounds to run before the program stops
     
     while (round_number < round_limit):
-        # Add empty round to log
-        logger.add_round()
-        
         # Initialize GameContext
         context = GameContext([p.player_id for p in players])
+
+        # Add empty round to log
+        logger.add_round(context.rng.master_seed)
+        ConsoleReporter().attach(context.events)
         game = Game(context, players, logger, round_number)
         print(f"Starting round {round_number}")
         game.play()
+        logger.end_round(context.scores)
+        logger.add_latency(players)
 
         round_number += 1
         if round_number != round_limit:
-            players = [Player(p.player_id, p.get_interface(), p.name, p.color) for p in players]
+            players = [Player(p.player_id, p.get_interface(), p.name, p.color, p.profiler.budget) for p in players]
             logger.set_player_list(players)
 
     logger.log_match_stats()
@@ -66,18 +82,6 @@ def setup() -> 'tuple[List[Player],GameLogger]':
 
     player_ids = []
     players = []
-    player_names = [
-        "test_1",
-        "test_2",
-        "test_3",
-        "test_4",
-    ]
-    player_colors = [
-        "red",
-        "blue",
-        "green",
-        "yellow"
-    ]
 
     available_bots = load_bots()
     bot_names = list(available_bots.keys())
@@ -97,7 +101,7 @@ def setup() -> 'tuple[List[Player],GameLogger]':
             print("Invalid choice. Please try again.")
 
         bot_class = available_bots[bot_names[choice]]
-        players.append(Player(player_id, bot_class(), player_names[i], player_colors[i]))
+        players.append(Player(player_id, bot_class(), PLAYER_NAMES[i], PLAYER_COLORS[i]))
 
         # for the game context
         player_ids.append(player_id)
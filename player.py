@@ -1,17 +1,71 @@
 from copy import deepcopy
-from typing import List, Dict, Optional
+from typing import Any, Generator, List, Dict, NamedTuple, Optional, TypeVar
 from collections import Counter
 import weakref
 from context.Map import Route
+from context.affordability import AffordabilityIndex
 from context.decks import DestinationTicket
 from context.player_context import PlayerContext
+from context.scoring import ScoreKeeper
+from context.events import EventBus, CLAIM, DRAW, FAULT, TICKET_OFFER
+from context.latency import DecisionProfiler, TimeBudget
+
+
+class Decision(NamedTuple):
+    """A question the rules put to a player's interface: ``interface.<method>(*args)``."""
+    player: 'Player'
+    method: str
+    args: tuple
+
+
+T = TypeVar("T")
+# rules that ask for decisions are generators: they yield each Decision and
+# are sent the interface's answer, so the same code runs blocking or async
+Steps = Generator[Decision, Any, T]
+
+
+def run_steps(steps: 'Steps[T]') -> T:
+    """Play out ``steps``, answering every decision on the spot."""
+    answer: Any = None
+    failure: Optional[BaseException] = None
+    while True:
+        try:
+            request = steps.throw(failure) if failure is not None else steps.send(answer)
+        except StopIteration as done:
+            return done.value
+        failure = None
+        try:
+            answer = request.player.decide(request)
+        except Exception as e:
+            # raised inside the rules, exactly where a direct call would have raised
+            failure = e
+
+
+async def run_steps_async(steps: 'Steps[T]') -> T:
+    """Play out ``steps``, awaiting each decision so other games run meanwhile."""
+    answer: Any = None
+    failure: Optional[BaseException] = None
+    while True:
+        try:
+            request = steps.throw(failure) if failure is not None else steps.send(answer)
+        except StopIteration as done:
+            return done.value
+        failure = None
+        try:
+            answer = await request.player.decide_async(request)
+        except Exception as e:
+            failure = e
 
 
 
 
 class Player:
-    def __init__(self, player_id: str, interface, name: str, color: str):
-        """Create a new player controlled by the provided interface."""
+    def __init__(self, player_id: str, interface, name: str, color: str, budget: Optional[TimeBudget] = None):
+        """Create a new player controlled by the provided interface.
+
+        Every call into the interface is timed against ``budget`` (2 seconds
+        per decision by default); see :class:`context.latency.DecisionProfiler`.
+        """
         self.player_id = player_id
         self.name = name
         self.color = color
@@ -22,24 +76,51 @@ class Player:
         self.context: PlayerContext
         self.__interface = interface
         self.__interface.set_player(self)
-        self.has_longest_path: bool = False
-        self.my_longest_path_length: int
+        self.profiler = DecisionProfiler(budget)
+        # set by the game; receives ticket events for incremental scoring
+        self.score_keeper: Optional[ScoreKeeper] = None
+        # set by the game; draws, claims, ticket offers and faults are published here
+        self.events: EventBus = EventBus()
+        self._affordability: Optional[AffordabilityIndex] = None
+        # bumped whenever public information about this player changes
+        self.version: int = 0
 
     # sets the context for the player
     def set_context(self, context: PlayerContext, setup: bool = False):
         """Provide the player with the latest :class:`PlayerContext`."""
         self.context = context
+        # (re)build the affordability index whenever we are placed on a new map
+        if self._affordability is None or self._affordability.map is not context.map:
+            if self._affordability is not None:
+                self._affordability.detach()
+            self._affordability = AffordabilityIndex(context.map, self.__train_hand)
         if setup:
-            for i in range(0, 2):
-                self.__draw_train_cards([-1] * 2)
-            self.__draw_destination_tickets()
-            if len(self.__tickets) < 2:
-                self.__draw_destination_tickets()
+            run_steps(self.setup_steps())
+
+    def setup_steps(self) -> 'Steps[None]':
+        """Deal the starting hand and tickets (see :class:`Decision`)."""
+        for i in range(0, 2):
+            yield from self.__draw_train_cards([-1] * 2)
+        yield from self.__draw_destination_tickets()
+        if len(self.__tickets) < 2:
+            yield from self.__draw_destination_tickets()
+
+    def decide(self, request: Decision) -> Any:
+        """Answer a decision with the interface, within the time budget."""
+        return self.profiler.call(self.__interface, request.method, *request.args)
+
+    async def decide_async(self, request: Decision) -> Any:
+        """Answer a decision, awaiting interfaces whose methods are coroutines."""
+        return await self.profiler.call_async(self.__interface, request.method, *request.args)
 
     #prompts interface for turn option
     def take_turn(self, fault_flags: Dict[str, bool]) -> None:
         """Execute a single iteration of the gameplay loop for this player."""
-        turn_choice = self.__interface.choose_turn_action()
+        run_steps(self.turn_steps(fault_flags))
+
+    def turn_steps(self, fault_flags: Dict[str, bool]) -> 'Steps[None]':
+        """The rules of :meth:`take_turn`, yielding each decision (see :class:`Decision`)."""
+        turn_choice = yield Decision(self, "choose_turn_action", ())
         
         # Check if there are enough cards in the deck to draw; if not, shuffle in the discard and check again. 
         # If there are still less than 2 cards in the deck, force the player to claim a route if they can afford one, or to pass the turn if they can't
@@ -51,25 +132,25 @@ class Player:
         if turn_choice == 1: ## Draw Cards
             # if there is a fault flag, force players to claim routes if possible
             if not fault_flags['draw_train']:
-                self.__prompt_draw_train()
+                yield from self.__prompt_draw_train()
             else:
-                self.__prompt_claim_route(fault_flags)
+                yield from self.__prompt_claim_route(fault_flags)
 
         elif turn_choice == 2: ## Claim Route
-            self.__prompt_claim_route(fault_flags)
+            yield from self.__prompt_claim_route(fault_flags)
 
         elif turn_choice == 3: ## Draw Destination tickets
-            self.__prompt_draw_ticket(fault_flags)
+            yield from self.__prompt_draw_ticket(fault_flags)
 
         else:
-            print(f"Invalid action choice '{turn_choice}' by player {self.player_id}.")
+            self._fault(f"Invalid action choice '{turn_choice}' by player {self.player_id}.")
 
     # prompts for each option
-    def __prompt_draw_train(self):
+    def __prompt_draw_train(self) -> 'Steps[None]':
         """Handle the draw-train-cards portion of a turn."""
-        self.__draw_train_cards()
+        yield from self.__draw_train_cards()
 
-    def __prompt_claim_route(self, fault_flags: Dict[str, bool]):
+    def __prompt_claim_route(self, fault_flags: Dict[str, bool]) -> 'Steps[None]':
         """Handle a player's attempt to claim a route."""
         # does it already have a fault flag?
         if not fault_flags['claim_route']:
@@ -77,17 +158,17 @@ class Player:
             if not len(self.get_affordable_routes()):
                 # if so, add one, throw an error message, and try again
                 fault_flags["claim_route"] = True
-                print(f"{self.name} cannot currently afford any routes. Try something else.")
-                self.take_turn(fault_flags)
+                self._fault(f"{self.name} cannot currently afford any routes. Try something else.")
+                yield from self.turn_steps(fault_flags)
             else:
                 # if not, proceed as normal
-                route = self.__claim_available_route(fault_flags["draw_train"])
+                route = yield from self.__claim_available_route(fault_flags["draw_train"])
                 self.update_longest_path(route)
                 self.check_ticket_completion()
         elif not fault_flags['draw_train']:
-            self.__draw_train_cards([-1]*2)
+            yield from self.__draw_train_cards([-1]*2)
 
-    def __prompt_draw_ticket(self, fault_flags: Dict[str, bool]):
+    def __prompt_draw_ticket(self, fault_flags: Dict[str, bool]) -> 'Steps[None]':
         """Handle drawing destination tickets during a turn."""
         # does it already have a fault flag?
         if not fault_flags['draw_destination']:
@@ -95,22 +176,26 @@ class Player:
             if len(self.context.ticket_deck) < 3:
                 # if so, add one, throw an error message, and try again
                 fault_flags["draw_destination"] = True
-                print(f"There aren't enough destination tickets left for {self.name}. Try something else.")
-                self.take_turn(fault_flags)
+                self._fault(f"There aren't enough destination tickets left for {self.name}. Try something else.")
+                yield from self.turn_steps(fault_flags)
             else:
                 # if not, proceed as normal
-                success = self.__draw_destination_tickets()
+                success = yield from self.__draw_destination_tickets()
                 if not success:
                     fault_flags["draw_destination"] = True
-                    print(f"{self.player_id} could not draw destination tickets.")
-                    self.take_turn(fault_flags)
+                    self._fault(f"{self.player_id} could not draw destination tickets.")
+                    yield from self.turn_steps(fault_flags)
         else:
-            self.__draw_train_cards([-1]*2)
+            yield from self.__draw_train_cards([-1]*2)
 
     # handlers for each option
-    def __draw_train_cards(self, draws: Optional[List[int]] = None) -> str:
+    def __draw_train_cards(self, draws: Optional[List[int]] = None) -> 'Steps[str]':
         """Internal helper for drawing train cards."""
-        draw_choices = [self.__interface.choose_draw_train_action() for _ in range(2)] if draws is None else draws
+        draw_choices = draws
+        if draws is None:
+            draw_choices = []
+            for _ in range(2):
+                draw_choices.append((yield Decision(self, "choose_draw_train_action", ())))
 
         train_deck = self.context.train_deck # Assuming ticket_deck includes train draw functionality
 
@@ -122,7 +207,7 @@ class Player:
                     self.__add_cards([card], True)
                     return 'success'
                 except IndexError:
-                    print(f"Invalid face-up index '{c}' by player {self.player_id}.")
+                    self._fault(f"Invalid face-up index '{c}' by player {self.player_id}.")
                     return 'invalid'
                 
         first_choice = draw_choices[0]
@@ -131,7 +216,7 @@ class Player:
                 card = train_deck.draw_face_up(first_choice)
                 self.__add_cards([card], True)
             except IndexError:
-                print(f"Invalid face-up index '{first_choice}' by player {self.player_id}.")
+                self._fault(f"Invalid face-up index '{first_choice}' by player {self.player_id}.")
                 return 'invalid'
 
         elif first_choice == -1:
@@ -139,11 +224,11 @@ class Player:
                 card = train_deck.draw_face_down()
                 self.__add_cards([card], False)
             except Exception as e:
-                print(f"Face-down draw failed for player {self.player_id}: {e}")
+                self._fault(f"Face-down draw failed for player {self.player_id}: {e}")
                 return 'invalid'
 
         else:
-            print(f"Invalid draw choice '{first_choice}' by player {self.player_id}.")
+            self._fault(f"Invalid draw choice '{first_choice}' by player {self.player_id}.")
             return 'invalid'
 
         second_choice = draw_choices[1]
@@ -152,7 +237,7 @@ class Player:
                 card = train_deck.draw_face_up(second_choice)
                 self.__add_cards([card], True)
             except IndexError:
-                print(f"Invalid face-up index '{second_choice}' by player {self.player_id}.")
+                self._fault(f"Invalid face-up index '{second_choice}' by player {self.player_id}.")
                 return 'invalid'
 
         elif second_choice == -1:
@@ -160,28 +245,28 @@ class Player:
                 card = train_deck.draw_face_down()
                 self.__add_cards([card], False)
             except Exception as e:
-                print(f"Face-down draw failed for player {self.player_id}: {e}")
+                self._fault(f"Face-down draw failed for player {self.player_id}: {e}")
                 return 'invalid'
 
         else:
-            print(f"Invalid draw choice '{second_choice}' by player {self.player_id}.")
+            self._fault(f"Invalid draw choice '{second_choice}' by player {self.player_id}.")
             return 'invalid'
 
         return 'success'
     
-    def __claim_available_route(self, l_fault: Optional[bool]) -> Route:
+    def __claim_available_route(self, l_fault: Optional[bool]) -> 'Steps[Route]':
         """Spend cards and claim a route chosen by the interface."""
         affordable_routes = self.get_affordable_routes()
-        route, l_count = self.__interface.choose_route_to_claim(affordable_routes)
+        route, l_count = yield Decision(self, "choose_route_to_claim", (affordable_routes,))
         if l_count > self.__train_hand.get("L", 0):
-            print(f"Player {self.name} doesn't have {l_count} locomotives to spend; try again.")
+            self._fault(f"Player {self.name} doesn't have {l_count} locomotives to spend; try again.")
             if not l_fault:
-                self.__claim_available_route(True)
+                yield from self.__claim_available_route(True)
             else:
                 l_count = 0
         affordable_routes = [r for (r, l) in affordable_routes if l <= l_count]
         if route not in affordable_routes:
-            print(f"Player {self.name} can't afford route {route} this turn; we've chosen {affordable_routes[0]} for you instead")
+            self._fault(f"Player {self.name} can't afford route {route} this turn; we've chosen {affordable_routes[0]} for you instead")
             route = affordable_routes[0]
         cards_to_spend = []
         if l_count >= route.length:
@@ -190,7 +275,7 @@ class Player:
             if route.color == "X":
                 color_options = [c for c in self.__train_hand.keys() if self.__train_hand.get(c, 0) >= (route.length - l_count) and c != 'L']
                 if len(color_options) >= 1:
-                    chosen_color = self.__interface.choose_color_to_spend(route, color_options)
+                    chosen_color = yield Decision(self, "choose_color_to_spend", (route, color_options))
                     # set color_to_spend to chosen_color if chosen_color is a valid color that they have enough of; otherwise set it to the one they have the most of
                     color_to_spend = chosen_color if self.__train_hand.get(chosen_color, 0) >= (route.length - l_count) else self.get_no_locomotives().most_common(1)[0][0]
                 else:
@@ -203,26 +288,33 @@ class Player:
             pass
         self._spend_cards(cards_to_spend)
         self.__claim_route(route)
+        if self.events.active:
+            self.events.emit(CLAIM, player_id=self.player_id, route=route, cards=cards_to_spend)
         return route
 
-    def __draw_destination_tickets(self) -> bool:
+    def __draw_destination_tickets(self) -> 'Steps[bool]':
         """Offer destination tickets and keep the chosen ones."""
         try:
             offer = self.context.ticket_deck.deal_unique(3)
         except Exception as e:
-            print(f"Ticket draw failed for player {self.player_id}: {e}")
+            self._fault(f"Ticket draw failed for player {self.player_id}: {e}")
             return False
 
         if not offer:
-            print(f"No destination tickets available for {self.player_id}.")
+            self._fault(f"No destination tickets available for {self.player_id}.")
             return False
 
-        kept = self.__interface.select_ticket_offer(offer)
+        kept = yield Decision(self, "select_ticket_offer", (offer,))
+        if self.events.active:
+            self.events.emit(TICKET_OFFER, player_id=self.player_id, offer=offer, kept=kept)
         if not kept:
-            print(f"{self.player_id} kept no tickets from offer.")
+            self._fault(f"{self.player_id} kept no tickets from offer.")
             return False
 
         self.__tickets.extend(kept)
+        self.version += 1
+        if self.score_keeper is not None:
+            self.score_keeper.tickets_added(self.player_id, kept)
         returned = [t for t in offer if t not in kept]
         self.context.ticket_deck.return_tickets(returned)
         return True
@@ -245,15 +337,26 @@ class Player:
 
     
 
+    def _fault(self, message: str) -> None:
+        """Report an invalid or impossible choice made on this player's behalf."""
+        if self.events.active:
+            self.events.emit(FAULT, player_id=self.player_id, message=message)
+
     def __add_cards(self, cards: List[str], exposed: bool) -> None:
         """Add drawn cards to the player's hand."""
         self.__train_hand.update(cards)
+        self.version += 1
         if exposed:
             self.exposed.update(cards)
+        if self._affordability is not None:
+            self._affordability.cards_changed(cards)
+        if self.events.active:
+            self.events.emit(DRAW, player_id=self.player_id, cards=cards, face_up=exposed)
 
     def _spend_cards(self, cards: List[str]) -> None:
         """Spend cards from the player's hand and discard them."""
         self.__train_hand.subtract(cards)
+        self.version += 1
         self.context.train_deck.discard(cards)
         self.exposed.subtract(cards)
         correction_list = []
@@ -262,10 +365,13 @@ class Player:
                 correction_list.append(k)
         for k in correction_list:
             self.exposed[k] = 0
+        if self._affordability is not None:
+            self._affordability.cards_changed(cards)
 
     def __claim_route(self, route: Route) -> None:
         """Mark a route as claimed and update train count."""
         self.trains_remaining -= route.length
+        self.version += 1
         self.context.map.claim_route(route, self.player_id)
 
     def __hand_counts(self) -> 'Counter[str]':
@@ -290,33 +396,39 @@ class Player:
 
     def get_affordable_routes(self) -> 'List[tuple[Route, int]]':
         """List routes this player can currently afford to claim."""
-        if not self.__train_hand.total(): # type: ignore
+        if not self.__train_hand.total() or self._affordability is None: # type: ignore
             return []
-        affordable_routes = []
-        available_routes = self.context.map.get_available_routes()
-        
-        for r in available_routes:
-            for n in range(0, self.__train_hand.get("L", 0) + 1):
-                # if the player has enough of the color in hand or if the color is gray and the player has enough of their most common color in hand
-                most_common_num = 0 if self.get_no_locomotives().total() == 0 else self.get_no_locomotives().most_common(1)[0][1] # type: ignore
-                if self.get_no_locomotives().get(r.color, 0) >= (r.length - n) or (r.color == "X" and most_common_num >= (r.length - n)):
-                    if r not in [r for (r, _) in affordable_routes]:
-                        affordable_routes.append((r, n))
-        return affordable_routes
+        return self._affordability.get_affordable_routes()
     
     def update_longest_path(self, new_route: Route):
         """Notify the map that this player claimed a new route."""
         self.context.map.update_longest_path(self.player_id, new_route)
-        my_longest_path = self.context.map.longest_paths[self.player_id]
-        has_longest_path = (self.context.map.longest_path_holder == self.player_id)
-
-    def check_ticket_completion(self):
-        """Update ticket completion status based on owned routes."""
-        path_info = self.context.map.paths[self.player_id]
-        for t in [t for t in self.__tickets if not t.is_completed]:
-            city_1_group = next((group for group in path_info if t.city1 in group), None)
-            if city_1_group != None and t.city2 in city_1_group:
+
+    @property
+    def has_longest_path(self) -> bool:
+        """Whether this player currently holds the longest-path bonus."""
+        context = getattr(self, "context", None)
+        return context is not None and context.map.longest_path_holder == self.player_id
+
+    def check_ticket_completion(self) -> List[DestinationTicket]:
+        """Update ticket completion status based on owned routes.
+
+        Returns the tickets that became completed by this check.
+        """
+        newly_completed = []
+        for t in self.__tickets:
+            if not t.is_completed and self.context.map.is_ticket_completed(self.player_id, t):
                 t.is_completed = True
+                newly_completed.append(t)
+        if newly_completed and self.score_keeper is not None:
+            self.score_keeper.tickets_completed(self.player_id, newly_completed)
+        return newly_completed
+
+    def get_tickets_completed_by(self, route: Route) -> List[DestinationTicket]:
+        """Tickets that claiming ``route`` would complete, without claiming it."""
+        return self.context.map.tickets_completed_by(
+            self.player_id, route, [t for t in self.__tickets if not t.is_completed]
+        )
 
     def __repr__(self) -> str:
         return (f"{self.__class__.__name__}(id={self.player_id}, trains={self.trains_remaining}, "
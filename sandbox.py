@@ -0,0 +1,502 @@
+"""Run bots in separate worker processes.
+
+:class:`SandboxedBot` is an :class:`Interface` that forwards every decision
+to a bot living in a worker process. Before each decision it sends the
+changes to that player's view of the game since the last one; the worker
+keeps a mirrored map, hand and context, so bots use the same
+``self.player`` helpers as in-process. A bot that raises, dies or stops
+answering only loses its own moves, which fall back to safe defaults,
+instead of taking down the run. Workers come from a persistent
+:class:`BotWorkerPool`, so process start-up is paid once, not per game.
+
+The two ends are reusable over other transports: :class:`ViewFeed`
+produces the engine-side messages and :class:`BotHost` answers them next
+to the bot (see ``server.py``).
+"""
+import atexit
+import importlib
+import multiprocessing
+import numbers
+import traceback
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from Interfaces.abstract_interface import Interface
+from context.board import BoardTemplate, load_board
+from context.card_tracker import CARD_COLORS, CardView
+from context.decks import DestinationTicket
+from context.latency import FALLBACKS
+from context.Map import MapGraph, Route
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# worker side
+# ────────────────────────────────────────────────────────────────────────────────
+class _DeckSize:
+    """Stands in for a deck in the mirrored context; only its size is known."""
+    __slots__ = ("size",)
+
+    def __init__(self):
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+
+class _CardCounts:
+    """Stands in for a :class:`CardTracker`; holds only what one player's view needs."""
+
+    def __init__(self):
+        self.version = 0
+        self.unseen = np.zeros(len(CARD_COLORS), dtype=np.int64)
+        self.hidden_counts: Dict[str, int] = {}
+
+    def unseen_by(self, player_id: str) -> np.ndarray:
+        return self.unseen.copy()
+
+    def hidden_count(self, player_id: str) -> int:
+        return self.hidden_counts[player_id]
+
+
+class _MirrorContext:
+    """Worker-side copy of a :class:`PlayerContext`, synced before every decision."""
+
+    def __init__(self, player_id: str, map_graph: MapGraph):
+        self.player_id = player_id
+        self.map = map_graph
+        self.train_deck = _DeckSize()
+        self.ticket_deck = _DeckSize()
+        self.face_up_cards: Tuple[str, ...] = ()
+        self.opponents: tuple = ()
+        self.turn_number = 0
+        self.score = 0
+        self.card_counts = _CardCounts()
+        self.cards = CardView(self.card_counts, player_id)
+
+
+class _MirrorPlayer:
+    """Worker-side stand-in for :class:`Player` with the helpers bots use."""
+
+    def __init__(self, player_id: str, board: BoardTemplate):
+        self.player_id = player_id
+        self.context = _MirrorContext(player_id, MapGraph(board))
+        self.tickets_by_index = [DestinationTicket(t.city1, t.city2, t.value) for t in board.tickets]
+        self.ticket_index = {id(t): i for i, t in enumerate(self.tickets_by_index)}
+        self.trains_remaining = 45
+        self.exposed: 'Counter[str]' = Counter()
+        self._hand: 'Counter[str]' = Counter()
+        self._tickets: List[DestinationTicket] = []
+        self._affordable: 'List[tuple[Route, int]]' = []
+
+    def sync(self, state: Dict[str, Any]) -> None:
+        """Apply the changes sent by :meth:`ViewFeed.state`."""
+        map_graph = self.context.map
+        for index, owner in state.get("claims", ()):
+            route = map_graph.routes[index]
+            map_graph.claim_route(route, owner)
+            map_graph.update_longest_path(owner, route)
+        if "hand" in state:
+            self._hand = Counter(state["hand"])
+            self.exposed = Counter(state["exposed"])
+            self.trains_remaining = state["trains"]
+            self._tickets = []
+            for index, completed in state["tickets"]:
+                ticket = self.tickets_by_index[index]
+                ticket.is_completed = completed
+                self._tickets.append(ticket)
+        if "affordable" in state:
+            self._affordable = [(map_graph.routes[index], l) for index, l in state["affordable"]]
+        if "opponents" in state:
+            self.context.opponents = state["opponents"]
+        if "cards" in state:
+            counts = self.context.card_counts
+            counts.unseen, counts.hidden_counts = np.array(state["cards"][0], dtype=np.int64), state["cards"][1]
+            counts.version += 1
+        context = self.context
+        face_up, context.turn_number, context.score, context.train_deck.size, context.ticket_deck.size = state["public"]
+        context.face_up_cards = tuple(face_up)
+
+    def get_context(self):
+        return self.context
+
+    def get_hand(self) -> 'Counter[str]':
+        return self._hand
+
+    def get_exposed(self) -> 'Counter[str]':
+        return self.exposed
+
+    def get_card_count(self) -> int:
+        return sum(self._hand.values())
+
+    def get_no_locomotives(self) -> 'Counter[str]':
+        no_locomotives = self._hand.copy()
+        no_locomotives.pop("L", None)
+        return no_locomotives
+
+    def get_tickets(self) -> List[DestinationTicket]:
+        return self._tickets
+
+    def get_affordable_routes(self) -> 'List[tuple[Route, int]]':
+        return self._affordable[:]
+
+    def get_tickets_completed_by(self, route: Route) -> List[DestinationTicket]:
+        return self.context.map.tickets_completed_by(
+            self.player_id, route, [t for t in self._tickets if not t.is_completed]
+        )
+
+
+def _decode_args(method: str, args: tuple, mirror: _MirrorPlayer) -> tuple:
+    """Turn route and ticket indices sent by the engine back into objects."""
+    routes = mirror.context.map.routes
+    if method == "choose_route_to_claim":
+        return ([(routes[index], l) for index, l in args[0]],)
+    if method == "choose_color_to_spend":
+        return (routes[args[0]], args[1])
+    if method == "select_ticket_offer":
+        return ([mirror.tickets_by_index[index] for index in args[0]],)
+    return args
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, numbers.Integral) and not isinstance(value, bool)
+
+
+def _encode_result(method: str, result: Any, mirror: _MirrorPlayer) -> Any:
+    """Replace routes and tickets in a decision by their indices."""
+    if method == "choose_route_to_claim":
+        route, l_count = result
+        return (route.index, int(l_count))
+    if method == "select_ticket_offer":
+        return [mirror.ticket_index[id(t)] for t in result]
+    return result
+
+
+class BotHost:
+    """Hosts one bot at a time next to its mirrored view of the game.
+
+    The host answers what a :class:`ViewFeed` sends: :meth:`start` seats
+    the bot for a new game and :meth:`call` applies a state update and
+    returns the bot's encoded decision.
+    """
+
+    def __init__(self):
+        self.bot: Any = None
+        self.mirror: Optional[_MirrorPlayer] = None
+
+    def start(self, player_id: str, board_paths: 'tuple[str, str]', rng, bot: Any = None) -> None:
+        """Seat ``bot`` (or the current bot again) as ``player_id`` in a new game."""
+        if bot is not None:
+            self.bot = bot
+        self.mirror = _MirrorPlayer(player_id, load_board(*board_paths))
+        self.bot.set_player(self.mirror)
+        self.bot.set_rng(rng)
+
+    def call(self, method: str, state: Dict[str, Any], args: tuple) -> Any:
+        """Sync the mirror with ``state`` and have the bot make one decision."""
+        mirror = self.mirror
+        mirror.sync(state)
+        result = getattr(self.bot, method)(*_decode_args(method, args, mirror))
+        return _encode_result(method, result, mirror)
+
+
+def _serve(conn) -> None:
+    """Worker loop: host one bot at a time and answer the engine's requests."""
+    host = BotHost()
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        kind = message[0]
+        if kind == "close":
+            return
+        try:
+            reply = None
+            if kind == "call":
+                _, method, state, args = message
+                reply = host.call(method, state, args)
+            else:
+                # "start" builds a new bot; "reset" keeps it for another game
+                _, (module, name), player_id, board_paths, rng = message
+                bot = getattr(importlib.import_module(module), name)() if kind == "start" else None
+                host.start(player_id, board_paths, rng, bot)
+            conn.send(("ok", reply))
+        except Exception:
+            conn.send(("error", traceback.format_exc()))
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# engine side
+# ────────────────────────────────────────────────────────────────────────────────
+class _Worker:
+    __slots__ = ("process", "conn")
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class BotWorkerPool:
+    """Persistent worker processes handed out to :class:`SandboxedBot` seats.
+
+    A worker is taken by a seat for one game and given back by
+    :meth:`SandboxedBot.close`; idle workers are reused by later games.
+    Workers that had to be killed are replaced on the next :meth:`acquire`.
+    """
+
+    def __init__(self):
+        self._ctx = multiprocessing.get_context()
+        self._idle: List[_Worker] = []
+        # processes started over the pool's lifetime
+        self.started = 0
+
+    def acquire(self) -> _Worker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.process.is_alive():
+                return worker
+            worker.kill()
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(target=_serve, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        self.started += 1
+        return _Worker(process, parent_conn)
+
+    def release(self, worker: _Worker) -> None:
+        if worker.process.is_alive():
+            self._idle.append(worker)
+        else:
+            worker.kill()
+
+    def discard(self, worker: _Worker) -> None:
+        worker.kill()
+
+    def close(self) -> None:
+        """Stop every idle worker."""
+        for worker in self._idle:
+            try:
+                worker.conn.send(("close",))
+                worker.process.join(1)
+            except OSError:
+                pass
+            worker.kill()
+        self._idle.clear()
+
+
+_default_pool: Optional[BotWorkerPool] = None
+
+
+def default_pool() -> BotWorkerPool:
+    """The process-wide pool, created on first use and closed at exit."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = BotWorkerPool()
+        atexit.register(_default_pool.close)
+    return _default_pool
+
+
+class ViewFeed:
+    """Engine-side producer of what a :class:`BotHost` needs from one seat.
+
+    :meth:`state` returns the changes to the player's view since the
+    previous call: claims from a map listener, and the hand, opponents and
+    card counts only when their version counters moved. Arguments and
+    results cross as route and ticket indices.
+    """
+
+    def __init__(self):
+        self.player: Any = None
+        self.map: Optional[MapGraph] = None
+        self._claims: 'List[tuple[int, str]]' = []
+        self._player_version = -1
+        self._opponents: Optional[tuple] = None
+        self._cards_version = -1
+
+    def attach(self, player) -> None:
+        """Follow ``player``'s current game, starting from a full state."""
+        self.detach()
+        self.player = player
+        self.map = map_graph = player.context.map
+        self._claims = [(r.index, r.claimed_by) for r in map_graph.routes if r.claimed_by is not None]
+        map_graph.add_claim_listener(self._on_claim)
+        self._player_version = -1
+        self._opponents = None
+        self._cards_version = -1
+
+    def detach(self) -> None:
+        """Stop following the game."""
+        if self.map is not None:
+            self.map.remove_claim_listener(self._on_claim)
+            self.map = None
+
+    def _on_claim(self, route: Route, player_id: str) -> None:
+        self._claims.append((route.index, player_id))
+
+    def state(self) -> Dict[str, Any]:
+        """Changes to this player's view since the previous decision."""
+        player = self.player
+        context = player.context
+        state: Dict[str, Any] = {"public": (context.face_up_cards, context.turn_number, context.score,
+                                            len(context.train_deck), len(context.ticket_deck))}
+        if self._claims:
+            state["claims"] = self._claims
+            self._claims = []
+        if player.version != self._player_version:
+            self._player_version = player.version
+            state["hand"] = dict(player.get_hand())
+            state["exposed"] = dict(player.get_exposed())
+            state["trains"] = player.trains_remaining
+            state["tickets"] = [(context.ticket_deck.index_of(t), t.is_completed) for t in player.get_tickets()]
+        if "hand" in state or "claims" in state:
+            state["affordable"] = [(r.index, l) for r, l in player.get_affordable_routes()]
+        opponents = context.opponents
+        if opponents is not self._opponents:
+            state["opponents"] = self._opponents = opponents
+        tracker = context.cards.tracker
+        if tracker.version != self._cards_version:
+            self._cards_version = tracker.version
+            state["cards"] = (context.cards.unseen().tolist(),
+                              {pid: tracker.hidden_count(pid) for pid in tracker.hidden})
+        return state
+
+    def encode_args(self, method: str, args: tuple) -> tuple:
+        """Replace routes and tickets in a decision's arguments by their indices."""
+        if method == "choose_route_to_claim":
+            return ([(r.index, l) for r, l in args[0]],)
+        if method == "choose_color_to_spend":
+            return (args[0].index, args[1])
+        if method == "select_ticket_offer":
+            ticket_deck = self.player.context.ticket_deck
+            return ([ticket_deck.index_of(t) for t in args[0]],)
+        return args
+
+    def decode_result(self, method: str, args: tuple, reply: Any) -> Any:
+        """Turn an encoded decision back into engine objects.
+
+        Raises ``ValueError`` if ``reply`` does not have the shape, types
+        or ranges the engine expects for ``method``.
+        """
+        if method == "choose_route_to_claim":
+            if not (isinstance(reply, (list, tuple)) and len(reply) == 2 and all(_is_int(x) for x in reply)
+                    and 0 <= reply[0] < len(self.map.routes) and reply[1] >= 0):
+                raise ValueError(f"expected [route index, locomotives], got {reply!r}")
+            return self.map.routes[reply[0]], int(reply[1])
+        if method == "select_ticket_offer":
+            if not (isinstance(reply, (list, tuple)) and all(_is_int(i) for i in reply)):
+                raise ValueError(f"expected a list of ticket indices, got {reply!r}")
+            ticket_deck = self.player.context.ticket_deck
+            offered = {ticket_deck.index_of(t): t for t in args[0]}
+            return [offered.pop(i) for i in reply if i in offered]
+        if method == "choose_color_to_spend":
+            if reply is not None and not isinstance(reply, str):
+                raise ValueError(f"expected a color, got {reply!r}")
+            return reply
+        if not _is_int(reply):
+            raise ValueError(f"expected an int, got {reply!r}")
+        if method == "choose_draw_train_action" and not -1 <= reply < len(self.player.context.face_up_cards):
+            raise ValueError(f"no face-up card {reply!r}")
+        return int(reply)
+
+
+class SandboxedBot(Interface):
+    def __init__(self, bot_class: type, pool: Optional[BotWorkerPool] = None, kill_after: Optional[float] = 10.0):
+        """Proxy running ``bot_class`` in a worker process.
+
+        A bot that has not answered after ``kill_after`` seconds is killed
+        (``None`` waits forever); it and a bot whose process dies make no
+        more decisions this game. A bot that raises only loses that
+        decision. Lost decisions use :data:`context.latency.FALLBACKS` and
+        are reported as faults. Call :meth:`close` after each game to give
+        the worker back to the pool.
+        """
+        super().__init__()
+        self.bot_class = bot_class
+        self.pool = pool if pool is not None else default_pool()
+        self.kill_after = kill_after
+        self._worker: Optional[_Worker] = None
+        self._started = False
+        self._dead = False
+        self._feed = ViewFeed()
+
+    def choose_turn_action(self):
+        return self._ask("choose_turn_action")
+
+    def choose_draw_train_action(self) -> int:
+        return self._ask("choose_draw_train_action")
+
+    def choose_route_to_claim(self, claimable_routes: 'List[tuple[Route,int]]') -> 'tuple[Route,int]':
+        return self._ask("choose_route_to_claim", claimable_routes)
+
+    def choose_color_to_spend(self, route: Route, color_options: List[str]) -> "str | None":
+        return self._ask("choose_color_to_spend", route, color_options)
+
+    def select_ticket_offer(self, offer) -> List[DestinationTicket]:
+        return self._ask("select_ticket_offer", offer)
+
+    def close(self) -> None:
+        """Detach from the finished game and return the worker to the pool."""
+        self._feed.detach()
+        if self._worker is not None:
+            self.pool.release(self._worker)
+            self._worker = None
+        self._started = False
+
+    # internals
+    def _fault(self, message: str) -> None:
+        self.player._fault(f"{self.player.name}: {message}")
+
+    def _request(self, message: tuple) -> 'tuple[str, Any]':
+        """Send one message to the worker and wait for its reply."""
+        worker = self._worker
+        try:
+            worker.conn.send(message)
+            if worker.conn.poll(self.kill_after):
+                return worker.conn.recv()
+            reason = f"no answer after {self.kill_after}s; the bot was stopped"
+        except (EOFError, OSError):
+            reason = "the bot's worker process died"
+        self.pool.discard(worker)
+        self._worker = None
+        self._dead = True
+        return "dead", reason
+
+    def _begin_game(self) -> None:
+        """Attach to a new game's map and (re)start the bot in a worker."""
+        self._feed.attach(self.player)
+        self._dead = False
+        if self._worker is None:
+            self._worker = self.pool.acquire()
+            self._started = False
+        board = self._feed.map.board
+        status, reply = self._request(("reset" if self._started else "start",
+                                       (self.bot_class.__module__, self.bot_class.__qualname__),
+                                       self.player.player_id, (board.map_path, board.tickets_path), self.rng))
+        self._started = status == "ok"
+        if status != "ok":
+            self._dead = True
+            self._fault(f"could not start: {reply.strip().splitlines()[-1]}")
+
+    def _ask(self, method: str, *args: Any) -> Any:
+        """Have the sandboxed bot make one decision, or fall back."""
+        feed = self._feed
+        if self.player.context.map is not feed.map:
+            self._begin_game()
+        if self._dead:
+            return FALLBACKS[method](*args)
+        status, reply = self._request(("call", method, feed.state(), feed.encode_args(method, args)))
+        if status == "ok":
+            try:
+                return feed.decode_result(method, args, reply)
+            except ValueError as e:
+                self._fault(f"{method} returned a bad answer: {e}")
+                return FALLBACKS[method](*args)
+        self._fault(f"{method} failed: {reply.strip().splitlines()[-1]}")
+        return FALLBACKS[method](*args)
@@ -0,0 +1,400 @@
+"""Play games against bots connected over the network.
+
+``python server.py serve`` runs a game server: bots connect, wait in a
+queue and are seated ``--players`` at a time; every game is an asyncio
+task, so one process runs as many concurrent games as there are bots to
+fill them, and a slow bot only holds up its own game. ``python server.py
+bot NAME`` connects one bot from the ``Interfaces`` package; it plays game
+after game until the server closes the connection.
+
+Messages are JSON objects, one per line:
+
+* bot → server ``{"type": "hello", "bot": ..., "name": ...}`` once, within
+  :data:`HELLO_TIMEOUT` seconds of connecting;
+* server → bot ``{"type": "start", "id", "player_id", "board", "rng"}`` before a
+  game's first decision, where ``board`` holds the map and ticket CSV paths
+  relative to the repository (bots only open files in its ``data`` folder) and ``rng`` the state of the seat's ``random.Random`` stream;
+* server → bot ``{"type": "call", "id", "method", "state", "args"}`` for every
+  decision, with ``state`` the changes to the player's view
+  (:meth:`sandbox.ViewFeed.state`) and routes and tickets as indices;
+* bot → server ``{"type": "result", "id", "value"}`` or ``{"type": "error", "id",
+  "message"}`` answering the message with the same ``id``;
+* server → bot ``{"type": "end", "player_id", "scores"}`` after each game.
+
+Decisions are timed against the seat's :class:`TimeBudget`: an answer that
+does not arrive in time is replaced by the fallback move and skipped when
+it comes in later. A bot whose connection drops plays fallbacks for the
+rest of its game.
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import random
+import sys
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from Game import Game
+from player import Player
+from Interfaces.abstract_interface import Interface
+from context.board import DATA_DIR
+from context.game_context import GameContext
+from context.GameLogger import GameLogger
+from context.latency import FALLBACKS, TimeBudget
+from context.Map import Route
+from context.decks import DestinationTicket
+from context.player_context import FrozenCounter, OpponentInfo
+from main import PLAYER_COLORS, load_bots
+from sandbox import BotHost, ViewFeed
+from tournament import round_result
+
+
+# seconds a new connection has to say hello before it is dropped
+HELLO_TIMEOUT = 10.0
+
+# board files inside the repository are sent relative to it
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _portable_path(path: str) -> str:
+    relative = os.path.relpath(path, _ROOT)
+    return path if relative.startswith(os.pardir) else relative.replace(os.sep, "/")
+
+
+def _jsonable(value: Any) -> Any:
+    # OpponentInfo and other dataclasses cross as plain objects
+    if dataclasses.is_dataclass(value):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class BotConnection:
+    """One connected bot, speaking the JSON-lines protocol of this module."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, name: str):
+        self.reader = reader
+        self.writer = writer
+        self.name = name
+        self.closed = False
+        self._last_id = 0
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        if self.closed:
+            return
+        try:
+            self.writer.write(json.dumps(message, default=_jsonable).encode() + b"\n")
+            await self.writer.drain()
+        except (ConnectionError, OSError):
+            self.closed = True
+
+    async def request(self, message: Dict[str, Any]) -> 'tuple[str, Any]':
+        """Send ``message`` and wait for its answer: ``("result", value)``, ``("error", text)`` or ``("dead", reason)``.
+
+        The message is written before the first ``await``, so a caller that
+        is cancelled (timed out) never leaves a request half sent; its late
+        answer is skipped by the next request.
+        """
+        if self.closed:
+            return "dead", "the bot disconnected"
+        self._last_id += 1
+        message["id"] = self._last_id
+        await self.send(message)
+        while not self.closed:
+            try:
+                line = await self.reader.readline()
+            except (ConnectionError, OSError):
+                line = b""
+            if not line:
+                self.closed = True
+                break
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                continue
+            if reply.get("id") != self._last_id:
+                continue
+            if reply.get("type") == "result":
+                return "result", reply.get("value")
+            return "error", str(reply.get("message", "unknown error"))
+        return "dead", "the bot disconnected"
+
+    def close(self) -> None:
+        self.closed = True
+        self.writer.close()
+
+
+class RemoteBot(Interface):
+    def __init__(self, connection: BotConnection):
+        """Seat played by a bot on the other end of ``connection``.
+
+        Every decision is a coroutine, so the game must be run with
+        :meth:`Game.play_async`. Errors cost only that decision; a dropped
+        connection makes every later decision of the game a fallback. Both
+        are reported as faults. Call :meth:`close` after each game.
+        """
+        super().__init__()
+        self.connection = connection
+        self._feed = ViewFeed()
+        self._dead = False
+
+    async def choose_turn_action(self):
+        return await self._ask("choose_turn_action")
+
+    async def choose_draw_train_action(self) -> int:
+        return await self._ask("choose_draw_train_action")
+
+    async def choose_route_to_claim(self, claimable_routes: 'List[tuple[Route,int]]') -> 'tuple[Route,int]':
+        return await self._ask("choose_route_to_claim", claimable_routes)
+
+    async def choose_color_to_spend(self, route: Route, color_options: List[str]) -> "str | None":
+        return await self._ask("choose_color_to_spend", route, color_options)
+
+    async def select_ticket_offer(self, offer) -> List[DestinationTicket]:
+        return await self._ask("select_ticket_offer", offer)
+
+    def close(self) -> None:
+        """Detach from the finished game."""
+        self._feed.detach()
+
+    # internals
+    def _fault(self, message: str) -> None:
+        self.player._fault(f"{self.player.name}: {message}")
+
+    async def _begin_game(self) -> None:
+        feed = self._feed
+        feed.attach(self.player)
+        board = feed.map.board
+        status, reply = await self.connection.request({
+            "type": "start", "player_id": self.player.player_id,
+            "board": [_portable_path(board.map_path), _portable_path(board.tickets_path)], "rng": self.rng.getstate(),
+        })
+        self._dead = status != "result"
+        if self._dead:
+            self._fault(f"could not start: {reply.strip().splitlines()[-1]}")
+
+    async def _ask(self, method: str, *args: Any) -> Any:
+        """Have the remote bot make one decision, or fall back."""
+        feed = self._feed
+        if self.player.context.map is not feed.map:
+            await self._begin_game()
+        if self._dead or self.connection.closed:
+            return FALLBACKS[method](*args)
+        status, reply = await self.connection.request({
+            "type": "call", "method": method, "state": feed.state(), "args": feed.encode_args(method, args),
+        })
+        if status == "result":
+            try:
+                return feed.decode_result(method, args, reply)
+            except ValueError as e:
+                self._fault(f"{method} returned a bad answer: {e}")
+                return FALLBACKS[method](*args)
+        self._dead = status == "dead"
+        self._fault(f"{method} failed: {reply.strip().splitlines()[-1]}")
+        return FALLBACKS[method](*args)
+
+
+async def play_game(connections: Sequence[BotConnection], seed: int, budget: Optional[TimeBudget] = None,
+                    map_path: Optional[str] = None, tickets_path: Optional[str] = None,
+                    keep_turns: bool = False) -> Dict:
+    """Play one seeded game between connected bots.
+
+    Returns the same dictionary as :func:`tournament.play_round`; each bot
+    is also sent the final scores.
+    """
+    players = [
+        Player(f"bot_{i}", RemoteBot(connection), f"{connection.name}_{i + 1}", PLAYER_COLORS[i], budget)
+        for i, connection in enumerate(connections)
+    ]
+    logger = GameLogger(players)
+    logger.add_round(seed)
+    context = GameContext([p.player_id for p in players], map_path, tickets_path, seed)
+    game = Game(context, players, logger, 0)
+    try:
+        await game.play_async()
+    finally:
+        for p in players:
+            p.get_interface().close()
+    result = round_result(seed, game, logger, keep_turns)
+    for p, connection in zip(players, connections):
+        await connection.send({"type": "end", "player_id": p.player_id, "scores": result["scores"]})
+    return result
+
+
+class GameServer:
+    """Seats connected bots in games, ``players`` at a time, as they become free.
+
+    Game ``i`` is seeded with ``seed_start + i``. Bots go back to the queue
+    after each game unless their connection dropped. With ``games`` the
+    server stops once that many games have been played.
+    """
+
+    def __init__(self, players: int = 2, games: Optional[int] = None, seed_start: int = 0,
+                 budget: Optional[TimeBudget] = None, map_path: Optional[str] = None,
+                 tickets_path: Optional[str] = None):
+        if not 1 <= players <= len(PLAYER_COLORS):
+            raise ValueError(f"A game needs 1-{len(PLAYER_COLORS)} players, got {players}")
+        self.players = players
+        self.games = games
+        self.seed_start = seed_start
+        self.budget = budget
+        self.map_path = map_path
+        self.tickets_path = tickets_path
+        self.results: List[Dict] = []
+        self._waiting: 'Optional[asyncio.Queue[BotConnection]]' = None
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 7777) -> None:
+        """Accept bots on ``host:port`` and play until ``games`` are done (forever without it)."""
+        self._waiting = asyncio.Queue()
+        server = await asyncio.start_server(self._accept, host, port)
+        async with server:
+            print(f"serving on {', '.join(str(s.getsockname()) for s in server.sockets)}", flush=True)
+            await self._matchmake()
+        while not self._waiting.empty():
+            self._waiting.get_nowait().close()
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            hello = json.loads(await asyncio.wait_for(reader.readline(), HELLO_TIMEOUT))
+        except (ValueError, ConnectionError, asyncio.TimeoutError):
+            hello = None
+        if not isinstance(hello, dict) or hello.get("type") != "hello":
+            writer.close()
+            return
+        await self._waiting.put(BotConnection(reader, writer, str(hello.get("name") or hello.get("bot") or "bot")))
+
+    async def _matchmake(self) -> None:
+        running = set()
+        started = 0
+        while self.games is None or started < self.games:
+            seats: List[BotConnection] = []
+            while len(seats) < self.players:
+                connection = await self._waiting.get()
+                if not connection.closed:
+                    seats.append(connection)
+            task = asyncio.create_task(self._play(seats, self.seed_start + started))
+            running.add(task)
+            task.add_done_callback(running.discard)
+            started += 1
+        await asyncio.gather(*running)
+
+    async def _play(self, seats: List[BotConnection], seed: int) -> None:
+        try:
+            result = await play_game(seats, seed, self.budget, self.map_path, self.tickets_path)
+            self.results.append(result)
+            print(json.dumps({"seed": seed, "players": [c.name for c in seats], "turns": result["turns"],
+                              "scores": result["scores"], "winners": result["winners"]}), flush=True)
+        except Exception:
+            traceback.print_exc()
+        for connection in seats:
+            if not connection.closed:
+                await self._waiting.put(connection)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# bot side
+# ────────────────────────────────────────────────────────────────────────────────
+def _decode_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild what JSON flattened in a state update."""
+    if "opponents" in state:
+        state["opponents"] = tuple(OpponentInfo(**dict(o, exposed_hand=FrozenCounter(o["exposed_hand"])))
+                                   for o in state["opponents"])
+    return state
+
+
+def _board_path(path: str) -> str:
+    """Resolve a board file named by the server, refusing anything outside the data folder."""
+    if not isinstance(path, str) or os.path.isabs(path):
+        raise ValueError(f"board file {path!r} must be relative to the repository")
+    resolved = (Path(_ROOT) / path).resolve()
+    try:
+        resolved.relative_to(DATA_DIR)
+    except ValueError:
+        raise ValueError(f"board file {path!r} is outside {DATA_DIR}") from None
+    return str(resolved)
+
+
+def _decode_rng(state: list) -> random.Random:
+    rng = random.Random()
+    version, internal, gauss_next = state
+    rng.setstate((version, tuple(internal), gauss_next))
+    return rng
+
+
+async def run_bot(bot_class: type, host: str = "127.0.0.1", port: int = 7777, name: Optional[str] = None) -> None:
+    """Connect ``bot_class`` to a :class:`GameServer` and play until it hangs up.
+
+    Each game gets a fresh instance of the bot.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    bot_host = BotHost()
+
+    async def send(message: Dict[str, Any]) -> None:
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+
+    try:
+        await send({"type": "hello", "bot": bot_class.__name__, "name": name or bot_class.__name__})
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            kind = message["type"]
+            if kind == "end":
+                continue
+            try:
+                if kind == "start":
+                    board_paths = tuple(_board_path(p) for p in message["board"])
+                    bot_host.start(message["player_id"], board_paths, _decode_rng(message["rng"]), bot_class())
+                    reply = {"type": "result", "id": message["id"], "value": None}
+                else:
+                    value = bot_host.call(message["method"], _decode_state(message["state"]), tuple(message["args"]))
+                    reply = {"type": "result", "id": message["id"], "value": value}
+            except Exception:
+                reply = {"type": "error", "id": message["id"], "message": traceback.format_exc()}
+            await send(reply)
+    except ConnectionError:
+        # the server went away
+        pass
+    writer.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point for the game server and remote bots."""
+    parser = argparse.ArgumentParser(description="Play Ticket to Ride games against bots connected over TCP.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run a game server")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    serve.add_argument("--port", type=int, default=7777, help="port to listen on")
+    serve.add_argument("--players", type=int, default=2, help="bots per game")
+    serve.add_argument("--games", type=int, default=0, help="stop after this many games (0: run forever)")
+    serve.add_argument("--seed", type=int, default=0, help="seed of the first game; game i uses seed + i")
+    serve.add_argument("--map", default=None, help="map CSV (default: bundled data/map.csv)")
+    serve.add_argument("--tickets", default=None, help="tickets CSV (default: bundled data/Destination_tickets.csv)")
+    serve.add_argument("--move-budget", type=float, default=2.0,
+                       help="seconds a bot may think per decision before its move is replaced (0: unlimited)")
+    serve.add_argument("--game-budget", type=float, default=0,
+                       help="seconds a bot may think over a whole game (0: unlimited)")
+    bot = commands.add_parser("bot", help="connect a bot from the Interfaces package")
+    bot.add_argument("bot", help="bot class name (e.g. RandomBot)")
+    bot.add_argument("--host", default="127.0.0.1", help="server address")
+    bot.add_argument("--port", type=int, default=7777, help="server port")
+    bot.add_argument("--name", default=None, help="name shown in results (default: the class name)")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        server = GameServer(args.players, args.games or None, args.seed,
+                            TimeBudget(args.move_budget or None, args.game_budget or None), args.map, args.tickets)
+        asyncio.run(server.serve(args.host, args.port))
+    else:
+        bots = load_bots()
+        if args.bot not in bots:
+            sys.exit(f"Unknown bot {args.bot}; available: {sorted(bots)}")
+        asyncio.run(run_bot(bots[args.bot], args.host, args.port, args.name))
+
+
+if __name__ == "__main__":
+    main()
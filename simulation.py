@@ -0,0 +1,504 @@
+import random
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+
+from context.scoring import ROUTE_SCORES, LONGEST_PATH_BONUS
+from context.board import BoardTemplate
+from context.decks import TrainCardDeck, _count_non_locomotives
+from context.longest_path import longest_trail
+if TYPE_CHECKING:
+    from Game import Game
+    from player import Player
+
+CARD_COLORS = tuple(TrainCardDeck.COLOR_COUNTS)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Actions – one complete turn each
+# ────────────────────────────────────────────────────────────────────────────────
+class DrawCards(NamedTuple):
+    """Draw two train cards; each choice is a face-up index or ``-1`` for the deck."""
+    first: int
+    second: int
+
+
+class ClaimRoute(NamedTuple):
+    """Claim a route (by ``Route.index``) paying ``locomotives`` plus ``color`` cards."""
+    route: int
+    color: Optional[str]
+    locomotives: int
+
+
+class DrawTickets(NamedTuple):
+    """Draw three destination tickets and keep the given offer positions."""
+    keep: Tuple[int, ...]
+
+
+class Pass(NamedTuple):
+    """Nothing else is possible this turn."""
+
+
+Action = Union[DrawCards, ClaimRoute, DrawTickets, Pass]
+
+# every draw for each market size, and every non-empty subset of a ticket offer
+_DRAWS = tuple(tuple(DrawCards(a, b) for a in range(-1, k) for b in range(-1, k)) for k in range(6))
+_TICKET_ACTIONS = tuple(DrawTickets(keep) for keep in ((0,), (1,), (2,), (0, 1), (0, 2), (1, 2), (0, 1, 2)))
+_PAYING_COLORS = tuple(card for card in CARD_COLORS if card != "L")
+
+
+@lru_cache(maxsize=None)
+def _route_buckets(board: BoardTemplate) -> 'Tuple[tuple[tuple[str, int], Tuple[int, ...]], ...]':
+    """Route indices of a board grouped by ``(color, length)``."""
+    buckets: 'Dict[tuple[str, int], List[int]]' = {}
+    for i, spec in enumerate(board.routes):
+        buckets.setdefault((spec.color, spec.length), []).append(i)
+    return tuple((key, tuple(routes)) for key, routes in buckets.items())
+
+
+class _SimPlayer:
+    """Per-seat state of a :class:`SimState`."""
+    __slots__ = ("player_id", "hand", "exposed", "trains", "tickets", "completed",
+                 "routes", "parent", "route_points", "longest")
+
+    def __init__(self, player_id: str, num_cities: int):
+        self.player_id = player_id
+        self.hand: Dict[str, int] = dict.fromkeys(CARD_COLORS, 0)
+        self.exposed: Dict[str, int] = dict.fromkeys(CARD_COLORS, 0)
+        self.trains = 45
+        # ticket indices into board.tickets and their completion flags
+        self.tickets: List[int] = []
+        self.completed: List[bool] = []
+        self.routes: List[int] = []
+        # union-find parent of each city id over the player's routes
+        self.parent: List[int] = list(range(num_cities))
+        self.route_points = 0
+        self.longest = 0
+
+    def copy(self) -> '_SimPlayer':
+        other = _SimPlayer.__new__(_SimPlayer)
+        other.player_id = self.player_id
+        other.hand = self.hand.copy()
+        other.exposed = self.exposed.copy()
+        other.trains = self.trains
+        other.tickets = self.tickets[:]
+        other.completed = self.completed[:]
+        other.routes = self.routes[:]
+        other.parent = self.parent[:]
+        other.route_points = self.route_points
+        other.longest = self.longest
+        return other
+
+    def find(self, city: int) -> int:
+        parent = self.parent
+        while parent[city] != city:
+            parent[city] = parent[parent[city]]
+            city = parent[city]
+        return city
+
+    def hidden_count(self) -> int:
+        return sum(self.hand.values()) - sum(self.exposed.values())
+
+
+class SimState:
+    """Lightweight copy of a game for lookahead search.
+
+    Holds only plain lists and dicts (no bots, no map objects), follows the
+    same rules as :class:`Game`, :class:`player.Player` and
+    :class:`context.decks.TrainCardDeck`, and supports both :meth:`apply` /
+    :meth:`undo` and a cheap :meth:`clone`.
+
+    A state built for one player with :meth:`from_player` only uses what that
+    player can see; the deck order, the opponents' hidden cards and the
+    opponents' tickets are sampled, and :meth:`clone` draws a fresh sample of
+    them every time it is given an ``rng``.
+    """
+
+    def __init__(self, board: BoardTemplate, player_ids: Sequence[str], rng: Optional[random.Random] = None,
+                 perspective: Optional[int] = None):
+        """Empty state; use :meth:`from_game` or :meth:`from_player` instead."""
+        self.board = board
+        self.rng = rng if rng is not None else random.Random()
+        # seat whose information is known, or None for a fully observed state
+        self.perspective = perspective
+        n = len(board.city_names)
+        self.players: List[_SimPlayer] = [_SimPlayer(pid, n) for pid in player_ids]
+        self.turn = 0
+        self.deck: List[str] = []
+        self.face_up: List[str] = []
+        self.discard: List[str] = []
+        self.ticket_stack: List[int] = []
+        # owner seat per route, -1 = unclaimed
+        self.owner: List[int] = [-1] * len(board.routes)
+        self.longest_holder = -1
+        self._ticket_ends = [(board.city_ids[t.city1], board.city_ids[t.city2]) for t in board.tickets]
+        self._undo: List[tuple] = []
+
+    # ── construction ────────────────────────────────────────────────────────────
+    @classmethod
+    def from_game(cls, game: 'Game', rng: Optional[random.Random] = None) -> 'SimState':
+        """Exact copy of a running game, hidden information included."""
+        context = game.context
+        deck, tickets = context.train_deck, context.ticket_deck
+        state = cls(context.board, [p.player_id for p in game.players], rng)
+        state.turn = game.turn_index
+        state.deck = deck.get_draw_pile()
+        state.face_up = deck.get_face_up()
+        state.discard = deck.get_discard_pile()
+        state.ticket_stack = [tickets.index_of(t) for t in tickets._stack]
+        for seat, p in enumerate(game.players):
+            sp = state.players[seat]
+            sp.hand.update(+p.get_hand())
+            sp.exposed.update(+p.get_exposed())
+            sp.trains = p.trains_remaining
+            sp.tickets = [tickets.index_of(t) for t in p.get_tickets()]
+            sp.completed = [t.is_completed for t in p.get_tickets()]
+        state._copy_map(context.map_graph)
+        return state
+
+    @classmethod
+    def from_player(cls, player: 'Player', rng: Optional[random.Random] = None) -> 'SimState':
+        """State as seen by ``player`` during its own turn, hidden information sampled.
+
+        Only the player's own hand and tickets, the market, the discard pile,
+        the board and the opponents' public information are used.
+        """
+        context = player.context
+        opponents = context.opponents
+        seat = context.turn_number % (len(opponents) + 1)
+        ids = [o.player_id for o in opponents]
+        ids.insert(seat, player.player_id)
+
+        state = cls(context.map.board, ids, rng, perspective=seat)
+        state.turn = context.turn_number
+        state.face_up = list(context.face_up_cards)
+        state.discard = context.train_deck.get_discard_pile()
+
+        me = state.players[seat]
+        me.hand.update(+player.get_hand())
+        me.exposed.update(+player.get_exposed())
+        me.trains = player.trains_remaining
+        me.tickets = [context.ticket_deck.index_of(t) for t in player.get_tickets()]
+        me.completed = [t.is_completed for t in player.get_tickets()]
+
+        # cards we cannot see: the deck and the opponents' hidden cards
+        unseen = dict(zip(CARD_COLORS, context.cards.unseen().tolist()))
+        unknown_tickets = list(range(len(state.board.tickets)))
+        for t in me.tickets:
+            unknown_tickets.remove(t)
+
+        for info in opponents:
+            sp = state.players[ids.index(info.player_id)]
+            sp.exposed.update(+info.exposed_hand)
+            sp.hand.update(+info.exposed_hand)
+            sp.trains = info.remaining_trains
+            sp.tickets = unknown_tickets[:info.destination_ticket_count]
+            sp.completed = [False] * info.destination_ticket_count
+            del unknown_tickets[:info.destination_ticket_count]
+
+        # deal the opponents' hidden cards from the unseen pool; resample()
+        # below shuffles pool and deal properly
+        state.deck = [card for card, count in unseen.items() for _ in range(count)]
+        for info in opponents:
+            sp = state.players[ids.index(info.player_id)]
+            for _ in range(info.num_cards_in_hand - sum(sp.exposed.values())):
+                sp.hand[state.deck.pop()] += 1
+        state.ticket_stack = unknown_tickets
+        state._copy_map(context.map)
+        state.resample()
+        return state
+
+    def _copy_map(self, map_graph) -> None:
+        """Copy route ownership and longest-path tracking from a live map."""
+        seats = {sp.player_id: seat for seat, sp in enumerate(self.players)}
+        for i in range(len(self.owner)):
+            owner = map_graph.route_owner(i)
+            if owner is not None:
+                seat = seats[owner]
+                self.owner[i] = seat
+                sp = self.players[seat]
+                spec = self.board.routes[i]
+                sp.routes.append(i)
+                sp.route_points += ROUTE_SCORES[spec.length]
+                a, b = sp.find(spec.city1_id), sp.find(spec.city2_id)
+                if a != b:
+                    sp.parent[a] = b
+        for seat, sp in enumerate(self.players):
+            sp.longest = map_graph.longest_paths.get(sp.player_id, 0)
+        self.longest_holder = seats.get(map_graph.longest_path_holder, -1)
+
+    # ── hidden information ─────────────────────────────────────────────────────
+    def resample(self) -> None:
+        """Redeal everything the perspective player cannot see.
+
+        The deck order, the opponents' hidden cards and the opponents'
+        tickets are shuffled together with the matching unseen pool; sizes
+        and all public information stay the same. Does nothing for a fully
+        observed state.
+        """
+        if self.perspective is None:
+            return
+        rng = self.rng
+        opponents = [sp for seat, sp in enumerate(self.players) if seat != self.perspective]
+
+        cards = self.deck[:]
+        hidden = []
+        for sp in opponents:
+            count = sp.hidden_count()
+            hidden.append(count)
+            for card in CARD_COLORS:
+                cards.extend([card] * (sp.hand[card] - sp.exposed[card]))
+        rng.shuffle(cards)
+        for sp, count in zip(opponents, hidden):
+            sp.hand = sp.exposed.copy()
+            for card in cards[len(cards) - count:]:
+                sp.hand[card] += 1
+            del cards[len(cards) - count:]
+        self.deck = cards
+
+        tickets = self.ticket_stack[:]
+        for sp in opponents:
+            tickets.extend(sp.tickets)
+        rng.shuffle(tickets)
+        for sp in opponents:
+            count = len(sp.tickets)
+            sp.tickets = tickets[len(tickets) - count:]
+            del tickets[len(tickets) - count:]
+            sp.completed = [sp.find(a) == sp.find(b) for a, b in (self._ticket_ends[t] for t in sp.tickets)]
+        self.ticket_stack = tickets
+
+    def clone(self, rng: Optional[random.Random] = None) -> 'SimState':
+        """Independent copy of the state (without undo history).
+
+        With an ``rng`` the copy uses it for its own shuffles and, for states
+        built from one player's view, redeals the hidden information.
+        """
+        other = SimState.__new__(SimState)
+        other.board = self.board
+        other.rng = rng if rng is not None else self.rng
+        other.perspective = self.perspective
+        other.players = [sp.copy() for sp in self.players]
+        other.turn = self.turn
+        other.deck = self.deck[:]
+        other.face_up = self.face_up[:]
+        other.discard = self.discard[:]
+        other.ticket_stack = self.ticket_stack[:]
+        other.owner = self.owner[:]
+        other.longest_holder = self.longest_holder
+        other._ticket_ends = self._ticket_ends
+        other._undo = []
+        if rng is not None:
+            other.resample()
+        return other
+
+    # ── queries ────────────────────────────────────────────────────────────────
+    @property
+    def current(self) -> int:
+        """Seat of the player to move."""
+        return self.turn % len(self.players)
+
+    @property
+    def current_player_id(self) -> str:
+        return self.players[self.current].player_id
+
+    def is_terminal(self) -> bool:
+        """Same end condition as :meth:`Game._is_game_over`."""
+        return any(sp.trains <= 2 for sp in self.players)
+
+    def score(self, seat: int, final: Optional[bool] = None) -> int:
+        """Score of a seat as computed by :meth:`Game._score_game`.
+
+        Incomplete tickets are subtracted when ``final`` is set, which
+        defaults to whether the game is over.
+        """
+        if final is None:
+            final = self.is_terminal()
+        sp = self.players[seat]
+        score = sp.route_points + LONGEST_PATH_BONUS * (self.longest_holder == seat)
+        for t, done in zip(sp.tickets, sp.completed):
+            value = self.board.tickets[t].value
+            if done:
+                score += value
+            elif final:
+                score -= value
+        return score
+
+    def scores(self, final: Optional[bool] = None) -> Dict[str, int]:
+        """Scores of every player, keyed by player id."""
+        return {sp.player_id: self.score(seat, final) for seat, sp in enumerate(self.players)}
+
+    def can_draw_cards(self) -> bool:
+        """Whether the deck (after the start-of-turn reshuffle) still holds two cards."""
+        return len(self.deck) >= 2 or len(self.discard) >= 2
+
+    def claim_options(self, seat: Optional[int] = None) -> List[ClaimRoute]:
+        """Affordable claims in route order, paying as few locomotives as possible.
+
+        Gray routes get one option per color that can pay for them.
+        """
+        hand = self.players[self.current if seat is None else seat].hand
+        locos = hand["L"]
+        best = max(n for card, n in hand.items() if card != "L")
+        owner = self.owner
+        options = []
+        # the payment only depends on a route's color and length
+        for (color, length), routes in _route_buckets(self.board):
+            need = max(0, length - (best if color == "X" else hand[color]))
+            if need > locos:
+                continue
+            if need >= length:
+                payments = [(None, length)]
+            elif color == "X":
+                payments = [(card, need) for card in _PAYING_COLORS if hand[card] >= length - need]
+            else:
+                payments = [(color, need)]
+            for i in routes:
+                if owner[i] < 0:
+                    options.extend(ClaimRoute(i, card, n) for card, n in payments)
+        options.sort(key=itemgetter(0))
+        return options
+
+    def legal_actions(self) -> List[Action]:
+        """Every distinct turn the player to move can take."""
+        actions: List[Action] = []
+        if self.can_draw_cards():
+            actions.extend(_DRAWS[len(self.face_up)])
+        actions.extend(self.claim_options())
+        if len(self.ticket_stack) >= 3:
+            actions.extend(_TICKET_ACTIONS)
+        return actions or [Pass()]
+
+    # ── transitions ────────────────────────────────────────────────────────────
+    def apply(self, action: Action) -> None:
+        """Play one turn for the player to move; reversible with :meth:`undo`."""
+        seat = self.current
+        sp = self.players[seat]
+        self._undo.append((seat, sp.copy(), self.turn, self.deck[:], self.face_up[:], self.discard[:],
+                           self.ticket_stack[:], list(self.owner) if isinstance(action, ClaimRoute) else None,
+                           self.longest_holder))
+        self._play(seat, sp, action)
+
+    def _play(self, seat: int, sp: _SimPlayer, action: Action) -> None:
+        """Play one turn without recording it for :meth:`undo`."""
+        # start-of-turn refill, as in Player.take_turn
+        if len(self.deck) < 2:
+            self._reshuffle_discard()
+
+        if isinstance(action, DrawCards):
+            self._draw_cards(sp, action.first, action.second)
+        elif isinstance(action, ClaimRoute):
+            self._claim(seat, sp, action)
+        elif isinstance(action, DrawTickets):
+            self._draw_tickets(sp, action.keep)
+        self.turn += 1
+
+    def undo(self) -> None:
+        """Revert the most recent :meth:`apply` (the random stream is not rewound)."""
+        seat, sp, self.turn, self.deck, self.face_up, self.discard, self.ticket_stack, owner, \
+            self.longest_holder = self._undo.pop()
+        self.players[seat] = sp
+        if owner is not None:
+            self.owner = owner
+
+    def playout(self, policy: 'Optional[Callable[[SimState], Action]]' = None,
+                max_turns: Optional[int] = None) -> Dict[str, int]:
+        """Play until the game ends and return the final scores.
+
+        ``policy`` picks each action (uniformly random legal actions by
+        default); ``max_turns`` stops early, in which case scores are not final.
+        """
+        turns = 0
+        while not self.is_terminal() and (max_turns is None or turns < max_turns):
+            action = policy(self) if policy is not None else self.rng.choice(self.legal_actions())
+            self._play(self.current, self.players[self.current], action)
+            turns += 1
+        self._undo.clear()
+        return self.scores()
+
+    # ── rules, mirroring TrainCardDeck and Player ─────────────────────────────
+    def _reshuffle_discard(self) -> None:
+        if not self.discard:
+            return
+        self.deck = self.discard[:]
+        self.rng.shuffle(self.deck)
+        self.discard.clear()
+
+    def _refill_face_up(self) -> None:
+        face_up = self.face_up
+        while len(face_up) < 5:
+            if not self.deck:
+                self._reshuffle_discard()
+            if not self.deck:
+                break
+            face_up.append(self.deck.pop())
+            if face_up.count("L") >= 3 and _count_non_locomotives(self.deck, self.discard, face_up) >= 3:
+                self.discard.extend(face_up)
+                face_up.clear()
+
+    def _take_face_up(self, sp: _SimPlayer, idx: int) -> None:
+        card = self.face_up.pop(idx)
+        self._refill_face_up()
+        sp.hand[card] += 1
+        sp.exposed[card] += 1
+
+    def _draw_cards(self, sp: _SimPlayer, first: int, second: int) -> None:
+        face_up = self.face_up
+        # taking a face-up locomotive ends the draw
+        for c in (first, second):
+            if 0 <= c < len(face_up) and face_up[c] == "L":
+                self._take_face_up(sp, c)
+                return
+        for c in (first, second):
+            if c >= 0:
+                if c >= len(self.face_up):
+                    return
+                self._take_face_up(sp, c)
+            else:
+                if not self.deck:
+                    self._reshuffle_discard()
+                if not self.deck:
+                    return
+                sp.hand[self.deck.pop()] += 1
+
+    def _claim(self, seat: int, sp: _SimPlayer, action: ClaimRoute) -> None:
+        spec = self.board.routes[action.route]
+        locos = min(action.locomotives, spec.length)
+        spent = [action.color] * (spec.length - locos) + ["L"] * locos
+        for card in spent:
+            sp.hand[card] -= 1
+            if sp.exposed[card] > 0:
+                sp.exposed[card] -= 1
+        self.discard.extend(spent)
+        sp.trains -= spec.length
+
+        self.owner[action.route] = seat
+        sp.routes.append(action.route)
+        sp.route_points += ROUTE_SCORES[spec.length]
+        a, b = sp.find(spec.city1_id), sp.find(spec.city2_id)
+        if a != b:
+            sp.parent[a] = b
+
+        # only the component holding the new route can have grown
+        root = sp.find(spec.city1_id)
+        component = [self.board.routes[i] for i in sp.routes if sp.find(self.board.routes[i].city1_id) == root]
+        sp.longest = max(sp.longest, longest_trail(component))
+        holder_len = self.players[self.longest_holder].longest if self.longest_holder >= 0 else 0
+        if sp.longest > holder_len:
+            self.longest_holder = seat
+
+        for i, t in enumerate(sp.tickets):
+            if not sp.completed[i]:
+                a, b = self._ticket_ends[t]
+                sp.completed[i] = sp.find(a) == sp.find(b)
+
+    def _draw_tickets(self, sp: _SimPlayer, keep: Sequence[int]) -> None:
+        offer = self.ticket_stack[:3]
+        del self.ticket_stack[:3]
+        for i in keep:
+            sp.tickets.append(offer[i])
+            sp.completed.append(False)
+        self.ticket_stack.extend(t for i, t in enumerate(offer) if i not in keep)
+        self.rng.shuffle(self.ticket_stack)
+
+    def __repr__(self) -> str:
+        return f"SimState(turn={self.turn}, players={[sp.player_id for sp in self.players]})"
@@ -0,0 +1,11 @@
+"""The batched RandomBot rules against the reference engine."""
+import pytest
+
+from batch_simulation import check_against_engine
+
+
+@pytest.mark.parametrize("num_players", [2, 3, 4])
+def test_batch_matches_engine(num_players):
+    checked, mismatches = check_against_engine(range(4), num_players)
+    assert checked > 0
+    assert mismatches == 0
@@ -0,0 +1,104 @@
+"""The card tracker against the real draw pile, discard pile, market and hands."""
+import random
+
+import numpy as np
+
+from Game import Game
+from player import Player
+from Interfaces.random_bot import RandomBot
+from context.affordability import AffordabilityIndex
+from context.card_tracker import CARD_COLORS
+from context.events import DRAW, RESHUFFLE, TURN_END
+from context.game_context import GameContext
+from context.GameLogger import GameLogger
+from simulation import SimState
+
+COLORS = ["red", "blue", "green", "yellow"]
+
+
+def _vector(counts) -> np.ndarray:
+    return np.array([counts.get(c, 0) for c in CARD_COLORS], dtype=np.int64)
+
+
+def _new_game(seed: int, n_players: int):
+    players = [Player(f"bot_{i}", RandomBot(), f"R{i}", COLORS[i]) for i in range(n_players)]
+    logger = GameLogger(players)
+    logger.add_round(seed)
+    context = GameContext([p.player_id for p in players], seed=seed)
+    return Game(context, players, logger, 0), context, players
+
+
+def _check(context: GameContext, players) -> None:
+    tracker = context.get_card_tracker(players)
+    deck = context.train_deck
+    hidden = {p.player_id: _vector(p.get_hand() - p.get_exposed()) for p in players}
+    unseen = _vector({c: deck.get_draw_pile().count(c) for c in CARD_COLORS}) + sum(hidden.values())
+    assert tracker.unseen.tolist() == unseen.tolist()
+    assert tracker.market.tolist() == _vector({c: deck.get_face_up().count(c) for c in CARD_COLORS}).tolist()
+    assert tracker.discard.tolist() == _vector({c: deck.get_discard_pile().count(c) for c in CARD_COLORS}).tolist()
+    for p in players:
+        assert tracker.hidden[p.player_id].tolist() == hidden[p.player_id].tolist()
+        assert tracker.exposed[p.player_id].tolist() == _vector(p.get_exposed()).tolist()
+
+
+def test_tracker_matches_cards_through_reshuffles():
+    dropped = 0
+    for seed in range(30):
+        game, context, players = _new_game(seed, 3 + seed % 2)
+        context.get_card_tracker(players)
+        drops = []
+        context.events.subscribe(lambda event, data: drops.append(len(data["dropped"])), [RESHUFFLE])
+        context.events.subscribe(lambda event, data: _check(context, players), [TURN_END])
+        game.play()
+        _check(context, players)
+        dropped += sum(drops)
+    # the games must cover reshuffles that leave cards in the deck
+    assert dropped > 0
+
+
+def test_tracker_started_mid_game():
+    for seed in range(5):
+        game, context, players = _new_game(seed, 4)
+
+        def on_turn_end(event, data):
+            if data["turn"] >= 40:
+                _check(context, players)
+
+        context.events.subscribe(on_turn_end, [TURN_END])
+        game.play()
+        _check(context, players)
+
+
+def test_sampled_deck_matches_real_deck():
+    game, context, players = _new_game(3, 4)
+
+    def on_turn_end(event, data):
+        player = players[data["turn"] % len(players)]
+        state = SimState.from_player(player, random.Random(data["turn"]))
+        assert len(state.deck) == len(context.train_deck)
+
+    context.events.subscribe(on_turn_end, [TURN_END])
+    game.play()
+
+
+def test_events_idle_without_card_readers():
+    game, context, players = _new_game(0, 2)
+    game.play()
+    assert not context.events.active
+    assert context._card_tracker is None
+
+
+def test_draw_event_sees_updated_player():
+    game, context, players = _new_game(1, 3)
+    by_id = {p.player_id: p for p in players}
+
+    def on_draw(event, data):
+        player = by_id[data["player_id"]]
+        if data["face_up"]:
+            assert all(player.get_exposed()[c] > 0 for c in data["cards"])
+        fresh = AffordabilityIndex(context.map_graph, player.get_hand())
+        assert player.get_affordable_routes() == fresh.get_affordable_routes()
+        fresh.detach()
+
+    context.events.subscribe(on_draw, [DRAW])
+    game.play()
@@ -0,0 +1,24 @@
+"""Claim tracking on the map graph."""
+import pytest
+
+from Game import Game
+from player import Player
+from Interfaces.random_bot import RandomBot
+from context.game_context import GameContext
+from context.GameLogger import GameLogger
+
+
+def test_paths_match_connected_groups():
+    players = [Player(f"bot_{i}", RandomBot(), f"R{i}", color) for i, color in enumerate(["red", "blue"])]
+    logger = GameLogger(players)
+    logger.add_round(7)
+    context = GameContext([p.player_id for p in players], seed=7)
+    Game(context, players, logger, 0).play()
+    graph = context.map_graph
+    paths = graph.paths
+    assert set(paths) == {p.player_id for p in players}
+    for player_id, groups in paths.items():
+        assert sorted(map(sorted, (cities for cities, _ in groups))) == sorted(map(sorted, graph.get_connected_groups(player_id)))
+        assert max(length for _, length in groups) == graph.longest_paths[player_id]
+    with pytest.raises(AttributeError):
+        graph.paths = {}
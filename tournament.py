@@ -0,0 +1,191 @@
+import argparse
+import contextlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Sequence
+
+from player import Player
+from Game import Game
+from context.game_context import GameContext
+from context.GameLogger import GameLogger
+from context.latency import TimeBudget, merge_summaries
+from main import load_bots, PLAYER_COLORS
+from sandbox import SandboxedBot
+
+
+# bot classes are looked up once per worker process
+_BOTS: Optional[dict] = None
+
+
+def _get_bots() -> dict:
+    """Return the bot registry, loading it on first use in this process."""
+    global _BOTS
+    if _BOTS is None:
+        _BOTS = load_bots()
+    return _BOTS
+
+
+def build_players(lineup: Sequence[str], budget: Optional[TimeBudget] = None,
+                  sandbox: bool = False) -> List[Player]:
+    """Instantiate one :class:`Player` per bot name in ``lineup``.
+
+    With ``sandbox`` each bot runs in a worker process behind a
+    :class:`sandbox.SandboxedBot`.
+    """
+    bots = _get_bots()
+    unknown = [name for name in lineup if name not in bots]
+    if unknown:
+        raise ValueError(f"Unknown bot(s) {unknown}; available: {sorted(bots)}")
+    if not 1 <= len(lineup) <= len(PLAYER_COLORS):
+        raise ValueError(f"A lineup needs 1-{len(PLAYER_COLORS)} bots, got {len(lineup)}")
+    return [
+        Player(f"bot_{i}", SandboxedBot(bots[name]) if sandbox else bots[name](),
+               f"{name}_{i + 1}", PLAYER_COLORS[i], budget)
+        for i, name in enumerate(lineup)
+    ]
+
+
+def play_round(lineup: Sequence[str], seed: int, keep_turns: bool = False,
+               map_path: Optional[str] = None, tickets_path: Optional[str] = None,
+               budget: Optional[TimeBudget] = None, sandbox: bool = False) -> Dict:
+    """Play one seeded game without any console interaction.
+
+    ``seed`` is the game's master seed, so the same lineup and seed always
+    replay the same game.
+
+    Returns a picklable dictionary holding the final scores, the per-turn score
+    trace used for the match averages and, if ``keep_turns`` is set, the full
+    round log in the :class:`GameLogger` format. Each bot's decisions are
+    timed against ``budget`` and the latency record is returned as well.
+    With ``sandbox`` the bots run in this process's pool of bot workers.
+    """
+    # bots that still draw from the random module get a per-game seed as well
+    random.seed(seed)
+    players = build_players(lineup, budget, sandbox)
+    logger = GameLogger(players)
+    logger.add_round(seed)
+
+    try:
+        context = GameContext([p.player_id for p in players], map_path, tickets_path, seed)
+        game = Game(context, players, logger, 0)
+        # engine events go unobserved here; this only silences bots that print
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            game.play()
+    finally:
+        if sandbox:
+            for p in players:
+                p.get_interface().close()
+    return round_result(seed, game, logger, keep_turns)
+
+
+def round_result(seed: int, game: Game, logger: GameLogger, keep_turns: bool = False) -> Dict:
+    """The :func:`play_round` dictionary of a finished single-round game."""
+    scores = dict(game.context.scores)
+    best = max(scores.values())
+    return {
+        "seed": seed,
+        "turns": game.turn_index,
+        "scores": scores,
+        "winners": [pid for pid, score in scores.items() if score == best],
+        "scoreTrace": logger.score_history.round_scores(0).tolist(),
+        "round": logger.log["rounds"][0] if keep_turns else {"turns": []},
+        "latency": {p.player_id: p.profiler.summary() for p in game.players},
+    }
+
+
+def merge_results(lineup: Sequence[str], results: List[Dict]) -> GameLogger:
+    """Merge worker results into a single :class:`GameLogger` summary."""
+    players = build_players(lineup)
+    logger = GameLogger(players)
+    results = sorted(results, key=lambda r: r["seed"])
+
+    for r in results:
+        logger.log["rounds"].append(r["round"])
+        logger.score_history.add_round(r["scoreTrace"], r["scores"])
+    # per-turn averages, final-score percentiles and win rates over all rounds
+    logger.log_match_stats()
+
+    logger.log["results"] = [{
+        "seed": r["seed"],
+        "turns": r["turns"],
+        "scores": r["scores"],
+        "winners": r["winners"],
+    } for r in results]
+    logger.log["latency"] = {
+        p.player_id: merge_summaries([r["latency"][p.player_id] for r in results]) for p in players
+    }
+    logger.log["standings"] = [{
+        "playerId": p.player_id,
+        "name": p.name,
+        "wins": sum(1 for r in results if r["winners"] == [p.player_id]),
+        "ties": sum(1 for r in results if len(r["winners"]) > 1 and p.player_id in r["winners"]),
+        "averageFinalScore": round(sum(r["scores"][p.player_id] for r in results) / len(results), 2) if results else 0,
+        "thinkMsPerGame": round(logger.log["latency"][p.player_id]["totalNs"] / len(results) / 1e6, 3) if results else 0,
+    } for p in players]
+    return logger
+
+
+def run_tournament(lineup: Sequence[str], rounds: int, seed_start: int = 0,
+                   workers: Optional[int] = None, keep_turns: bool = False,
+                   map_path: Optional[str] = None, tickets_path: Optional[str] = None,
+                   budget: Optional[TimeBudget] = None, sandbox: bool = False) -> GameLogger:
+    """Play ``rounds`` games of ``lineup`` across a process pool.
+
+    Game ``i`` is seeded with ``seed_start + i``; ``workers`` defaults to one
+    process per core. ``map_path``/``tickets_path`` default to the bundled data.
+    ``budget`` is the thinking time allowed to every bot (2 seconds per
+    decision by default). With ``sandbox`` every bot runs in its own worker
+    process; each game process keeps a pool of them across its games.
+    """
+    lineup = list(lineup)
+    build_players(lineup)  # validate before spawning workers
+    seeds = range(seed_start, seed_start + rounds)
+    workers = workers or os.cpu_count() or 1
+    job = partial(play_round, lineup, keep_turns=keep_turns, map_path=map_path, tickets_path=tickets_path,
+                  budget=budget, sandbox=sandbox)
+
+    if workers == 1:
+        results = [job(seed) for seed in seeds]
+    else:
+        chunksize = max(1, rounds // (workers * 8))
+        # unlike multiprocessing.Pool, these workers may start the bot sandboxes
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(job, seeds, chunksize=chunksize))
+    return merge_results(lineup, results)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point for headless tournaments."""
+    parser = argparse.ArgumentParser(description="Run a non-interactive Ticket to Ride tournament.")
+    parser.add_argument("lineup", nargs="+", help="bot class names, one per seat (e.g. RandomBot RandomBot)")
+    parser.add_argument("--rounds", type=int, default=10, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--keep-turns", action="store_true", help="keep full turn logs for the web display")
+    parser.add_argument("--output", default=None, help="log file name under the display logs folder")
+    parser.add_argument("--map", default=None, help="map CSV (default: bundled data/map.csv)")
+    parser.add_argument("--tickets", default=None, help="tickets CSV (default: bundled data/Destination_tickets.csv)")
+    parser.add_argument("--move-budget", type=float, default=2.0,
+                        help="seconds a bot may think per decision before its move is replaced (0: unlimited)")
+    parser.add_argument("--game-budget", type=float, default=0,
+                        help="seconds a bot may think over a whole game (0: unlimited)")
+    parser.add_argument("--sandbox", action="store_true",
+                        help="run every bot in its own worker process so crashes and runaway bots are contained")
+    args = parser.parse_args(argv)
+
+    budget = TimeBudget(args.move_budget or None, args.game_budget or None)
+    logger = run_tournament(args.lineup, args.rounds, args.seed, args.workers, args.keep_turns,
+                            args.map, args.tickets, budget, args.sandbox)
+    for standing in logger.log["standings"]:
+        latency = logger.log["latency"][standing["playerId"]]
+        overruns = sum(m["overruns"] + m["skipped"] for m in latency["methods"].values())
+        print(f"{standing['name']}: {standing['wins']} wins, {standing['ties']} ties, "
+              f"avg score {standing['averageFinalScore']}, "
+              f"{standing['thinkMsPerGame']} ms thinking per game, {overruns} moves over budget")
+    logger.export_log(args.output or "-".join(p.name for p in logger.player_list))
+
+
+if __name__ == "__main__":
+    main()